@@ -1,10 +1,12 @@
-# Alternative Vercel API route approach
-from http.server import BaseHTTPRequestHandler
-
-class handler(BaseHTTPRequestHandler):
-    def do_GET(self):
-        self.send_response(200)
-        self.send_header('Content-type', 'text/html')
-        self.end_headers()
-        self.wfile.write(b'<h1>Social Dots</h1><p>Alternative API route working!</p>')
-        return
\ No newline at end of file
+# Vercel API route entry point; the bootstrap lives in socialdots/bootstrap.py
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from socialdots.bootstrap import get_application
+
+application = get_application()
+
+# Vercel handler
+app = application
@@ -8,6 +8,10 @@ pip install -r requirements.txt
 echo "Collecting static files..."
 python manage.py collectstatic --noinput
 
+# Bundle templates so cold starts skip the template directory search
+echo "Building template bundle..."
+python manage.py build_template_bundle
+
 # Run migrations
 echo "Running migrations..."
 python manage.py migrate --noinput
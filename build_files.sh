@@ -9,4 +9,7 @@ pip install -r requirements.txt
 # Collect static files
 python manage.py collectstatic --noinput --clear
 
+# Bundle templates so cold starts skip the template directory search
+python manage.py build_template_bundle
+
 echo "Build completed!"
\ No newline at end of file
@@ -5,11 +5,18 @@ from django.utils.html import format_html
 # from import_export.admin import admin.ModelAdmin
 from .models import (
     SiteConfiguration, TeamMember, Service, ServicePricingOption, PricingPlan, Project, 
-    BlogPost, Testimonial, Lead, Order, CalendarEvent, AIAgentLog, PortfolioCategory, Portfolio
+    BlogPost, Testimonial, Lead, Order, CalendarEvent, AIAgentLog, PortfolioCategory, Portfolio,
+    Technology, Tag, StripeEvent
 )
+from .cloudinary_uploads import queue_image_uploads
 
 # Resource classes removed for Vercel compatibility
 
+@admin.action(description="Upload selected images to Cloudinary")
+def upload_images_to_cloudinary(modeladmin, request, queryset):
+    queued = queue_image_uploads(queryset)
+    modeladmin.message_user(request, f"Queued {queued} image upload(s) to Cloudinary")
+
 @admin.register(SiteConfiguration)
 class SiteConfigurationAdmin(admin.ModelAdmin):
     # resource_class removed for Vercel compatibility
@@ -41,14 +48,29 @@ class PricingPlanAdmin(admin.ModelAdmin):
     list_editable = ['order', 'is_popular', 'is_active']
     ordering = ['order', 'price']
 
+@admin.register(Technology)
+class TechnologyAdmin(admin.ModelAdmin):
+    list_display = ['name', 'slug', 'created_at']
+    search_fields = ['name', 'slug']
+    prepopulated_fields = {'slug': ('name',)}
+    ordering = ['name']
+
+@admin.register(Tag)
+class TagAdmin(admin.ModelAdmin):
+    list_display = ['name', 'slug', 'created_at']
+    search_fields = ['name', 'slug']
+    prepopulated_fields = {'slug': ('name',)}
+    ordering = ['name']
+
 @admin.register(Project)
 class ProjectAdmin(admin.ModelAdmin):
     # resource_class = ProjectResource
-    list_display = ['title', 'client_name', 'status', 'is_featured', 'start_date', 'end_date']
-    list_filter = ['status', 'is_featured', 'start_date']
-    search_fields = ['title', 'client_name', 'description']
+    list_display = ['title', 'client_name', 'status', 'is_featured', 'image_upload_status', 'start_date', 'end_date']
+    list_filter = ['status', 'is_featured', 'image_upload_status', 'tech_stack', 'start_date']
+    search_fields = ['title', 'client_name', 'description', 'tech_stack__name']
     prepopulated_fields = {'slug': ('title',)}
     ordering = ['-created_at']
+    actions = [upload_images_to_cloudinary]
     
     fieldsets = (
         ('Basic Information', {
@@ -69,8 +91,8 @@ class ProjectAdmin(admin.ModelAdmin):
 class BlogPostAdmin(admin.ModelAdmin):
     # resource_class = BlogPostResource
     list_display = ['title', 'author', 'status', 'is_featured', 'published_at', 'created_at']
-    list_filter = ['status', 'is_featured', 'author', 'published_at']
-    search_fields = ['title', 'content', 'tags']
+    list_filter = ['status', 'is_featured', 'author', 'post_tags', 'published_at']
+    search_fields = ['title', 'content', 'post_tags__name']
     list_editable = ['status', 'is_featured']
     prepopulated_fields = {'slug': ('title',)}
     date_hierarchy = 'published_at'
@@ -216,6 +238,20 @@ class OrderAdmin(admin.ModelAdmin):
     def has_add_permission(self, request):
         return False
 
+@admin.register(StripeEvent)
+class StripeEventAdmin(admin.ModelAdmin):
+    list_display = ['event_id', 'event_type', 'object_id', 'status', 'attempts', 'received_at', 'processed_at']
+    list_filter = ['status', 'event_type', 'received_at']
+    search_fields = ['event_id', 'object_id']
+    readonly_fields = [
+        'event_id', 'event_type', 'object_id', 'payload', 'stripe_created', 'status', 'attempts', 'last_error',
+        'received_at', 'processed_at',
+    ]
+    ordering = ['-received_at']
+
+    def has_add_permission(self, request):
+        return False
+
 @admin.register(CalendarEvent)
 class CalendarEventAdmin(admin.ModelAdmin):
     # resource_class = CalendarEventResource
@@ -241,11 +277,12 @@ class CalendarEventAdmin(admin.ModelAdmin):
 @admin.register(Portfolio)
 class PortfolioAdmin(admin.ModelAdmin):
     # resource_class = PortfolioResource
-    list_display = ['title', 'category', 'is_active', 'created_at']
-    list_filter = ['category', 'is_active']
-    search_fields = ['title', 'description']
+    list_display = ['title', 'category', 'is_active', 'image_upload_status', 'created_at']
+    list_filter = ['category', 'is_active', 'image_upload_status', 'tech_stack']
+    search_fields = ['title', 'description', 'tech_stack__name']
     prepopulated_fields = {'slug': ('title',)}
     ordering = ['-created_at']
+    actions = [upload_images_to_cloudinary]
     
     fieldsets = (
         ('Basic Information', {
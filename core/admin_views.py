@@ -4,23 +4,44 @@ from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse
 from django.urls import reverse
 
+from django.views.decorators.http import require_POST
+
 from .models import Portfolio, PortfolioCategory
 from .forms import PortfolioForm
-from .cloudinary_utils import delete_image
+from .integrations import delete_cloudinary_image
+from .cloudinary_uploads import queue_image_uploads
 
 @login_required
 def portfolio_list(request):
-    portfolios = Portfolio.objects.all().order_by('-created_at')
+    portfolios = Portfolio.objects.select_related('category').order_by('-created_at')
     categories = PortfolioCategory.objects.all()
+    uploads_in_progress = any(p.image_upload_status in ('pending', 'uploading') for p in portfolios)
     
     context = {
         'portfolios': portfolios,
         'categories': categories,
+        'uploads_in_progress': uploads_in_progress,
         'title': 'Portfolio Management'
     }
     
     return render(request, 'admin/portfolio_list.html', context)
 
+@login_required
+def portfolio_upload_status(request):
+    """Current Cloudinary upload state of portfolio images, polled by the list page"""
+    statuses = Portfolio.objects.exclude(image_upload_status='none').values(
+        'id', 'image_upload_status', 'image_upload_error'
+    )
+    return JsonResponse({'uploads': list(statuses)})
+
+@login_required
+@require_POST
+def portfolio_bulk_upload(request):
+    """Queue Cloudinary uploads for all portfolio images that are missing or failed"""
+    queued = queue_image_uploads(Portfolio.objects.all())
+    messages.success(request, f'Queued {queued} image upload(s) to Cloudinary.')
+    return redirect('admin_portfolio_list')
+
 @login_required
 def portfolio_create(request):
     if request.method == 'POST':
@@ -70,7 +91,7 @@ def portfolio_delete(request, pk):
         # Delete the Cloudinary image if it exists
         if portfolio.cloudinary_image_id:
             try:
-                delete_image(portfolio.cloudinary_image_id)
+                delete_cloudinary_image(portfolio.cloudinary_image_id)
             except Exception as e:
                 messages.warning(request, f'Error deleting image from Cloudinary: {str(e)}')
         
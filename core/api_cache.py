@@ -0,0 +1,154 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from decimal import Decimal
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from . import metrics
+
+try:
+    import orjson
+except ImportError:  # Falls back to the stdlib encoder
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Endpoint -> models whose saves change its payload
+ENDPOINT_MODELS = {
+    'services': ('core.service',),
+    'pricing': ('core.pricingplan',),
+    'pricing_option': ('core.servicepricingoption',),
+    'portfolio': ('core.portfolio', 'core.portfoliocategory', 'core.technology', 'core.portfoliotechnology'),
+}
+# api/bootstrap/ bundles all of the above
+ENDPOINT_MODELS['bootstrap'] = tuple(label for labels in ENDPOINT_MODELS.values() for label in labels)
+
+
+def _default(obj):
+    # Same output as DjangoJSONEncoder, which JsonResponse used before
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f'{type(obj).__name__} is not JSON serializable')
+
+
+def dumps(data):
+    """Serialize to bytes with orjson when installed, else DjangoJSONEncoder"""
+    if orjson is not None:
+        return orjson.dumps(data, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, cls=DjangoJSONEncoder, separators=(',', ':')).encode('utf-8')
+
+
+def etag_for(body):
+    return f'"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+
+
+def parse_fields(request, allowed):
+    """?fields=id,title -> sorted tuple of the allowed names asked for (None for everything)"""
+    raw = request.GET.get('fields')
+    if not raw:
+        return None
+    fields = tuple(sorted({name.strip() for name in raw.split(',')} & set(allowed)))
+    return fields or None
+
+
+def project(data, list_key, fields):
+    """Keep only `fields` on each item of data[list_key] (or on data itself when list_key is None)"""
+    if not fields:
+        return data
+    if list_key is None:
+        return {name: data[name] for name in fields if name in data}
+    projected = dict(data)
+    projected[list_key] = [{name: item[name] for name in fields if name in item} for item in data[list_key]]
+    return projected
+
+
+class PayloadCache:
+    """
+    Serialized JSON bodies keyed by (endpoint, filters, fields), so repeat API
+    calls skip both the queries and the encoder.
+
+    Saves in this process drop the endpoint's entries (see signals.py);
+    API_CACHE_TTL bounds staleness from other processes' writes and
+    API_CACHE_MAX_ENTRIES bounds memory (least recently used goes first).
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._generations = {}
+
+    def get(self, endpoint, key, build, version=None):
+        """
+        Cached (bytes, ETag) for (endpoint, key), calling build() for the body
+        on a miss. `version` identifies the source data, e.g. the portfolio index
+        it was built from; a different version counts as a miss.
+        """
+        cache_key = (endpoint, key)
+        ttl = getattr(settings, 'API_CACHE_TTL', 300)
+        now = time.monotonic()
+        with self._lock:
+            generation = self._generations.get(endpoint, 0)
+            entry = self._entries.get(cache_key)
+            if entry is not None:
+                payload, entry_generation, entry_version, built_at = entry
+                if entry_generation == generation and entry_version == version and (not ttl or now - built_at <= ttl):
+                    self._entries.move_to_end(cache_key)
+                    metrics.API_CACHE_REQUESTS.inc(endpoint=endpoint, result='hit')
+                    return payload
+
+        metrics.API_CACHE_REQUESTS.inc(endpoint=endpoint, result='miss')
+        body = dumps(build())
+        payload = (body, etag_for(body))
+        with self._lock:
+            # An invalidation while we were building means this body may already be stale
+            if self._generations.get(endpoint, 0) == generation:
+                self._entries[cache_key] = (payload, generation, version, now)
+                self._entries.move_to_end(cache_key)
+                max_entries = getattr(settings, 'API_CACHE_MAX_ENTRIES', 1000)
+                while len(self._entries) > max_entries:
+                    self._entries.popitem(last=False)
+        return payload
+
+    def invalidate(self, *endpoints):
+        with self._lock:
+            for endpoint in endpoints:
+                self._generations[endpoint] = self._generations.get(endpoint, 0) + 1
+            self._entries = OrderedDict(
+                (key, entry) for key, entry in self._entries.items() if key[0] not in endpoints
+            )
+        logger.debug(f"API payload cache cleared for {', '.join(endpoints)}")
+
+    def clear(self):
+        self.invalidate(*ENDPOINT_MODELS)
+
+
+payload_cache = PayloadCache()
+
+
+def endpoints_for(label):
+    return [endpoint for endpoint, labels in ENDPOINT_MODELS.items() if label in labels]
+
+
+def cached_json_response(request, endpoint, key, build, version=None):
+    """
+    HttpResponse with a cached (or freshly built) JSON body and its ETag; a
+    matching If-None-Match gets a 304 without the body.
+    """
+    if not getattr(settings, 'API_CACHE_ENABLED', True):
+        body = dumps(build())
+        etag = etag_for(body)
+    else:
+        body, etag = payload_cache.get(endpoint, key, build, version)
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+    response = HttpResponse(body, content_type='application/json')
+    response['ETag'] = etag
+    return response
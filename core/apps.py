@@ -7,4 +7,10 @@ class CoreConfig(AppConfig):
 
     def ready(self):
         """Import signals when the app is ready"""
-        import core.signals
\ No newline at end of file
+        import core.signals
+        from django.db.backends.signals import connection_created
+        from socialdots.database import configure_sqlite_connection
+        connection_created.connect(configure_sqlite_connection, dispatch_uid='configure_sqlite_connection')
+        # Outbound calls to integrations fail fast while their circuit is open
+        from core import circuit_breaker
+        circuit_breaker.install()
@@ -0,0 +1,105 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from django.conf import settings
+from django.db import close_old_connections, connections, transaction
+from .db_router import primary_reads
+
+logger = logging.getLogger(__name__)
+
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+def run_inline():
+    """
+    Whether background work should run in the calling thread.
+
+    Worker threads open their own database connections, which for an
+    in-memory SQLite database means an empty, separate database.
+    """
+    if not getattr(settings, 'BACKGROUND_TASKS_ENABLED', True):
+        return True
+    return settings.DATABASES['default'].get('NAME') == ':memory:'
+
+
+def get_executor(name, max_workers=None):
+    """Return the named worker pool, creating it on first use"""
+    executor = _executors.get(name)
+    if executor is None:
+        with _executors_lock:
+            executor = _executors.get(name)
+            if executor is None:
+                executor = ThreadPoolExecutor(
+                    max_workers=max_workers or getattr(settings, 'BACKGROUND_WORKERS', 4),
+                    thread_name_prefix=f'sd-{name}',
+                )
+                _executors[name] = executor
+    return executor
+
+
+def _run_task(func, args, kwargs):
+    close_old_connections()
+    try:
+        # Tasks follow up on a write that just committed, which a replica may not have yet
+        with primary_reads():
+            return func(*args, **kwargs)
+    except Exception as e:
+        logger.error(f"Background task {getattr(func, '__name__', func)} failed: {e}")
+        raise
+    finally:
+        connections.close_all()
+
+
+def submit(pool, func, *args, **kwargs):
+    """
+    Run func on the named worker pool once the current transaction commits.
+
+    Falls back to running inline when background work is disabled.
+    """
+    def dispatch():
+        if run_inline():
+            try:
+                func(*args, **kwargs)
+            except Exception as e:
+                logger.error(f"Inline task {getattr(func, '__name__', func)} failed: {e}")
+            return
+        get_executor(pool).submit(_run_task, func, args, kwargs)
+
+    transaction.on_commit(dispatch)
+
+
+def on_commit_once(func, *args):
+    """
+    transaction.on_commit(func(*args)), unless the same call is already queued
+    for the current transaction; a burst of saves then triggers one rebuild,
+    not one per row.
+    """
+    callback = partial(func, *args)
+    connection = transaction.get_connection()
+    if connection.in_atomic_block and any(
+        isinstance(queued, partial) and queued.func is func and queued.args == args
+        for _, queued, *_ in connection.run_on_commit
+    ):
+        return
+    transaction.on_commit(callback)
+
+
+def retry(func, *args, attempts=3, backoff=1.0, label=None, **kwargs):
+    """
+    Call func, retrying with exponential backoff.
+
+    Re-raises the last error once all attempts are used up.
+    """
+    label = label or getattr(func, '__name__', 'task')
+    for attempt in range(1, attempts + 1):
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            if attempt == attempts:
+                raise
+            delay = backoff * (2 ** (attempt - 1))
+            logger.warning(f"{label} failed (attempt {attempt}/{attempts}), retrying in {delay:.1f}s: {e}")
+            time.sleep(delay)
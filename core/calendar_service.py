@@ -8,11 +8,23 @@ from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import Flow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from .circuit_breaker import guard
 from .models import CalendarEvent
 
 logger = logging.getLogger(__name__)
 
 
+def _is_outage(error):
+    # 4xx responses (bad event id, expired grant) don't mean Google is down
+    return not (isinstance(error, HttpError) and error.resp.status < 500)
+
+
+def execute(api_request):
+    """Run a Google API request through the google-calendar circuit breaker"""
+    with guard('google-calendar', is_failure=_is_outage):
+        return api_request.execute()
+
+
 class GoogleCalendarService:
     SCOPES = ['https://www.googleapis.com/auth/calendar']
 
@@ -96,7 +108,7 @@ class GoogleCalendarService:
                 "items": [{"id": calendar_id}]
             }
             
-            result = service.freebusy().query(body=body).execute()
+            result = execute(service.freebusy().query(body=body))
             busy_times = result.get('calendars', {}).get(calendar_id, {}).get('busy', [])
             
             return busy_times
@@ -175,11 +187,11 @@ class GoogleCalendarService:
             if event_data.get('send_notifications', True):
                 event['sendNotifications'] = True
             
-            result = service.events().insert(
+            result = execute(service.events().insert(
                 calendarId='primary',
                 body=event,
                 sendNotifications=event_data.get('send_notifications', True)
-            ).execute()
+            ))
             
             calendar_event = CalendarEvent.objects.create(
                 title=event_data['title'],
@@ -207,7 +219,7 @@ class GoogleCalendarService:
         try:
             service = self.build_service(credentials_dict)
             
-            event = service.events().get(calendarId='primary', eventId=event_id).execute()
+            event = execute(service.events().get(calendarId='primary', eventId=event_id))
             
             if 'title' in event_data:
                 event['summary'] = event_data['title']
@@ -218,11 +230,11 @@ class GoogleCalendarService:
             if 'end_time' in event_data:
                 event['end']['dateTime'] = event_data['end_time'].isoformat()
             
-            result = service.events().update(
+            result = execute(service.events().update(
                 calendarId='primary',
                 eventId=event_id,
                 body=event
-            ).execute()
+            ))
             
             logger.info(f"Calendar event updated: {event_id}")
             return result
@@ -238,7 +250,7 @@ class GoogleCalendarService:
         try:
             service = self.build_service(credentials_dict)
             
-            service.events().delete(calendarId='primary', eventId=event_id).execute()
+            execute(service.events().delete(calendarId='primary', eventId=event_id))
             
             try:
                 calendar_event = CalendarEvent.objects.get(google_event_id=event_id)
@@ -262,13 +274,13 @@ class GoogleCalendarService:
             
             now = datetime.utcnow().isoformat() + 'Z'
             
-            events_result = service.events().list(
+            events_result = execute(service.events().list(
                 calendarId='primary',
                 timeMin=now,
                 maxResults=max_results,
                 singleEvents=True,
                 orderBy='startTime'
-            ).execute()
+            ))
             
             events = events_result.get('items', [])
             return events
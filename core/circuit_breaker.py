@@ -0,0 +1,173 @@
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from django.conf import settings
+import requests
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+# One breaker per integration; names match core.instrumentation.external_service
+INTEGRATIONS = ('frappe', 'ai-agent', 'slack', 'stripe', 'google-calendar')
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """
+    Raised instead of calling an integration whose circuit is open. It is a
+    requests ConnectionError, so callers' existing handling of an unreachable
+    service applies unchanged.
+    """
+
+    def __init__(self, name, retry_in):
+        super().__init__(f"{name} is unavailable (circuit open, next attempt in {retry_in:.0f}s)")
+        self.name = name
+
+
+class CircuitBreaker:
+    """
+    Tracks the outcome of recent calls to one integration.
+
+    The circuit opens when at least CIRCUIT_BREAKER_MIN_CALLS calls in the
+    last CIRCUIT_BREAKER_WINDOW seconds failed at CIRCUIT_BREAKER_FAILURE_RATE
+    or more; calls then fail fast. After CIRCUIT_BREAKER_RESET_TIMEOUT one
+    trial call is let through (half-open): success closes the circuit, failure
+    opens it again.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.state = CLOSED
+        self.opened_at = None
+        self._outcomes = deque()
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def _setting(self, name, default):
+        return getattr(settings, f'CIRCUIT_BREAKER_{name}', default)
+
+    def before_call(self):
+        """Raise CircuitOpenError unless a call may go out now"""
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            retry_in = self.opened_at + self._setting('RESET_TIMEOUT', 30) - time.monotonic()
+            if self.state == OPEN and retry_in <= 0:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+        metrics.CIRCUIT_REJECTIONS.inc(service=self.name)
+        raise CircuitOpenError(self.name, max(retry_in, 0))
+
+    def record(self, ok):
+        now = time.monotonic()
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._trial_in_flight = False
+                if ok:
+                    self._close()
+                else:
+                    self._open(now)
+                return
+
+            window = self._setting('WINDOW', 60)
+            self._outcomes.append((now, ok))
+            while self._outcomes and now - self._outcomes[0][0] > window:
+                self._outcomes.popleft()
+            if ok or self.state == OPEN:
+                return
+            calls = len(self._outcomes)
+            failures = sum(1 for _, succeeded in self._outcomes if not succeeded)
+            if calls >= self._setting('MIN_CALLS', 5) and failures / calls >= self._setting('FAILURE_RATE', 0.5):
+                self._open(now)
+
+    def _open(self, now):
+        self.state = OPEN
+        self.opened_at = now
+        self._outcomes.clear()
+        metrics.CIRCUIT_OPENED.inc(service=self.name)
+        logger.warning(f"Circuit for {self.name} opened; failing fast for {self._setting('RESET_TIMEOUT', 30)}s")
+
+    def _close(self):
+        self.state = CLOSED
+        self.opened_at = None
+        self._outcomes.clear()
+        logger.info(f"Circuit for {self.name} closed")
+
+    def snapshot(self):
+        with self._lock:
+            calls = len(self._outcomes)
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            return {'state': self.state, 'recent_calls': calls, 'recent_failures': failures}
+
+
+_breakers = {name: CircuitBreaker(name) for name in INTEGRATIONS}
+
+
+def get_breaker(name):
+    return _breakers.get(name)
+
+
+def states():
+    return {name: breaker.snapshot() for name, breaker in _breakers.items()}
+
+
+@contextmanager
+def guard(name, is_failure=None):
+    """
+    Run the block as a call to `name`: fail fast while its circuit is open and
+    record the outcome. `is_failure(exc)` can exempt errors that don't mean the
+    service is down (a 404, bad input).
+    """
+    breaker = _breakers[name]
+    if not getattr(settings, 'CIRCUIT_BREAKER_ENABLED', True):
+        yield
+        return
+    breaker.before_call()
+    try:
+        yield
+    except Exception as e:
+        breaker.record(bool(is_failure) and not is_failure(e))
+        raise
+    breaker.record(True)
+
+
+_install_lock = threading.Lock()
+_installed = False
+
+
+def install():
+    """
+    Route outbound requests through the breakers: calls to a known integration
+    fail fast while its circuit is open, and connection errors, timeouts and
+    5xx responses count as failures. Safe to call more than once.
+    """
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        _installed = True
+
+    from .instrumentation import external_service
+    original_request = requests.Session.request
+
+    def request(self, method, url, *args, **kwargs):
+        breaker = _breakers.get(external_service(url))
+        if breaker is None or not getattr(settings, 'CIRCUIT_BREAKER_ENABLED', True):
+            return original_request(self, method, url, *args, **kwargs)
+        breaker.before_call()
+        try:
+            response = original_request(self, method, url, *args, **kwargs)
+        except Exception:
+            breaker.record(False)
+            raise
+        breaker.record(response.status_code < 500)
+        return response
+
+    requests.Session.request = request
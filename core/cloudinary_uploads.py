@@ -0,0 +1,97 @@
+import logging
+from django.apps import apps
+from django.conf import settings
+from django.db.models import Q
+from django.dispatch import Signal
+from . import background
+
+logger = logging.getLogger(__name__)
+
+# Sent with the model class and primary key once cloudinary_image_id is written back
+image_uploaded = Signal()
+
+# Rows in these states already have an upload on the worker pool
+IN_PROGRESS_STATUSES = ('pending', 'uploading')
+
+
+def needs_upload(instance):
+    """
+    Check whether an instance has a fresh image that should go to Cloudinary.
+
+    Empty files are cleared so the row saves without a broken image.
+    """
+    image = instance.image
+    if not image or instance.cloudinary_image_id or image.name.endswith('/'):
+        return False
+    if not hasattr(image, 'file'):
+        return False
+    if not (hasattr(image, 'size') and image.size > 0):
+        instance.image = None
+        return False
+    return True
+
+
+def upload_folder(instance):
+    return f"{instance.image.field.upload_to.rstrip('/')}/{instance.slug}"
+
+
+def queue_image_upload(instance):
+    """Upload the instance image on the worker pool after the row is committed"""
+    background.submit(
+        'cloudinary',
+        upload_instance_image,
+        instance._meta.label,
+        instance.pk,
+        upload_folder(instance),
+    )
+
+
+def queue_image_uploads(queryset):
+    """
+    Queue uploads for every row in the queryset that has an image but no
+    Cloudinary ID, skipping rows whose upload is already queued or running.
+    """
+    model = queryset.model
+    pending = list(
+        queryset.exclude(image='').exclude(image__isnull=True)
+        .filter(Q(cloudinary_image_id__isnull=True) | Q(cloudinary_image_id=''))
+        .exclude(image_upload_status__in=IN_PROGRESS_STATUSES)
+    )
+    model.objects.filter(pk__in=[obj.pk for obj in pending]).update(image_upload_status='pending', image_upload_error='')
+    for obj in pending:
+        queue_image_upload(obj)
+    return len(pending)
+
+
+def upload_instance_image(model_label, pk, folder):
+    """Upload one instance image to Cloudinary, with retries, and write back the public ID"""
+    from .cloudinary_utils import upload_image
+
+    model = apps.get_model(model_label)
+    instance = model.objects.filter(pk=pk).first()
+    if not instance or not instance.image:
+        return None
+
+    rows = model.objects.filter(pk=pk)
+    rows.update(image_upload_status='uploading')
+
+    def upload():
+        with instance.image.open('rb') as image_file:
+            return upload_image(image_file, folder=folder)
+
+    try:
+        result = background.retry(
+            upload,
+            attempts=getattr(settings, 'CLOUDINARY_UPLOAD_RETRIES', 3),
+            label=f"Cloudinary upload for {model_label} {pk}",
+        )
+    except Exception as e:
+        logger.error(f"Error uploading image to Cloudinary for {model_label} {pk}: {e}")
+        rows.update(image_upload_status='failed', image_upload_error=str(e)[:255])
+        return None
+
+    public_id = result['public_id']
+    rows.update(cloudinary_image_id=public_id, image_upload_status='uploaded', image_upload_error='')
+    logger.info(f"Uploaded image for {model_label} {pk} to Cloudinary: {public_id}")
+    image_uploaded.send(sender=model, pk=pk, public_id=public_id)
+    return public_id
@@ -5,7 +5,7 @@ def site_config(request):
     Context processor to add site_config to all templates.
     """
     try:
-        config = SiteConfiguration.objects.first()
+        config = SiteConfiguration.current()
         return {'site_config': config}
     except Exception as e:
         # Return an empty dict if there's an error
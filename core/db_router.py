@@ -0,0 +1,104 @@
+import contextvars
+from contextlib import contextmanager
+from django.conf import settings
+from django.db import connections
+
+# Read-only aliases, in order of preference
+READ_ALIASES = ('replica', 'snapshot')
+
+# Public catalogue models that may be read from a replica or content snapshot.
+# Transactional models (Lead, Order, AIAgentLog, CalendarEvent) and everything
+# outside core always use the primary.
+CONTENT_MODELS = frozenset({
+    'core.siteconfiguration', 'core.teammember', 'core.service', 'core.servicepricingoption',
+    'core.pricingplan', 'core.project', 'core.blogpost', 'core.testimonial',
+    'core.portfoliocategory', 'core.portfolio', 'core.relatedcontent',
+    'core.technology', 'core.tag', 'core.projecttechnology', 'core.portfoliotechnology', 'core.blogposttag',
+})
+
+# Set while a request or task must see its own writes
+_pinned = contextvars.ContextVar('pinned_to_primary', default=False)
+# Set between start_request() and end_request(), which own the pin's lifetime
+_in_request = contextvars.ContextVar('in_request', default=False)
+# Set once the current context has written a content model
+_wrote_content = contextvars.ContextVar('wrote_content', default=False)
+
+
+def read_alias():
+    """The configured read-only alias, or None when only the primary exists"""
+    for alias in READ_ALIASES:
+        if alias in settings.DATABASES:
+            return alias
+    return None
+
+
+def is_pinned():
+    return _pinned.get()
+
+
+def wrote_content():
+    return _wrote_content.get()
+
+
+def set_pinned(value):
+    """Pin (or unpin) reads in the current context to the primary; returns a token for reset_pinned()"""
+    return _pinned.set(value)
+
+
+def reset_pinned(token):
+    _pinned.reset(token)
+
+
+def start_request(pinned):
+    """Fresh routing state for a request; returns tokens for end_request()"""
+    return _in_request.set(True), _pinned.set(pinned), _wrote_content.set(False)
+
+
+def end_request(tokens):
+    request_token, pinned_token, wrote_token = tokens
+    _pinned.reset(pinned_token)
+    _wrote_content.reset(wrote_token)
+    _in_request.reset(request_token)
+
+
+@contextmanager
+def primary_reads():
+    token = set_pinned(True)
+    try:
+        yield
+    finally:
+        reset_pinned(token)
+
+
+class ContentRouter:
+    """
+    Send public content reads to the replica or snapshot, everything else to the primary.
+
+    Any write pins the rest of the request to the primary, and so do open
+    transactions, so code never reads back stale copies of its own changes.
+    Outside a request (commands, threads) a write doesn't pin anything, since
+    nothing would unpin it again; background tasks read from the primary anyway.
+    """
+
+    def db_for_read(self, model, **hints):
+        alias = read_alias()
+        if alias is None or model._meta.label_lower not in CONTENT_MODELS:
+            return 'default'
+        if _pinned.get() or connections['default'].in_atomic_block:
+            return 'default'
+        return alias
+
+    def db_for_write(self, model, **hints):
+        # Undone by end_request(), which resets both to their values before the request
+        if _in_request.get():
+            _pinned.set(True)
+            if model._meta.label_lower in CONTENT_MODELS:
+                _wrote_content.set(True)
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The read aliases hold copies of the primary's rows
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in READ_ALIASES
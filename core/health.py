@@ -0,0 +1,102 @@
+import logging
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from django.conf import settings
+from django.utils import timezone
+from . import background
+
+logger = logging.getLogger(__name__)
+
+
+def _check_frappe():
+    from .frappe_services import FrappeService
+    return FrappeService().health_check()
+
+
+def _check_ai_agent():
+    from .ai_agent_service import AIAgentService
+    return AIAgentService().health_check()
+
+
+# Integrations with a health endpoint; the others are reported by circuit state only
+PROBES = {
+    'frappe': _check_frappe,
+    'ai_agent': _check_ai_agent,
+}
+
+_results = {name: {'status': 'unknown', 'checked_at': None, 'duration_ms': None} for name in PROBES}
+_refreshed_at = None
+_refreshing = False
+_lock = threading.Lock()
+# Latest probe future per integration
+_in_flight = {}
+
+
+def integration_health():
+    """
+    The latest probe results, never waiting on a probe. Results older than
+    HEALTH_PROBE_INTERVAL start a refresh in the background; callers see the
+    previous results (or 'unknown' before the first probe finishes).
+    """
+    interval = getattr(settings, 'HEALTH_PROBE_INTERVAL', 60)
+    if _refreshed_at is None or time.monotonic() - _refreshed_at > interval:
+        refresh()
+    return {name: dict(result) for name, result in _results.items()}
+
+
+def refresh():
+    """Start probing every integration unless a refresh is already running"""
+    global _refreshing
+    with _lock:
+        if _refreshing:
+            return
+        _refreshing = True
+    # Always on the pool, even when other background work runs inline: probes
+    # don't touch the database and must never hold up the request
+    background.get_executor('health', max_workers=1).submit(run_probes)
+
+
+def run_probes():
+    """Probe all integrations concurrently, each bounded by HEALTH_PROBE_TIMEOUT"""
+    global _refreshed_at, _refreshing
+    try:
+        timeout = getattr(settings, 'HEALTH_PROBE_TIMEOUT', 10)
+        executor = background.get_executor('health-probes', max_workers=len(PROBES))
+        started = time.perf_counter()
+        futures = {}
+        for name, check in PROBES.items():
+            # A probe that timed out last time may still hold its worker; don't queue behind it
+            previous = _in_flight.get(name)
+            if previous is not None and not previous.done():
+                _results[name] = {'status': 'timeout', 'checked_at': timezone.now().isoformat(), 'duration_ms': None}
+                continue
+            futures[name] = _in_flight[name] = executor.submit(_probe, check)
+        for name, future in futures.items():
+            remaining = max(timeout - (time.perf_counter() - started), 0)
+            try:
+                status, duration = future.result(timeout=remaining)
+            except FutureTimeoutError:
+                status, duration = 'timeout', timeout
+            _results[name] = {
+                'status': status,
+                'checked_at': timezone.now().isoformat(),
+                'duration_ms': round(duration * 1000, 1),
+            }
+    except Exception as e:
+        logger.error(f"Health probes failed: {e}")
+    finally:
+        # Set on failure too, so one error doesn't start a refresh on every request
+        _refreshed_at = time.monotonic()
+        with _lock:
+            _refreshing = False
+
+
+def _probe(check):
+    started = time.perf_counter()
+    try:
+        status = 'healthy' if check() else 'unhealthy'
+    except Exception as e:
+        logger.error(f"Health probe error: {e}")
+        status = 'error'
+    return status, time.perf_counter() - started
@@ -0,0 +1,253 @@
+import hashlib
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+from django.conf import settings
+from django.urls import reverse
+from . import background
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow is optional outside of ImageField uploads
+    Image = None
+    ImageOps = None
+
+logger = logging.getLogger(__name__)
+
+# Local stand-in for Cloudinary transformations when an image has no cloudinary_image_id.
+# Variants are written under IMAGE_VARIANT_ROOT, keyed by the source content hash, and
+# served by core.views.image_variant (MEDIA_URL is only routed under DEBUG).
+
+DEFAULT_WIDTHS = (320, 480, 640, 960, 1280, 1920)
+
+# <hash prefix>/<content hash>-<width>[x<height>][-fill].<format>
+VARIANT_PATH_RE = re.compile(r'^[0-9a-f]{2}/[0-9a-f]{20}-\d+(x\d+)?(-fill)?\.(webp|avif)$')
+CONTENT_TYPES = {'webp': 'image/webp', 'avif': 'image/avif'}
+
+# storage name -> (source version, content hash); see source_version()
+_content_hashes = {}
+_known_variants = set()
+# Variants queued for generation, so a busy page asks for each one once
+_in_flight = set()
+_in_flight_lock = threading.Lock()
+# Bytes under the variant root, measured once and then kept up to date
+_cache_bytes = None
+_size_lock = threading.Lock()
+
+
+def variant_root():
+    return Path(getattr(settings, 'IMAGE_VARIANT_ROOT', Path(settings.MEDIA_ROOT) / 'variants'))
+
+
+def avif_supported():
+    return Image is not None and '.avif' in Image.registered_extensions()
+
+
+def output_format(fmt=None):
+    """Resolve the variant format, falling back to WebP when AVIF is unavailable"""
+    fmt = (fmt or getattr(settings, 'IMAGE_VARIANT_FORMAT', 'webp')).lower()
+    if fmt == 'avif' and not avif_supported():
+        return 'webp'
+    return fmt if fmt in ('webp', 'avif') else 'webp'
+
+
+def snap_width(width):
+    """Round a requested width up to the next configured step"""
+    widths = sorted(getattr(settings, 'IMAGE_VARIANT_WIDTHS', DEFAULT_WIDTHS))
+    for step in widths:
+        if step >= width:
+            return step
+    return widths[-1]
+
+
+def source_version(image_field):
+    """
+    When the image's row was last saved. Replacing the file under the same name
+    saves the row too, so this changes with the content without a storage
+    round trip (a size or mtime lookup is a network call on Cloudinary storage).
+    """
+    instance = getattr(image_field, 'instance', None)
+    updated_at = getattr(instance, 'updated_at', None)
+    return updated_at.isoformat() if updated_at else None
+
+
+def cached_hash(name, version):
+    cached = _content_hashes.get(name)
+    return cached[1] if cached is not None and cached[0] == version else None
+
+
+def content_hash(storage, name, version):
+    """Hash of the source image bytes, cached by storage name and source version"""
+    digest = cached_hash(name, version)
+    if digest is None:
+        sha = hashlib.sha256()
+        with storage.open(name, 'rb') as source:
+            for chunk in iter(lambda: source.read(65536), b''):
+                sha.update(chunk)
+        digest = sha.hexdigest()[:20]
+        _content_hashes[name] = (version, digest)
+    return digest
+
+
+def relative_variant_path(digest, width, height, crop_key, fmt):
+    size_key = f"{width}x{height}" if height else f"{width}"
+    return f"{digest[:2]}/{digest}-{size_key}{crop_key}.{fmt}"
+
+
+def variant_file(relative_path):
+    """Path of a generated variant for serving, or None if it isn't there"""
+    if not VARIANT_PATH_RE.match(relative_path):
+        return None
+    path = variant_root() / relative_path
+    return path if path.is_file() else None
+
+
+def variant_url(image_field, width=None, height=None, crop=None, fmt=None, **ignored):
+    """
+    Get the URL of a resized variant of a locally stored image.
+
+    A missing variant is generated on the background worker pool and the
+    original URL is returned until it exists; any failure falls back to the
+    original URL.
+    """
+    if Image is None or not image_field or not width:
+        return image_field.url if image_field else None
+
+    try:
+        requested_width = int(width)
+        step = snap_width(requested_width)
+        step_height = round(int(height) * step / requested_width) if height else None
+        spec = (step, step_height, '-fill' if crop == 'fill' and step_height else '', output_format(fmt))
+
+        version = source_version(image_field)
+        relative_path = _existing_variant(image_field.name, version, spec)
+        if relative_path is None:
+            _queue(image_field, version, spec)
+            # Inline background work (tests, workers disabled) has generated it by now
+            relative_path = _existing_variant(image_field.name, version, spec)
+        if relative_path is None:
+            return image_field.url
+        return reverse('image_variant', kwargs={'path': relative_path})
+    except Exception as e:
+        logger.error(f"Image variant lookup failed for '{image_field.name}': {e}")
+        return image_field.url
+
+
+def _existing_variant(name, version, spec):
+    digest = cached_hash(name, version)
+    if digest is None:
+        return None
+    relative_path = relative_variant_path(digest, *spec)
+    path = variant_root() / relative_path
+    if relative_path in _known_variants:
+        _touch(path)
+    elif path.exists():
+        _known_variants.add(relative_path)
+        _touch(path)
+    else:
+        return None
+    return relative_path if relative_path in _known_variants else None
+
+
+def _queue(image_field, version, spec):
+    key = (image_field.name, version, spec)
+    with _in_flight_lock:
+        if key in _in_flight:
+            return
+        _in_flight.add(key)
+    background.submit('image-variants', generate_variant, image_field.storage, image_field.name, version, *spec)
+
+
+def generate_variant(storage, name, version, width, height, crop_key, fmt):
+    """Write one variant of a stored image, then trim the cache to its quota"""
+    spec = (width, height, crop_key, fmt)
+    try:
+        relative_path = relative_variant_path(content_hash(storage, name, version), *spec)
+        path = variant_root() / relative_path
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with storage.open(name, 'rb') as source:
+                image = Image.open(source)
+                image = ImageOps.exif_transpose(image)
+                if image.mode not in ('RGB', 'RGBA'):
+                    image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+
+                if crop_key and height:
+                    image = ImageOps.fit(image, (width, height), method=Image.LANCZOS)
+                else:
+                    # Never upscale past the original dimensions
+                    image.thumbnail((width, height or image.height), Image.LANCZOS)
+
+                temp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+                image.save(temp_path, format=fmt.upper(), quality=getattr(settings, 'IMAGE_VARIANT_QUALITY', 80))
+                os.replace(temp_path, path)
+
+            _add_bytes(path.stat().st_size)
+            logger.info(f"Generated image variant {path.name} for '{name}'")
+            _enforce_quota(keep=path)
+        _known_variants.add(relative_path)
+    finally:
+        with _in_flight_lock:
+            _in_flight.discard((name, version, spec))
+
+
+def _touch(path):
+    """Mark a variant as recently used for the LRU quota"""
+    try:
+        os.utime(path, None)
+    except OSError:
+        _known_variants.discard(path.relative_to(variant_root()).as_posix())
+
+
+def _scan():
+    """(mtime, size, path) for every file under the variant root"""
+    entries = []
+    for directory, _, files in os.walk(variant_root()):
+        for filename in files:
+            path = Path(directory) / filename
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+    return entries
+
+
+def _add_bytes(size):
+    global _cache_bytes
+    with _size_lock:
+        if _cache_bytes is None:
+            # The new file is already on disk, so the first scan counts it
+            _cache_bytes = sum(size for _, size, _ in _scan())
+        else:
+            _cache_bytes += size
+
+
+def _enforce_quota(keep=None):
+    """Delete least recently used variants once the running total passes the disk quota"""
+    global _cache_bytes
+    quota = getattr(settings, 'IMAGE_VARIANT_CACHE_MAX_BYTES', 512 * 1024 * 1024)
+    with _size_lock:
+        if _cache_bytes is None or _cache_bytes <= quota:
+            return
+
+        # Other processes share the directory, so sweep from what is actually on disk
+        entries = _scan()
+        total = sum(size for _, size, _ in entries)
+        # Trim to 90% of the quota so every new variant doesn't trigger another sweep
+        target = quota * 0.9
+        root = variant_root()
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            if path == keep:
+                continue
+            try:
+                path.unlink()
+                total -= size
+                _known_variants.discard(path.relative_to(root).as_posix())
+            except OSError:
+                continue
+        _cache_bytes = total
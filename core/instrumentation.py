@@ -0,0 +1,227 @@
+import contextvars
+import json
+import logging
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import ExitStack
+from urllib.parse import urlparse
+from django.conf import settings
+from django.db import connections
+from . import metrics as registry
+
+logger = logging.getLogger(__name__)
+
+# Metrics for the request being handled in the current context, or None when not sampled
+_current = contextvars.ContextVar('request_metrics', default=None)
+
+_install_lock = threading.Lock()
+_installed = False
+
+
+class RequestMetrics:
+    """Counters collected while one sampled request is handled"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.query_count = 0
+        self.sql_time = 0.0
+        self.statements = Counter()
+        self.template_time = 0.0
+        self.template_depth = 0
+        self.http_time = defaultdict(float)
+        self.http_calls = Counter()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @property
+    def total_time(self):
+        return time.perf_counter() - self.started
+
+    def repeated_statements(self, threshold):
+        """SQL statements executed at least threshold times (usually an N+1 loop)"""
+        return [(sql, count) for sql, count in self.statements.most_common() if count >= threshold]
+
+    def server_timing(self):
+        """Value for the Server-Timing response header (durations in milliseconds)"""
+        parts = [
+            f'db;dur={self.sql_time * 1000:.1f};desc="{self.query_count} queries"',
+            f'tpl;dur={self.template_time * 1000:.1f}',
+        ]
+        for service, seconds in sorted(self.http_time.items()):
+            parts.append(f'http-{service};dur={seconds * 1000:.1f};desc="{self.http_calls[service]} calls"')
+        parts.append(f'cache;desc="{self.cache_hits} hits, {self.cache_misses} misses"')
+        parts.append(f'total;dur={self.total_time * 1000:.1f}')
+        return ', '.join(parts)
+
+    def as_dict(self):
+        return {
+            'queries': self.query_count,
+            'sql_ms': round(self.sql_time * 1000, 1),
+            'template_ms': round(self.template_time * 1000, 1),
+            'http_ms': {service: round(seconds * 1000, 1) for service, seconds in self.http_time.items()},
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'total_ms': round(self.total_time * 1000, 1),
+        }
+
+
+def current_metrics():
+    return _current.get()
+
+
+def start(sample_rate=None):
+    """Begin collecting for the current request if it is sampled; returns a token for finish()"""
+    if sample_rate is None:
+        sample_rate = getattr(settings, 'INSTRUMENTATION_SAMPLE_RATE', 1.0)
+    metrics = RequestMetrics() if random.random() < sample_rate else None
+    return _current.set(metrics)
+
+
+def finish(token):
+    _current.reset(token)
+
+
+def sql_wrappers():
+    """Context manager timing every query on every configured database"""
+    stack = ExitStack()
+    for alias in connections:
+        stack.enter_context(connections[alias].execute_wrapper(_time_query))
+    return stack
+
+
+def _time_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.sql_time += time.perf_counter() - started
+        metrics.query_count += 1
+        metrics.statements[sql] += 1
+
+
+def external_service(url):
+    """Short name for an outbound HTTP call, grouped by integration"""
+    host = urlparse(url).hostname or ''
+    known = {
+        'frappe': getattr(settings, 'FRAPPE_API_URL', None),
+        'ai-agent': getattr(settings, 'AI_AGENT_WEBHOOK_URL', None),
+        'slack': getattr(settings, 'SLACK_WEBHOOK_URL', None),
+    }
+    for name, configured in known.items():
+        if configured and urlparse(configured).hostname == host:
+            return name
+    if host.endswith('stripe.com'):
+        return 'stripe'
+    if host.endswith('slack.com'):
+        return 'slack'
+    return 'other'
+
+
+def install():
+    """
+    Patch template rendering, outbound requests and cache reads to report into
+    the current request's metrics; outbound calls and cache reads also feed the
+    process-wide counters in core.metrics. Safe to call more than once.
+    """
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        _installed = True
+
+    from django.template.base import Template
+    original_render = Template.render
+
+    def render(self, context):
+        metrics = _current.get()
+        if metrics is None:
+            return original_render(self, context)
+        # Only the outermost template counts; includes are part of its time
+        metrics.template_depth += 1
+        started = time.perf_counter()
+        try:
+            return original_render(self, context)
+        finally:
+            metrics.template_depth -= 1
+            if metrics.template_depth == 0:
+                metrics.template_time += time.perf_counter() - started
+
+    Template.render = render
+
+    try:
+        import requests
+    except ImportError:
+        requests = None
+    if requests is not None:
+        original_request = requests.Session.request
+
+        def request(self, method, url, *args, **kwargs):
+            service = external_service(url)
+            started = time.perf_counter()
+            failed = True
+            try:
+                response = original_request(self, method, url, *args, **kwargs)
+                failed = not response.ok
+                return response
+            finally:
+                elapsed = time.perf_counter() - started
+                registry.EXTERNAL_DURATION.observe(elapsed, service=service)
+                if failed:
+                    registry.EXTERNAL_ERRORS.inc(service=service)
+                metrics = _current.get()
+                if metrics is not None:
+                    metrics.http_time[service] += elapsed
+                    metrics.http_calls[service] += 1
+
+        requests.Session.request = request
+
+    from django.core.cache import caches
+    patched = set()
+    for alias in settings.CACHES:
+        backend = type(caches[alias])
+        if backend in patched:
+            continue
+        patched.add(backend)
+        _patch_cache_get(backend)
+
+
+def _patch_cache_get(backend):
+    original_get = backend.get
+    missing = object()
+
+    def get(self, key, default=None, version=None):
+        value = original_get(self, key, missing, version)
+        hit = value is not missing
+        registry.CACHE_REQUESTS.inc(result='hit' if hit else 'miss')
+        metrics = _current.get()
+        if metrics is not None:
+            if hit:
+                metrics.cache_hits += 1
+            else:
+                metrics.cache_misses += 1
+        return value if hit else default
+
+    backend.get = get
+
+
+def log_request(request, response, metrics):
+    """Structured log line for a sampled request, plus an alarm for repeated SQL"""
+    match = getattr(request, 'resolver_match', None)
+    view = match.view_name if match else None
+    logger.info(json.dumps({
+        'event': 'request_metrics',
+        'method': request.method,
+        'path': request.path,
+        'view': view,
+        'status': response.status_code,
+        **metrics.as_dict(),
+    }))
+
+    threshold = getattr(settings, 'INSTRUMENTATION_N_PLUS_ONE_THRESHOLD', 5)
+    for sql, count in metrics.repeated_statements(threshold):
+        logger.warning(f"Possible N+1 in {view or request.path}: query ran {count} times: {sql[:300]}")
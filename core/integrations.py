@@ -0,0 +1,52 @@
+"""
+Lazy entry points for the third-party integrations.
+
+Stripe, the Google API client, Cloudinary and the service modules built on
+them are only imported the first time one of these names is called or an
+attribute is read, so a cold start serving a plain page never pays for them.
+"""
+import importlib
+import threading
+
+
+class LazyImport:
+    """Stand-in for `module.name` that imports it on first use"""
+
+    def __init__(self, module, name):
+        self._module = module
+        self._name = name
+        self._target = None
+        self._lock = threading.Lock()
+
+    def _resolve(self):
+        if self._target is None:
+            with self._lock:
+                if self._target is None:
+                    self._target = getattr(importlib.import_module(self._module), self._name)
+        return self._target
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+
+    def __getattr__(self, attr):
+        return getattr(self._resolve(), attr)
+
+    def __repr__(self):
+        return f'<LazyImport {self._module}.{self._name}>'
+
+
+StripePaymentService = LazyImport('core.payment_service', 'StripePaymentService')
+AIAgentService = LazyImport('core.ai_agent_service', 'AIAgentService')
+process_order_to_frappe = LazyImport('core.frappe_services', 'process_order_to_frappe')
+
+# Requires google-api-python-client and google-auth-oauthlib
+GoogleCalendarService = LazyImport('core.calendar_service', 'GoogleCalendarService')
+book_appointment = LazyImport('core.calendar_service', 'book_appointment')
+
+delete_cloudinary_image = LazyImport('core.cloudinary_utils', 'delete_image')
+
+# Modules a cold start should not import; checked by `manage.py import_profile`
+DEFERRED_MODULES = (
+    'stripe', 'googleapiclient', 'google_auth_oauthlib', 'cloudinary', 'markdown', 'pygments',
+    'rest_framework.decorators', 'numpy',
+)
@@ -0,0 +1,326 @@
+import json
+import platform
+import random
+import statistics
+import subprocess
+import threading
+import time
+import tracemalloc
+from datetime import timedelta
+from pathlib import Path
+from urllib.request import urlopen
+from wsgiref.simple_server import WSGIRequestHandler, make_server
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client
+from django.test.utils import override_settings, setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+from django.utils import timezone
+from core.models import (
+    BlogPost, BlogPostTag, Portfolio, PortfolioCategory, PortfolioTechnology, Service, Tag, Technology, Testimonial
+)
+from core.portfolio_index import rebuild_portfolio_index
+from core.related_content import CORPORA, refresh_related
+
+WORDS = (
+    'ai automation marketing strategy brand content social media video seo analytics growth '
+    'campaign toronto canada business customer crm salesforce website design development '
+    'engagement conversion funnel email newsletter chatbot agent workflow integration data'
+).split()
+TECHNOLOGIES = ['Python', 'Django', 'React', 'WordPress', 'Salesforce', 'HubSpot', 'AI', 'n8n', 'Shopify', 'Figma']
+TAGS = ['AI', 'Marketing', 'Automation', 'SEO', 'Canadian Business', 'CRM', 'Social Media', 'Strategy']
+
+
+class Command(BaseCommand):
+    help = 'Seed a synthetic dataset into a throwaway test database and benchmark the public pages and JSON APIs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--services', type=int, default=20)
+        parser.add_argument('--posts', type=int, default=200)
+        parser.add_argument('--portfolios', type=int, default=100)
+        parser.add_argument('--testimonials', type=int, default=30)
+        parser.add_argument('--requests', type=int, default=50, help='Timed requests per endpoint')
+        parser.add_argument('--warmup', type=int, default=5, help='Untimed requests per endpoint')
+        parser.add_argument('--alloc-samples', type=int, default=5, help='Requests per endpoint traced for allocations')
+        parser.add_argument('--mode', choices=['client', 'wsgi'], default='client',
+                            help='Django test client, or HTTP against a local WSGI server')
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--output', help='Results file (default: bench_results/<commit>-<timestamp>.json)')
+        parser.add_argument('--compare', help='Earlier results file to compare against')
+        parser.add_argument('--fail-on-regression', type=float,
+                            help='Exit non-zero if any p95 is this many percent slower than --compare')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False, aliases={'default'})
+        try:
+            # Background work runs inline and unsampled so it never overlaps the timed requests
+            with override_settings(BACKGROUND_TASKS_ENABLED=False, INSTRUMENTATION_SAMPLE_RATE=0.0):
+                dataset = self.seed(options)
+                endpoints = self.endpoints()
+                results = self.run(endpoints, options)
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        report = {
+            'commit': git_commit(),
+            'timestamp': timezone.now().isoformat(),
+            'mode': options['mode'],
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connections['default'].vendor,
+            'dataset': dataset,
+            'requests_per_endpoint': options['requests'],
+            'endpoints': results,
+        }
+        self.print_report(results)
+
+        output = Path(options['output'] or Path(settings.BASE_DIR) / 'bench_results' / f"{report['commit'] or 'local'}-{int(time.time())}.json")
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2))
+        self.stdout.write(f'Results written to {output}')
+
+        if options['compare']:
+            self.compare(results, json.loads(Path(options['compare']).read_text()), options['fail_on_regression'])
+
+        self.stdout.write(self.style.SUCCESS('✅ Benchmark complete'))
+
+    def seed(self, options):
+        """Create the synthetic dataset with bulk inserts, then build the derived tables once"""
+        rng = random.Random(options['seed'])
+        now = timezone.now()
+
+        def text(words):
+            return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+        author = User.objects.create(username='bench-author', first_name='Bench', last_name='Author')
+
+        Service.objects.bulk_create([
+            Service(
+                title=f'Service {i} {text(2)}', slug=f'service-{i}', description=text(120), short_description=text(15),
+                price=rng.randint(100, 5000), price_type=rng.choice(['fixed', 'monthly', 'custom']),
+                features=[text(3) for _ in range(5)], is_featured=i < 3, order=i,
+            )
+            for i in range(options['services'])
+        ])
+
+        posts = BlogPost.objects.bulk_create([
+            BlogPost(
+                title=f'Post {i} {text(4)}', slug=f'post-{i}', author=author, excerpt=text(30), content=f'<p>{text(600)}</p>',
+                status='published', tags=rng.sample(TAGS, 3), is_featured=i < 3,
+                published_at=now - timedelta(hours=i),
+            )
+            for i in range(options['posts'])
+        ])
+
+        categories = PortfolioCategory.objects.bulk_create([
+            PortfolioCategory(name=name, slug=name.lower().replace(' ', '-'), order=i)
+            for i, name in enumerate(['Social Media', 'Websites', 'AI Automation', 'Video'])
+        ])
+        portfolios = Portfolio.objects.bulk_create([
+            Portfolio(
+                title=f'Portfolio {i} {text(3)}', slug=f'portfolio-{i}', description=text(80), bio=text(20),
+                category=rng.choice(categories), content_type=rng.choice(['post', 'video', 'blog', 'email']),
+                technology_used=rng.sample(TECHNOLOGIES, 3), is_featured=i < 6, order=i,
+            )
+            for i in range(options['portfolios'])
+        ])
+
+        Testimonial.objects.bulk_create([
+            Testimonial(client_name=f'Client {i}', client_company=text(2), content=text(40), is_featured=i < 3, order=i)
+            for i in range(options['testimonials'])
+        ])
+
+        # Join tables normally filled by save(); bulk_create skips it
+        tags = {tag.name: tag for tag in Tag.for_names(TAGS)}
+        BlogPostTag.objects.bulk_create([BlogPostTag(post=post, tag=tags[name]) for post in posts for name in post.tags])
+        technologies = {tech.name: tech for tech in Technology.for_names(TECHNOLOGIES)}
+        PortfolioTechnology.objects.bulk_create([
+            PortfolioTechnology(portfolio=portfolio, technology=technologies[name])
+            for portfolio in portfolios for name in portfolio.technology_used
+        ])
+
+        for label in CORPORA:
+            refresh_related(label)
+        rebuild_portfolio_index()
+
+        return {key: options[key] for key in ('services', 'posts', 'portfolios', 'testimonials', 'seed')}
+
+    def endpoints(self):
+        post = BlogPost.objects.order_by('pk').first()
+        return {
+            'home': '/',
+            'services': '/services/',
+            'portfolio': '/portfolio/',
+            'blog_search': '/blog/?q=marketing',
+            'blog_detail': f'/blog/{post.slug}/' if post else '/blog/',
+            'api_portfolio': '/api/portfolio/',
+            'api_services': '/api/services/',
+            'sitemap': '/sitemap.xml',
+        }
+
+    def run(self, endpoints, options):
+        if options['mode'] == 'wsgi':
+            return self.run_wsgi(endpoints, options)
+
+        client = Client(raise_request_exception=False)
+        results = {}
+        for name, url in endpoints.items():
+            for _ in range(options['warmup']):
+                client.get(url)
+
+            timings, queries, status = [], [], None
+            for _ in range(options['requests']):
+                with QueryCounter() as counter:
+                    started = time.perf_counter()
+                    response = client.get(url)
+                    timings.append(time.perf_counter() - started)
+                queries.append(counter.count)
+                status = response.status_code
+
+            allocations = []
+            tracemalloc.start()
+            try:
+                for _ in range(options['alloc_samples']):
+                    tracemalloc.reset_peak()
+                    before = tracemalloc.get_traced_memory()[0]
+                    client.get(url)
+                    allocations.append(tracemalloc.get_traced_memory()[1] - before)
+            finally:
+                tracemalloc.stop()
+
+            results[name] = summarize(url, status, timings, queries, allocations)
+            self.stdout.write(f'{name}: done')
+        return results
+
+    def run_wsgi(self, endpoints, options):
+        app = CountingWSGIApp(WSGIHandler())
+        server = make_server('127.0.0.1', 0, app, handler_class=QuietHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        base = f'http://127.0.0.1:{server.server_port}'
+
+        results = {}
+        try:
+            for name, url in endpoints.items():
+                for _ in range(options['warmup']):
+                    fetch(base + url)
+
+                timings, queries, status = [], [], None
+                for _ in range(options['requests']):
+                    started = time.perf_counter()
+                    status = fetch(base + url)
+                    timings.append(time.perf_counter() - started)
+                    queries.append(app.last_query_count)
+
+                results[name] = summarize(url, status, timings, queries, [])
+                self.stdout.write(f'{name}: done')
+        finally:
+            server.shutdown()
+            server.server_close()
+        return results
+
+    def print_report(self, results):
+        self.stdout.write(f"\n{'endpoint':<16}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'queries':>9}{'alloc KB':>10}")
+        for name, result in results.items():
+            alloc = f"{result['alloc_kb']:.0f}" if result['alloc_kb'] is not None else '-'
+            self.stdout.write(
+                f"{name:<16}{result['p50_ms']:>9.1f}{result['p95_ms']:>9.1f}{result['p99_ms']:>9.1f}"
+                f"{result['queries']:>9.1f}{alloc:>10}"
+            )
+
+    def compare(self, results, previous, threshold):
+        self.stdout.write(f"\nCompared with {previous.get('commit') or 'previous run'}:")
+        regressions = []
+        for name, result in results.items():
+            before = previous.get('endpoints', {}).get(name)
+            if not before or not before['p95_ms']:
+                continue
+            change = (result['p95_ms'] - before['p95_ms']) / before['p95_ms'] * 100
+            queries = result['queries'] - before['queries']
+            self.stdout.write(f'{name:<16} p95 {change:+6.1f}%   queries {queries:+.1f}')
+            if threshold is not None and change > threshold:
+                regressions.append(f'{name} p95 {change:+.1f}%')
+        if regressions:
+            raise CommandError(f"Performance regressions: {', '.join(regressions)}")
+
+
+class QueryCounter:
+    """Count queries on every database while the block runs"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        self.wrappers = [connections[alias].execute_wrapper(self) for alias in connections]
+        for wrapper in self.wrappers:
+            wrapper.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        for wrapper in reversed(self.wrappers):
+            wrapper.__exit__(*exc_info)
+
+
+class CountingWSGIApp:
+    """WSGI wrapper recording how many queries the last request ran (server thread only)"""
+
+    def __init__(self, app):
+        self.app = app
+        self.last_query_count = 0
+
+    def __call__(self, environ, start_response):
+        with QueryCounter() as counter:
+            response = list(self.app(environ, start_response))
+        self.last_query_count = counter.count
+        return response
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def fetch(url):
+    with urlopen(url) as response:
+        response.read()
+        return response.status
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(url, status, timings, queries, allocations):
+    ordered = sorted(t * 1000 for t in timings)
+    return {
+        'url': url,
+        'status': status,
+        'p50_ms': round(percentile(ordered, 0.50), 2),
+        'p95_ms': round(percentile(ordered, 0.95), 2),
+        'p99_ms': round(percentile(ordered, 0.99), 2),
+        'mean_ms': round(statistics.fmean(ordered), 2) if ordered else 0.0,
+        'queries': round(statistics.fmean(queries), 1) if queries else 0.0,
+        'alloc_kb': round(statistics.fmean(allocations) / 1024, 1) if allocations else None,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, timeout=5,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
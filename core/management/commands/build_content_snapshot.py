@@ -0,0 +1,93 @@
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core import serializers
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from core.db_router import CONTENT_MODELS
+
+BUILD_ALIAS = 'snapshot_build'
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = 'Copy public content from the primary database into a read-only SQLite snapshot'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            default=os.environ.get('CONTENT_SNAPSHOT_PATH', 'content_snapshot.sqlite3'),
+            help='Snapshot file, relative to the project root (default: CONTENT_SNAPSHOT_PATH)',
+        )
+
+    def handle(self, *args, **options):
+        output = Path(settings.BASE_DIR) / options['output']
+        temp_path = output.with_name(f'{output.name}.building')
+        if temp_path.exists():
+            temp_path.unlink()
+        output.parent.mkdir(parents=True, exist_ok=True)
+
+        # Register a temporary alias; configure_settings fills in the keys Django expects
+        build_database = {'ENGINE': 'django.db.backends.sqlite3', 'NAME': str(temp_path)}
+        connections.settings[BUILD_ALIAS] = connections.configure_settings({'default': build_database})['default']
+        try:
+            call_command('migrate', database=BUILD_ALIAS, verbosity=0, interactive=False)
+            copied = self.copy_content()
+            with connections[BUILD_ALIAS].cursor() as cursor:
+                cursor.execute('VACUUM')
+        except Exception as e:
+            raise CommandError(f'Snapshot build failed: {e}') from e
+        finally:
+            connections[BUILD_ALIAS].close()
+            del connections[BUILD_ALIAS]
+            del connections.settings[BUILD_ALIAS]
+
+        # Running processes keep reading the old file until they reconnect
+        os.replace(temp_path, output)
+        self.stdout.write(self.style.SUCCESS(f'✅ Content snapshot written to {output} ({copied} rows)'))
+
+    def copy_content(self):
+        content_models = [m for m in apps.get_app_config('core').get_models() if m._meta.label_lower in CONTENT_MODELS]
+        ordered = serializers.sort_dependencies([(apps.get_app_config('core'), content_models)])
+
+        # Blog posts reference their authors; copy names only, never credentials
+        authors = [
+            User(id=user.id, username=user.username, first_name=user.first_name, last_name=user.last_name, password='!')
+            for user in User.objects.using('default').filter(blog_posts__isnull=False).distinct()
+        ]
+        User.objects.using(BUILD_ALIAS).bulk_create(authors)
+        copied = len(authors)
+
+        for model in ordered:
+            count = 0
+            with preserved_timestamps(model):
+                rows = []
+                for obj in model._default_manager.using('default').order_by('pk').iterator(chunk_size=BATCH_SIZE):
+                    rows.append(obj)
+                    if len(rows) >= BATCH_SIZE:
+                        model._default_manager.using(BUILD_ALIAS).bulk_create(rows)
+                        count += len(rows)
+                        rows = []
+                model._default_manager.using(BUILD_ALIAS).bulk_create(rows)
+                count += len(rows)
+            self.stdout.write(f'{model._meta.label}: {count} rows')
+            copied += count
+        return copied
+
+
+@contextmanager
+def preserved_timestamps(model):
+    """Stop auto_now/auto_now_add fields overwriting copied values during bulk_create"""
+    fields = [f for f in model._meta.concrete_fields if getattr(f, 'auto_now', False) or getattr(f, 'auto_now_add', False)]
+    saved = [(f, f.auto_now, f.auto_now_add) for f in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
@@ -0,0 +1,97 @@
+import gzip
+import json
+import os
+import time
+from pathlib import Path
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.template import Engine, Template, TemplateSyntaxError, engines
+from django.template.utils import get_app_template_dirs
+from core.template_loaders import BUNDLE_VERSION
+
+# The loaders the bundle stands in front of, in the same order as settings.TEMPLATES
+SOURCE_LOADERS = ['django.template.loaders.filesystem.Loader', 'django.template.loaders.app_directories.Loader']
+
+
+class Command(BaseCommand):
+    help = 'Bundle every template into one file for BundleLoader and flag templates that are slow to compile'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output', default=getattr(settings, 'TEMPLATE_BUNDLE_PATH', None),
+            help='Bundle file (default: TEMPLATE_BUNDLE_PATH)',
+        )
+        parser.add_argument(
+            '--threshold-ms', type=float, default=getattr(settings, 'TEMPLATE_COMPILE_BUDGET_MS', 50),
+            help='Flag templates whose compile time exceeds this (default: TEMPLATE_COMPILE_BUDGET_MS)',
+        )
+        parser.add_argument('--fail-on-slow', action='store_true', help='Exit non-zero when any template is flagged')
+        parser.add_argument('--check-only', action='store_true', help='Time compilation without writing the bundle')
+
+    def handle(self, *args, **options):
+        if not options['output'] and not options['check_only']:
+            raise CommandError('Set TEMPLATE_BUNDLE_PATH or pass --output')
+
+        # Same configuration as the project engine, minus the cache and the bundle itself
+        configured = engines['django'].engine
+        engine = Engine(
+            dirs=configured.dirs,
+            loaders=SOURCE_LOADERS,
+            context_processors=configured.context_processors,
+            libraries=configured.libraries,
+            builtins=[b for b in configured.builtins if b not in Engine.default_builtins],
+        )
+
+        templates = {}
+        timings = []
+        errors = []
+        for name in sorted(self.template_names(engine)):
+            # Resolve through the real loaders so precedence matches what Django would serve
+            _, origin = engine.find_template(name)
+            templates[name] = origin.loader.get_contents(origin)
+            try:
+                timings.append((name, compile_time(templates[name], origin, name, engine)))
+            except (TemplateSyntaxError, ImportError) as e:
+                errors.append((name, e))
+
+        slow = [(name, ms) for name, ms in timings if ms > options['threshold_ms']]
+        self.stdout.write('Slowest templates to compile:')
+        for name, ms in sorted(timings, key=lambda item: item[1], reverse=True)[:10]:
+            marker = '  <-- over budget' if ms > options['threshold_ms'] else ''
+            self.stdout.write(f'  {ms:7.1f} ms  {name}{marker}')
+        for name, error in errors:
+            self.stdout.write(self.style.WARNING(f'Could not compile {name}: {error}'))
+
+        if not options['check_only']:
+            output = Path(settings.BASE_DIR) / options['output']
+            output.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = output.with_name(f'{output.name}.tmp')
+            with gzip.open(temp_path, 'wt', encoding='utf-8') as f:
+                json.dump({'version': BUNDLE_VERSION, 'built_at': time.time(), 'templates': templates}, f)
+            os.replace(temp_path, output)
+            self.stdout.write(f'Wrote {len(templates)} templates to {output} ({output.stat().st_size // 1024} KB)')
+
+        if slow and options['fail_on_slow']:
+            raise CommandError(f"{len(slow)} templates exceed {options['threshold_ms']:.0f} ms to compile: {', '.join(name for name, _ in slow)}")
+
+        self.stdout.write(self.style.SUCCESS('✅ Template bundle built' if not options['check_only'] else '✅ Template check complete'))
+
+    def template_names(self, engine):
+        names = set()
+        for directory in [*engine.dirs, *get_app_template_dirs('templates')]:
+            directory = Path(directory)
+            for path in directory.rglob('*'):
+                if path.is_file() and path.suffix in ('.html', '.txt', '.xml'):
+                    names.add(path.relative_to(directory).as_posix())
+        return names
+
+
+def compile_time(source, origin, name, engine, repeat=3):
+    """Fastest of a few parses, in milliseconds"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        Template(source, origin, name, engine)
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
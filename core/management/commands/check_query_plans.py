@@ -0,0 +1,108 @@
+import json
+import re
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from core.models import (
+    Service, PricingPlan, Project, BlogPost, Testimonial, TeamMember, Portfolio, PortfolioCategory,
+    RelatedContent, Technology, Tag, ProjectTechnology, BlogPostTag
+)
+
+# SQLite reports "SCAN <table>" for a full table scan and "SCAN <table> USING ... INDEX" for an index walk
+SQLITE_FULL_SCAN_RE = re.compile(r'\bSCAN (?!CONSTANT ROW)(\S+)(?!.*\bUSING\b)')
+
+# Lookup tables that are always read in full
+ALLOWED_FULL_SCANS = {'core_portfoliocategory'}
+
+
+def public_querysets():
+    """The querysets the public views in core.views run, keyed by view and purpose"""
+    now = timezone.now()
+    return {
+        'home: featured services': Service.objects.filter(is_featured=True, is_active=True)[:3],
+        'home: featured projects': Project.objects.filter(is_featured=True)[:6],
+        'home: featured testimonials': Testimonial.objects.filter(is_featured=True, is_active=True)[:3],
+        'home: testimonials': Testimonial.objects.filter(is_active=True)[:6],
+        'home: team members': TeamMember.objects.filter(is_active=True)[:4],
+        'home: recent posts': BlogPost.objects.filter(status='published')[:3],
+        'home: portfolio categories': PortfolioCategory.objects.all(),
+        'home: portfolio index': Portfolio.objects.filter(is_active=True).select_related('category'),
+        'services: active services': Service.objects.filter(is_active=True).order_by('order', 'title'),
+        'services: packages': Service.objects.filter(is_active=True, price_type='package').order_by('order', 'title'),
+        'service_detail: related fallback': Service.objects.filter(is_active=True).exclude(id=0)[:3],
+        'pricing: active plans': PricingPlan.objects.filter(is_active=True),
+        'portfolio: first page': Project.objects.filter(status='completed').order_by('-created_at', '-pk')[:13],
+        'portfolio: next page': Project.objects.filter(status='completed').filter(
+            Q(created_at__lt=now) | Q(created_at=now, pk__lt=1)
+        ).order_by('-created_at', '-pk')[:13],
+        'portfolio: by technology': Project.objects.filter(
+            status='completed', tech_stack__slug='python'
+        ).order_by('-created_at', '-pk')[:13],
+        'portfolio: technology options': Technology.objects.filter(
+            id__in=ProjectTechnology.objects.filter(project__status='completed').values('technology_id')
+        ).values_list('name', flat=True),
+        'project_detail: related fallback': Project.objects.filter(status='completed').exclude(id=0)[:3],
+        'blog: first page': BlogPost.objects.filter(status='published').order_by('-published_at', '-pk')[:11],
+        'blog: next page': BlogPost.objects.filter(status='published').filter(
+            Q(published_at__lt=now) | Q(published_at=now, pk__lt=1)
+        ).order_by('-published_at', '-pk')[:11],
+        'blog: tag options': Tag.objects.filter(
+            id__in=BlogPostTag.objects.filter(post__status='published').values('tag_id')
+        ).values_list('name', flat=True),
+        'blog_detail: related fallback': BlogPost.objects.filter(status='published').exclude(id=0)[:3],
+        'about: team members': TeamMember.objects.filter(is_active=True),
+        'detail pages: related content': RelatedContent.objects.filter(
+            model_label='core.blogpost', object_id=1
+        ).values_list('related_ids', flat=True)[:1],
+    }
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN every public view queryset and fail if any of them falls back to a full table scan'
+
+    def handle(self, *args, **options):
+        if connection.vendor not in ('sqlite', 'postgresql'):
+            raise CommandError(f'Query plan checks are not supported on {connection.vendor}')
+
+        # The default in-memory database starts empty, so build the schema first
+        if connection.vendor == 'sqlite' and connection.settings_dict['NAME'] == ':memory:':
+            call_command('migrate', verbosity=0)
+
+        failures = []
+        for name, queryset in public_querysets().items():
+            plan, full_scans = self.explain(queryset)
+            if options['verbosity'] >= 2:
+                self.stdout.write(f'{name}:\n{plan}\n')
+            if full_scans:
+                failures.append(f"{name}: full scan of {', '.join(sorted(full_scans))}")
+
+        if failures:
+            for failure in failures:
+                self.stdout.write(self.style.ERROR(f'❌ {failure}'))
+            raise CommandError(f'{len(failures)} public queries fall back to a full table scan')
+
+        self.stdout.write(self.style.SUCCESS('✅ All public queries use an index'))
+
+    def explain(self, queryset):
+        """Return (plan text, set of tables read with a full scan)"""
+        if connection.vendor == 'sqlite':
+            plan = queryset.explain()
+            scans = {match.group(1) for match in SQLITE_FULL_SCAN_RE.finditer(plan)}
+            return plan, scans - ALLOWED_FULL_SCANS
+
+        # On small tables PostgreSQL prefers sequential scans, so ask whether an index plan exists at all
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+            plan = queryset.explain(format='json')
+
+        scans = set()
+        nodes = [json.loads(plan)[0]['Plan']]
+        while nodes:
+            node = nodes.pop()
+            if node.get('Node Type') == 'Seq Scan':
+                scans.add(node.get('Relation Name'))
+            nodes.extend(node.get('Plans', []))
+        return plan, scans - ALLOWED_FULL_SCANS
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from core.static_export import StaticExporter
+
+
+class Command(BaseCommand):
+    help = 'Render the public pages listed in the sitemaps into a static HTML tree for CDN serving'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help='Export directory (default: STATIC_EXPORT_ROOT)')
+        parser.add_argument('--host', help='Host the pages are rendered for (default: STATIC_EXPORT_HOST)')
+        parser.add_argument('--force', action='store_true', help='Re-render every page, not just changed ones')
+
+    def handle(self, *args, **options):
+        exporter = StaticExporter(root=options['output'], host=options['host'])
+        stats = exporter.export(force=options['force'])
+
+        self.stdout.write(
+            f"{stats['rendered']} rendered, {stats['written']} written, {stats['unchanged']} unchanged, "
+            f"{stats['skipped']} skipped (sources unchanged), {stats['removed']} removed, {stats['failed']} failed"
+        )
+        self.stdout.write(self.style.SUCCESS(f'✅ Static site exported to {exporter.root}'))
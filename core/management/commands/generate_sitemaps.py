@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from core.sitemap_files import generate, sitemap_root
+
+
+class Command(BaseCommand):
+    help = 'Write the sitemap index and per-section sitemap files (plus .gz variants)'
+
+    def handle(self, *args, **options):
+        manifest = generate()
+        for filename, lastmod in sorted(manifest.items()):
+            self.stdout.write(f'{filename}: last modified {lastmod}')
+        self.stdout.write(self.style.SUCCESS(f'✅ {len(manifest)} sitemap files written to {sitemap_root()}'))
@@ -0,0 +1,89 @@
+import json
+import os
+import re
+import subprocess
+import sys
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from core.integrations import DEFERRED_MODULES
+
+# What a fresh instance does before it can serve its first request
+STARTUP_SCRIPT = '''
+import json, sys, time
+started = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+get_wsgi_application()
+from django.urls import get_resolver
+get_resolver().url_patterns
+print(json.dumps({"total_ms": (time.perf_counter() - started) * 1000, "modules": sorted(sys.modules)}))
+'''
+
+# import time:       self [us] |  cumulative | imported package
+IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)')
+
+
+class Command(BaseCommand):
+    help = 'Measure cold-start import time with python -X importtime and enforce a budget'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=3, help='Fresh interpreters to start; the fastest run is reported')
+        parser.add_argument('--top', type=int, default=25, help='Slowest imports to list')
+        parser.add_argument(
+            '--budget-ms', type=float, default=getattr(settings, 'IMPORT_TIME_BUDGET_MS', None),
+            help='Fail when startup takes longer than this (default: IMPORT_TIME_BUDGET_MS)',
+        )
+        parser.add_argument('--allow-deferred', action='store_true',
+                            help='Do not fail when a deferred SDK (stripe, googleapiclient, ...) is imported at startup')
+        parser.add_argument('--json', action='store_true', help='Print the result as JSON')
+
+    def handle(self, *args, **options):
+        runs = [self.profile_once() for _ in range(max(options['runs'], 1))]
+        best = min(runs, key=lambda run: run['total_ms'])
+        deferred = sorted(
+            name for name in best['modules']
+            if any(name == module or name.startswith(f'{module}.') for module in DEFERRED_MODULES)
+        )
+
+        if options['json']:
+            self.stdout.write(json.dumps({
+                'total_ms': round(best['total_ms'], 1),
+                'runs_ms': [round(run['total_ms'], 1) for run in runs],
+                'deferred_imported': deferred,
+                'slowest': [{'module': name, 'cumulative_ms': round(us / 1000, 1)} for name, us in best['top_level'][:options['top']]],
+            }, indent=2))
+        else:
+            runs_ms = ', '.join(f"{run['total_ms']:.0f}" for run in runs)
+            self.stdout.write(f"Startup: {best['total_ms']:.1f} ms (runs: {runs_ms} ms)")
+            self.stdout.write('Slowest top-level imports (cumulative):')
+            for name, us in best['top_level'][:options['top']]:
+                self.stdout.write(f'  {us / 1000:8.1f} ms  {name}')
+
+        failures = []
+        if deferred and not options['allow_deferred']:
+            failures.append(f"deferred modules imported at startup: {', '.join(deferred[:10])}")
+        if options['budget_ms'] is not None and best['total_ms'] > options['budget_ms']:
+            failures.append(f"startup took {best['total_ms']:.1f} ms, budget is {options['budget_ms']:.0f} ms")
+        if failures:
+            raise CommandError('; '.join(failures))
+
+        self.stdout.write(self.style.SUCCESS('✅ Import time within budget'))
+
+    def profile_once(self):
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'socialdots.settings')}
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', STARTUP_SCRIPT],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            raise CommandError(f'Startup failed:\n{result.stderr[-2000:]}')
+
+        top_level = []
+        for line in result.stderr.splitlines():
+            match = IMPORTTIME_RE.match(line)
+            if match and not match.group(3):
+                top_level.append((match.group(4), int(match.group(2))))
+        top_level.sort(key=lambda item: item[1], reverse=True)
+
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+        report['top_level'] = top_level
+        return report
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from core.models import StripeEvent
+from core.stripe_events import pending_object_ids, process_object_events
+
+
+class Command(BaseCommand):
+    # Run on a schedule: an event that keeps failing blocks its object's later events until this picks it up
+    help = 'Apply stored Stripe webhook events that have not been processed (failed, or lost with a worker)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--skip-failed', action='store_true', help='Only pick up events that were never attempted')
+        parser.add_argument('--max-attempts', type=int, default=None, help='Leave events alone after this many attempts')
+
+    def handle(self, *args, **options):
+        object_ids = pending_object_ids(include_failed=not options['skip_failed'], max_attempts=options['max_attempts'])
+        for object_id in object_ids:
+            process_object_events(object_id, retry=False)
+
+        failed = StripeEvent.objects.filter(status='failed')
+        for event in failed[:20]:
+            self.stdout.write(self.style.WARNING(f'{event.event_id} {event.event_type} ({event.attempts} attempts): {event.last_error}'))
+        self.stdout.write(self.style.SUCCESS(f'✅ Processed events for {len(object_ids)} Stripe objects, {failed.count()} still failing'))
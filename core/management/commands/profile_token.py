@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from core.profiler import PROFILE_HEADER, PROFILE_PARAM, make_token
+
+
+class Command(BaseCommand):
+    help = 'Issue a signed token that lets a staff user profile requests with ?_profile=<token>'
+
+    def add_arguments(self, parser):
+        parser.add_argument('username', help='Staff user the token is issued to')
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['username']} does not exist")
+        if not user.is_staff:
+            raise CommandError(f'{user.username} is not a staff user')
+
+        token = make_token(user)
+        minutes = getattr(settings, 'PROFILER_TOKEN_MAX_AGE', 3600) // 60
+        self.stdout.write(f'Token: {token}')
+        self.stdout.write(f'Use while logged in as {user.username}: /blog/?{PROFILE_PARAM}={token}')
+        self.stdout.write(f'Or send it as the {PROFILE_HEADER} header; add &_profile_format=pstats for raw stats')
+        self.stdout.write(self.style.SUCCESS(f'✅ Token valid for {minutes} minutes'))
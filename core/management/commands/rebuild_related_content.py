@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from core.related_content import CORPORA, refresh_related
+
+
+class Command(BaseCommand):
+    help = 'Recompute TF-IDF related content for blog posts, projects, services and portfolios'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model',
+            choices=sorted(CORPORA),
+            help='Only refresh one model, e.g. core.blogpost',
+        )
+
+    def handle(self, *args, **options):
+        labels = [options['model']] if options['model'] else sorted(CORPORA)
+        for label in labels:
+            changed = refresh_related(label, full=True)
+            self.stdout.write(f'{label}: {changed} rows changed')
+
+        self.stdout.write(self.style.SUCCESS('✅ Related content rebuilt'))
@@ -0,0 +1,152 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Every metric, in the order it is exposed
+REGISTRY = []
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Each thread writes only to its own shard, so recording needs no lock;
+# the lock is taken once per thread to register the shard, and on scrape.
+_local = threading.local()
+_shards = []
+_shards_lock = threading.Lock()
+
+
+def _shard():
+    values = getattr(_local, 'values', None)
+    if values is None:
+        values = _local.values = {}
+        with _shards_lock:
+            _shards.append(values)
+    return values
+
+
+class Metric:
+    type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        REGISTRY.append(self)
+
+    def _key(self, labels):
+        return self, tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def _format_labels(self, values, extra=()):
+        pairs = list(zip(self.labelnames, values)) + list(extra)
+        if not pairs:
+            return ''
+        escaped = [(name, str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')) for name, value in pairs]
+        return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        values = _shard()
+        key = self._key(labels)
+        values[key] = values.get(key, 0) + amount
+
+    def merge(self, totals, value):
+        return (totals or 0) + value
+
+    def render(self, labels, total):
+        return [f'{self.name}{self._format_labels(labels)} {total}']
+
+
+class Histogram(Metric):
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        values = _shard()
+        key = self._key(labels)
+        entry = values.get(key)
+        if entry is None:
+            # Per-bucket counts (last one is +Inf), then the running sum
+            entry = values[key] = [0] * (len(self.buckets) + 2)
+        entry[bisect_left(self.buckets, value)] += 1
+        entry[-1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def merge(self, totals, value):
+        if totals is None:
+            return list(value)
+        return [a + b for a, b in zip(totals, value)]
+
+    def render(self, labels, entry):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + ('+Inf',), entry[:-1]):
+            cumulative += count
+            lines.append(f'{self.name}_bucket{self._format_labels(labels, [("le", bound)])} {cumulative}')
+        lines.append(f'{self.name}_sum{self._format_labels(labels)} {entry[-1]}')
+        lines.append(f'{self.name}_count{self._format_labels(labels)} {cumulative}')
+        return lines
+
+
+def collect():
+    """Totals across every thread's shard, keyed by (metric, label values)"""
+    with _shards_lock:
+        shards = list(_shards)
+    totals = {}
+    for shard in shards:
+        # list() copies in one step under the GIL, so a writer can't resize it mid-iteration
+        for (metric, labels), value in list(shard.items()):
+            totals[metric, labels] = metric.merge(totals.get((metric, labels)), value)
+    return totals
+
+
+def render_prometheus():
+    """All metrics in the Prometheus text exposition format"""
+    totals = collect()
+    lines = []
+    for metric in REGISTRY:
+        lines.append(f'# HELP {metric.name} {metric.documentation}')
+        lines.append(f'# TYPE {metric.name} {metric.type}')
+        for (owner, labels), value in sorted(totals.items(), key=lambda item: item[0][1]):
+            if owner is metric:
+                lines.extend(metric.render(labels, value))
+    return '\n'.join(lines) + '\n'
+
+
+REQUEST_DURATION = Histogram(
+    'socialdots_http_request_duration_seconds', 'Request latency by view', ['view', 'method', 'status'],
+)
+REQUEST_QUERIES = Histogram(
+    'socialdots_db_queries_per_request', 'SQL queries executed per request', ['view'],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100),
+)
+CACHE_REQUESTS = Counter('socialdots_cache_requests_total', 'Cache reads by result (hit or miss)', ['result'])
+API_CACHE_REQUESTS = Counter(
+    'socialdots_api_cache_requests_total', 'Pre-serialized API payload lookups by endpoint and result', ['endpoint', 'result'],
+)
+EXTERNAL_DURATION = Histogram(
+    'socialdots_external_request_duration_seconds', 'Outbound HTTP call latency by integration', ['service'],
+)
+EXTERNAL_ERRORS = Counter(
+    'socialdots_external_request_errors_total', 'Outbound HTTP calls that raised or returned 4xx/5xx', ['service'],
+)
+CIRCUIT_OPENED = Counter('socialdots_circuit_opened_total', 'Times an integration circuit breaker opened', ['service'])
+CIRCUIT_REJECTIONS = Counter(
+    'socialdots_circuit_rejections_total', 'Calls failed fast because the integration circuit was open', ['service'],
+)
+LEADS_CREATED = Counter('socialdots_leads_created_total', 'Leads created', ['source'])
+ORDERS_CREATED = Counter('socialdots_orders_created_total', 'Orders created')
+WEBHOOK_DURATION = Histogram('socialdots_webhook_processing_seconds', 'Inbound webhook handling time', ['source'])
+WEBHOOK_FAILURES = Counter('socialdots_webhook_failures_total', 'Inbound webhooks that were rejected or failed', ['source'])
@@ -1,4 +1,9 @@
 import logging
+import time
+from django.conf import settings
+from contextlib import ExitStack
+from django.db import connections
+from . import db_router, instrumentation, metrics, profiler
 
 logger = logging.getLogger(__name__)
 
@@ -76,4 +81,145 @@ class ContentSecurityPolicyMiddleware:
         # Also set the Report-Only version for debugging if needed
         # response['Content-Security-Policy-Report-Only'] = csp_value
         
-        return response
\ No newline at end of file
+        return response
+
+
+class PrimaryDatabasePinMiddleware:
+    """
+    Read-your-writes for staff sessions when content reads go to a replica.
+
+    A request that writes keeps reading from the primary for the rest of the
+    request; for staff, a cookie extends that for READ_YOUR_WRITES_SECONDS so
+    the admin never shows the replica's stale copy of an edit.
+    """
+    cookie_name = 'sd_read_primary'
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if db_router.read_alias() is None:
+            return self.get_response(request)
+
+        tokens = db_router.start_request(pinned=self.cookie_name in request.COOKIES)
+        try:
+            response = self.get_response(request)
+            wrote = db_router.wrote_content()
+        finally:
+            db_router.end_request(tokens)
+
+        user = getattr(request, 'user', None)
+        if wrote and user is not None and user.is_authenticated and user.is_staff:
+            response.set_cookie(
+                self.cookie_name, '1',
+                max_age=getattr(settings, 'READ_YOUR_WRITES_SECONDS', 30),
+                httponly=True, samesite='Lax',
+            )
+        return response
+
+
+class InstrumentationMiddleware:
+    """
+    Per-request SQL, template, outbound HTTP and cache timings.
+
+    Sampled requests (INSTRUMENTATION_SAMPLE_RATE) get a Server-Timing header
+    and a structured log line; repeated identical SQL is logged as a likely N+1.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'INSTRUMENTATION_ENABLED', True)
+        if self.enabled:
+            instrumentation.install()
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        token = instrumentation.start()
+        try:
+            metrics = instrumentation.current_metrics()
+            if metrics is None:
+                return self.get_response(request)
+
+            with instrumentation.sql_wrappers():
+                response = self.get_response(request)
+
+            # Streaming responses have not rendered yet, so their numbers would be incomplete
+            if not response.streaming:
+                response['Server-Timing'] = metrics.server_timing()
+            instrumentation.log_request(request, response, metrics)
+            return response
+        finally:
+            instrumentation.finish(token)
+
+
+class RequestProfilerMiddleware:
+    """
+    Staff-only on-demand profiling.
+
+    A request carrying ?_profile=<token> (or an X-Profile-Token header) from
+    `manage.py profile_token` runs under cProfile and returns a text report
+    (or ?_profile_format=pstats for the raw stats) instead of the page.
+    Requests without a token only pay for a substring check.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'PROFILER_ENABLED', True)
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        token = profiler.requested_token(request)
+        if not token:
+            return self.get_response(request)
+        if not profiler.is_authorized(request, token):
+            logger.warning(f"Rejected profiling token for {request.path}")
+            return self.get_response(request)
+
+        logger.info(f"Profiling {request.method} {request.path} for {request.user}")
+        return profiler.profile_request(request, self.get_response)
+
+
+class MetricsMiddleware:
+    """
+    Latency and SQL query count for every request, by view, for /metrics.
+
+    Unlike InstrumentationMiddleware this is not sampled; it only bumps
+    per-thread counters, so it stays cheap under load.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'METRICS_ENABLED', True)
+        if self.enabled:
+            instrumentation.install()
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        queries = [0]
+
+        def count_query(execute, sql, params, many, context):
+            queries[0] += 1
+            return execute(sql, params, many, context)
+
+        started = time.perf_counter()
+        status = 500
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(count_query))
+                response = self.get_response(request)
+            status = response.status_code
+            return response
+        finally:
+            match = getattr(request, 'resolver_match', None)
+            view = match.view_name if match else 'unmatched'
+            metrics.REQUEST_DURATION.observe(
+                time.perf_counter() - started, view=view, method=request.method, status=status,
+            )
+            metrics.REQUEST_QUERIES.observe(queries[0], view=view)
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_alter_blogpost_content_alter_project_description_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='portfolio',
+            name='image_upload_error',
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='portfolio',
+            name='image_upload_status',
+            field=models.CharField(choices=[('none', 'No Upload'), ('pending', 'Pending'), ('uploading', 'Uploading'), ('uploaded', 'Uploaded'), ('failed', 'Failed')], default='none', editable=False, max_length=20),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='image_upload_error',
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='image_upload_status',
+            field=models.CharField(choices=[('none', 'No Upload'), ('pending', 'Pending'), ('uploading', 'Uploading'), ('uploaded', 'Uploaded'), ('failed', 'Failed')], default='none', editable=False, max_length=20),
+        ),
+    ]
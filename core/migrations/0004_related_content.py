@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_image_upload_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedContent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_label', models.CharField(max_length=50)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('related_ids', models.JSONField(blank=True, default=list)),
+                ('scores', models.JSONField(blank=True, default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Related Content',
+                'verbose_name_plural': 'Related Content',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='relatedcontent',
+            constraint=models.UniqueConstraint(fields=('model_label', 'object_id'), name='unique_related_content_object'),
+        ),
+    ]
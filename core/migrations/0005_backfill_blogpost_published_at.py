@@ -0,0 +1,19 @@
+from django.db import migrations
+from django.db.models import F
+
+
+def backfill_published_at(apps, schema_editor):
+    BlogPost = apps.get_model('core', 'BlogPost')
+    db_alias = schema_editor.connection.alias
+    BlogPost.objects.using(db_alias).filter(status='published', published_at__isnull=True).update(published_at=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_related_content'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_published_at, migrations.RunPython.noop),
+    ]
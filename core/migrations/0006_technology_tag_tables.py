@@ -0,0 +1,104 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:16
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_backfill_blogpost_published_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('slug', models.SlugField(max_length=100, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['name'],
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Technology',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('slug', models.SlugField(max_length=100, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Technologies',
+                'ordering': ['name'],
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='ProjectTechnology',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.project')),
+                ('technology', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.technology')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PortfolioTechnology',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('portfolio', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.portfolio')),
+                ('technology', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.technology')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='BlogPostTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.blogpost')),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.tag')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='post_tags',
+            field=models.ManyToManyField(blank=True, related_name='posts', through='core.BlogPostTag', to='core.tag'),
+        ),
+        migrations.AddField(
+            model_name='portfolio',
+            name='tech_stack',
+            field=models.ManyToManyField(blank=True, related_name='portfolios', through='core.PortfolioTechnology', to='core.technology'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='tech_stack',
+            field=models.ManyToManyField(blank=True, related_name='projects', through='core.ProjectTechnology', to='core.technology'),
+        ),
+        migrations.AddIndex(
+            model_name='projecttechnology',
+            index=models.Index(fields=['technology', 'project'], name='project_tech_reverse_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='projecttechnology',
+            constraint=models.UniqueConstraint(fields=('project', 'technology'), name='unique_project_technology'),
+        ),
+        migrations.AddIndex(
+            model_name='portfoliotechnology',
+            index=models.Index(fields=['technology', 'portfolio'], name='portfolio_tech_reverse_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='portfoliotechnology',
+            constraint=models.UniqueConstraint(fields=('portfolio', 'technology'), name='unique_portfolio_technology'),
+        ),
+        migrations.AddIndex(
+            model_name='blogposttag',
+            index=models.Index(fields=['tag', 'post'], name='blogpost_tag_reverse_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='blogposttag',
+            constraint=models.UniqueConstraint(fields=('post', 'tag'), name='unique_blogpost_tag'),
+        ),
+    ]
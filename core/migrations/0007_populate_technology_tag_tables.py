@@ -0,0 +1,47 @@
+from django.db import migrations
+from django.utils.text import slugify
+
+
+def _terms(Term, names, cache, db_alias):
+    """Term rows for a JSON list of names, matched by slug"""
+    terms = []
+    for name in names or []:
+        name = str(name).strip()
+        slug = slugify(name.replace('+', ' plus').replace('#', ' sharp'))[:100]
+        if not slug:
+            continue
+        if slug not in cache:
+            cache[slug], _ = Term.objects.using(db_alias).get_or_create(slug=slug, defaults={'name': name[:100]})
+        if cache[slug] not in terms:
+            terms.append(cache[slug])
+    return terms
+
+
+def populate(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+    Technology = apps.get_model('core', 'Technology')
+    Tag = apps.get_model('core', 'Tag')
+    technologies, tags = {}, {}
+
+    sources = [
+        (apps.get_model('core', 'Project'), 'technologies', apps.get_model('core', 'ProjectTechnology'), 'project', Technology, 'technology', technologies),
+        (apps.get_model('core', 'Portfolio'), 'technology_used', apps.get_model('core', 'PortfolioTechnology'), 'portfolio', Technology, 'technology', technologies),
+        (apps.get_model('core', 'BlogPost'), 'tags', apps.get_model('core', 'BlogPostTag'), 'post', Tag, 'tag', tags),
+    ]
+    for Model, json_field, Through, owner_field, Term, term_field, cache in sources:
+        links = []
+        for obj in Model.objects.using(db_alias).only('pk', json_field).iterator():
+            for term in _terms(Term, getattr(obj, json_field), cache, db_alias):
+                links.append(Through(**{f'{owner_field}_id': obj.pk, f'{term_field}_id': term.pk}))
+        Through.objects.using(db_alias).bulk_create(links, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_technology_tag_tables'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate, migrations.RunPython.noop),
+    ]
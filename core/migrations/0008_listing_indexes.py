@@ -0,0 +1,61 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_populate_technology_tag_tables'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(condition=models.Q(('status', 'published')), fields=['-published_at', '-created_at'], name='blogpost_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(condition=models.Q(('status', 'published')), fields=['-published_at', '-id'], name='blogpost_published_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='portfolio',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order', '-created_at'], name='portfolio_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pricingplan',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order', 'price'], name='pricingplan_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='project_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(condition=models.Q(('is_featured', True)), fields=['-created_at'], name='project_featured_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order', 'title'], name='service_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_featured', True)), fields=['order', 'title'], name='service_featured_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['price_type', 'order', 'title'], name='service_active_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='teammember',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order', 'name'], name='teammember_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testimonial',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order', '-created_at'], name='testimonial_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testimonial',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_featured', True)), fields=['order', '-created_at'], name='testimonial_featured_idx'),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:45
+
+from django.db import migrations, models
+
+
+def mark_existing_processed(apps, schema_editor):
+    # Events recorded before this migration were handled inline when they arrived
+    db_alias = schema_editor.connection.alias
+    apps.get_model('core', 'StripeEvent').objects.using(db_alias).update(status='processed')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_stripe_events'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='stripeevent',
+            name='attempts',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='stripeevent',
+            name='last_error',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='stripeevent',
+            name='payload',
+            field=models.JSONField(default=dict),
+        ),
+        migrations.AddField(
+            model_name='stripeevent',
+            name='processed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='stripeevent',
+            name='status',
+            field=models.CharField(choices=[('received', 'Received'), ('processed', 'Processed'), ('failed', 'Failed')], default='received', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='stripeevent',
+            name='stripe_created',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='stripeevent',
+            index=models.Index(condition=models.Q(('status', 'processed'), _negated=True), fields=['object_id', 'stripe_created', 'id'], name='stripeevent_pending_idx'),
+        ),
+        migrations.RunPython(mark_existing_processed, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,10 @@
+from django.conf import settings
+from django.core.cache import cache
 from django.db import models
 from django.contrib.auth.models import User
 from django.urls import reverse
 from django.utils.text import slugify
+from django.utils import timezone
 from django.core.validators import RegexValidator, MinValueValidator, MaxValueValidator
 from django.core.exceptions import ValidationError
 from decimal import Decimal
@@ -9,6 +12,18 @@ from decimal import Decimal
 # from ckeditor_uploader.fields import RichTextUploadingField
 
 
+IMAGE_UPLOAD_STATUS_CHOICES = [
+    ('none', 'No Upload'),
+    ('pending', 'Pending'),
+    ('uploading', 'Uploading'),
+    ('uploaded', 'Uploaded'),
+    ('failed', 'Failed'),
+]
+
+
+SITE_CONFIG_CACHE_KEY = 'site-configuration'
+
+
 class SiteConfiguration(models.Model):
     site_name = models.CharField(max_length=100, default="Social Dots Inc.")
     tagline = models.CharField(max_length=200, default="Empowering Canadian businesses to thrive in a constantly evolving digital world", blank=True)
@@ -70,6 +85,18 @@ class SiteConfiguration(models.Model):
     def save(self, *args, **kwargs):
         self.full_clean()
         super().save(*args, **kwargs)
+        cache.delete(SITE_CONFIG_CACHE_KEY)
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        cache.delete(SITE_CONFIG_CACHE_KEY)
+        return result
+
+    @classmethod
+    def current(cls):
+        """The site configuration, cached so every page render doesn't query it"""
+        timeout = getattr(settings, 'SITE_CONFIG_CACHE_SECONDS', 300)
+        return cache.get_or_set(SITE_CONFIG_CACHE_KEY, cls.objects.first, timeout)
 
     def __str__(self):
         return self.site_name
@@ -91,6 +118,9 @@ class TeamMember(models.Model):
 
     class Meta:
         ordering = ['order', 'name']
+        indexes = [
+            models.Index(fields=['order', 'name'], condition=models.Q(is_active=True), name='teammember_active_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} - {self.position}"
@@ -164,6 +194,11 @@ class Service(models.Model):
 
     class Meta:
         ordering = ['order', 'title']
+        indexes = [
+            models.Index(fields=['order', 'title'], condition=models.Q(is_active=True), name='service_active_idx'),
+            models.Index(fields=['order', 'title'], condition=models.Q(is_active=True, is_featured=True), name='service_featured_idx'),
+            models.Index(fields=['price_type', 'order', 'title'], condition=models.Q(is_active=True), name='service_active_type_idx'),
+        ]
 
     def clean(self):
         """Business rule validation for Social Dots services"""
@@ -211,11 +246,66 @@ class PricingPlan(models.Model):
 
     class Meta:
         ordering = ['order', 'price']
+        indexes = [
+            models.Index(fields=['order', 'price'], condition=models.Q(is_active=True), name='pricingplan_active_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} - ${self.price}/{self.price_period}"
 
 
+def term_slug(name):
+    """Slug identity for a technology or tag name; keeps 'C++' and 'C#' apart from 'C'"""
+    name = str(name).strip().replace('+', ' plus').replace('#', ' sharp')
+    return slugify(name)[:100]
+
+
+class TaxonomyTerm(models.Model):
+    """Shared fields for normalised label tables; the slug is the identity"""
+    name = models.CharField(max_length=100)
+    slug = models.SlugField(max_length=100, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        abstract = True
+        ordering = ['name']
+
+    @classmethod
+    def for_names(cls, names):
+        """
+        Terms for a list of free-text names, creating any that are missing.
+
+        Names are matched by slug, so 'React' and 'react' are the same term.
+        """
+        wanted = {}
+        for name in names or []:
+            name = str(name).strip()
+            slug = term_slug(name)
+            if slug and slug not in wanted:
+                wanted[slug] = name[:100]
+        if not wanted:
+            return []
+
+        existing = {term.slug: term for term in cls.objects.filter(slug__in=wanted)}
+        missing = [cls(name=name, slug=slug) for slug, name in wanted.items() if slug not in existing]
+        if missing:
+            cls.objects.bulk_create(missing, ignore_conflicts=True)
+            existing = {term.slug: term for term in cls.objects.filter(slug__in=wanted)}
+        return [existing[slug] for slug in wanted if slug in existing]
+
+    def __str__(self):
+        return self.name
+
+
+class Technology(TaxonomyTerm):
+    class Meta(TaxonomyTerm.Meta):
+        verbose_name_plural = "Technologies"
+
+
+class Tag(TaxonomyTerm):
+    pass
+
+
 class Project(models.Model):
     STATUS_CHOICES = [
         ('planning', 'Planning'),
@@ -230,8 +320,11 @@ class Project(models.Model):
     description = models.TextField()
     image = models.ImageField(upload_to='project_images/', blank=True, null=True)
     cloudinary_image_id = models.CharField(max_length=255, blank=True, null=True)
+    image_upload_status = models.CharField(max_length=20, choices=IMAGE_UPLOAD_STATUS_CHOICES, default='none', editable=False)
+    image_upload_error = models.CharField(max_length=255, blank=True, editable=False)
     gallery = models.JSONField(default=list, blank=True, help_text="List of image URLs")
     technologies = models.JSONField(default=list, blank=True)
+    tech_stack = models.ManyToManyField(Technology, through='ProjectTechnology', related_name='projects', blank=True)
     portfolio_type = models.CharField(
         max_length=20,
         choices=[
@@ -254,31 +347,40 @@ class Project(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Listings filter on status and page on (created_at, id)
+            models.Index(fields=['status', '-created_at', '-id'], name='project_status_created_idx'),
+            models.Index(fields=['-created_at'], condition=models.Q(is_featured=True), name='project_featured_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The list tech_stack matches, so save() only rewrites the join table when it changes
+        if 'technologies' in instance.__dict__:
+            instance._synced_technologies = list(instance.technologies or [])
+        return instance
 
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.title)
-        
-        # Handle image upload to Cloudinary if image field has a file
-        if self.image and not self.cloudinary_image_id and hasattr(self.image, 'file') and not self.image.name.endswith('/'): 
-            # Check if the image is not empty and not a directory
-            if hasattr(self.image, 'size') and self.image.size > 0:
-                from .cloudinary_utils import upload_image
-                try:
-                    # Upload the image to Cloudinary
-                    result = upload_image(self.image, folder=f'project_images/{self.slug}')
-                    # Store the Cloudinary public ID
-                    self.cloudinary_image_id = result['public_id']
-                except Exception as e:
-                    # Log the error but continue saving the model
-                    import logging
-                    logger = logging.getLogger(__name__)
-                    logger.error(f"Error uploading image to Cloudinary: {e}")
-            else:
-                # If the image file is empty, set the image field to None to prevent upload errors
-                self.image = None
-        
+
+        # Cloudinary uploads run on the background worker pool once the row is saved
+        from .cloudinary_uploads import needs_upload, queue_image_upload
+        upload_pending = needs_upload(self)
+        if upload_pending:
+            self.image_upload_status = 'pending'
+            self.image_upload_error = ''
+
+        sync_tech_stack = self.technologies != getattr(self, '_synced_technologies', None)
         super().save(*args, **kwargs)
+        # The JSON list stays the editable source; the join table is what listings filter on
+        if sync_tech_stack:
+            self.tech_stack.set(Technology.for_names(self.technologies))
+            self._synced_technologies = list(self.technologies or [])
+
+        if upload_pending:
+            queue_image_upload(self)
 
     def get_absolute_url(self):
         return reverse('project_detail', kwargs={'slug': self.slug})
@@ -293,7 +395,9 @@ class Project(models.Model):
             if url:  # Only return if URL is valid
                 return url
         elif self.image:
-            return self.image.url
+            # Without Cloudinary, resize locally when a transformation is requested
+            from .image_variants import variant_url
+            return variant_url(self.image, **options)
         
         # Return placeholder for projects without images
         return self.get_placeholder_image()
@@ -329,6 +433,7 @@ class BlogPost(models.Model):
     featured_image = models.CharField(max_length=200, blank=True, null=True, help_text="Blog post featured image path")
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='draft')
     tags = models.JSONField(default=list, blank=True)
+    post_tags = models.ManyToManyField(Tag, through='BlogPostTag', related_name='posts', blank=True)
     meta_description = models.CharField(max_length=160, blank=True)
     is_featured = models.BooleanField(default=False)
     published_at = models.DateTimeField(blank=True, null=True)
@@ -337,11 +442,31 @@ class BlogPost(models.Model):
 
     class Meta:
         ordering = ['-published_at', '-created_at']
+        indexes = [
+            models.Index(fields=['-published_at', '-created_at'], condition=models.Q(status='published'), name='blogpost_published_idx'),
+            # Keyset pagination orders on (published_at, id)
+            models.Index(fields=['-published_at', '-id'], condition=models.Q(status='published'), name='blogpost_published_keyset_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The list post_tags matches, so save() only rewrites the join table when it changes
+        if 'tags' in instance.__dict__:
+            instance._synced_tags = list(instance.tags or [])
+        return instance
 
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.title)
+        # Listings paginate on (published_at, id), so published posts always need one
+        if self.status == 'published' and not self.published_at:
+            self.published_at = timezone.now()
+        sync_post_tags = self.tags != getattr(self, '_synced_tags', None)
         super().save(*args, **kwargs)
+        if sync_post_tags:
+            self.post_tags.set(Tag.for_names(self.tags))
+            self._synced_tags = list(self.tags or [])
 
     def get_absolute_url(self):
         return reverse('blog_detail', kwargs={'slug': self.slug})
@@ -364,6 +489,10 @@ class Testimonial(models.Model):
 
     class Meta:
         ordering = ['order', '-created_at']
+        indexes = [
+            models.Index(fields=['order', '-created_at'], condition=models.Q(is_active=True), name='testimonial_active_idx'),
+            models.Index(fields=['order', '-created_at'], condition=models.Q(is_active=True, is_featured=True), name='testimonial_featured_idx'),
+        ]
 
     def __str__(self):
         return f"{self.client_name} - {self.rating} stars"
@@ -421,7 +550,7 @@ class Order(models.Model):
     currency = models.CharField(max_length=3, default='CAD')
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     stripe_payment_intent_id = models.CharField(max_length=100, blank=True)
-    stripe_session_id = models.CharField(max_length=100, blank=True)
+    stripe_session_id = models.CharField(max_length=100, blank=True, db_index=True)
     frappe_document_id = models.CharField(max_length=100, blank=True)
     notes = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -440,6 +569,40 @@ class Order(models.Model):
         return f"Order {self.order_id} - {self.customer_name}"
 
 
+class StripeEvent(models.Model):
+    """
+    Every Stripe webhook event received, stored before it is acknowledged and
+    processed afterwards by core.stripe_events; the unique event id makes
+    Stripe's redeliveries a no-op.
+    """
+    STATUS_CHOICES = [
+        ('received', 'Received'),
+        ('processed', 'Processed'),
+        ('failed', 'Failed'),
+    ]
+
+    event_id = models.CharField(max_length=100, unique=True)
+    event_type = models.CharField(max_length=100)
+    object_id = models.CharField(max_length=100, blank=True)
+    payload = models.JSONField(default=dict)
+    # Stripe's own timestamp; events for one object are applied in this order
+    stripe_created = models.PositiveBigIntegerField(default=0)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='received')
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-received_at']
+        indexes = [
+            models.Index(fields=['object_id', 'stripe_created', 'id'], condition=~models.Q(status='processed'), name='stripeevent_pending_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} {self.event_id}"
+
+
 class CalendarEvent(models.Model):
     title = models.CharField(max_length=200)
     description = models.TextField(blank=True)
@@ -490,6 +653,8 @@ class Portfolio(models.Model):
     description = models.TextField(blank=True)
     image = models.ImageField(upload_to='portfolio_images/', blank=True, null=True)
     cloudinary_image_id = models.CharField(max_length=255, blank=True, null=True, help_text="Cloudinary public ID for the image")
+    image_upload_status = models.CharField(max_length=20, choices=IMAGE_UPLOAD_STATUS_CHOICES, default='none', editable=False)
+    image_upload_error = models.CharField(max_length=255, blank=True, editable=False)
     category = models.ForeignKey(PortfolioCategory, on_delete=models.CASCADE, related_name='portfolios')
     
     content_type = models.CharField(max_length=20, choices=[
@@ -510,6 +675,7 @@ class Portfolio(models.Model):
     video_url = models.URLField(blank=True, help_text="YouTube video URL")
     blog_link = models.URLField(blank=True, help_text="Link to blog post")
     technology_used = models.JSONField(default=list, blank=True, help_text="List of technologies used")
+    tech_stack = models.ManyToManyField(Technology, through='PortfolioTechnology', related_name='portfolios', blank=True)
     is_featured = models.BooleanField(default=False)
     is_active = models.BooleanField(default=True)
     order = models.PositiveIntegerField(default=0)
@@ -521,11 +687,36 @@ class Portfolio(models.Model):
         verbose_name = "Portfolio"
         verbose_name_plural = "Portfolios"
         ordering = ['order', '-created_at']
+        indexes = [
+            models.Index(fields=['order', '-created_at'], condition=models.Q(is_active=True), name='portfolio_active_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The list tech_stack matches, so save() only rewrites the join table when it changes
+        if 'technology_used' in instance.__dict__:
+            instance._synced_technology_used = list(instance.technology_used or [])
+        return instance
 
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.title)
+
+        from .cloudinary_uploads import needs_upload, queue_image_upload
+        upload_pending = needs_upload(self)
+        if upload_pending:
+            self.image_upload_status = 'pending'
+            self.image_upload_error = ''
+
+        sync_tech_stack = self.technology_used != getattr(self, '_synced_technology_used', None)
         super().save(*args, **kwargs)
+        if sync_tech_stack:
+            self.tech_stack.set(Technology.for_names(self.technology_used))
+            self._synced_technology_used = list(self.technology_used or [])
+
+        if upload_pending:
+            queue_image_upload(self)
 
     def get_absolute_url(self):
         return reverse('portfolio_detail', kwargs={'slug': self.slug})
@@ -540,7 +731,9 @@ class Portfolio(models.Model):
             if url:  # Only return if URL is valid
                 return url
         elif self.image:
-            return self.image.url
+            # Without Cloudinary, resize locally when a transformation is requested
+            from .image_variants import variant_url
+            return variant_url(self.image, **options)
         
         # Return placeholder for projects/portfolio without images
         return self.get_placeholder_image()
@@ -581,4 +774,61 @@ class AIAgentLog(models.Model):
         ordering = ['-created_at']
 
     def __str__(self):
-        return f"{self.log_type} - {self.created_at.strftime('%Y-%m-%d %H:%M')}"
\ No newline at end of file
+        return f"{self.log_type} - {self.created_at.strftime('%Y-%m-%d %H:%M')}"
+
+class RelatedContent(models.Model):
+    """Precomputed related items for a detail page, maintained by core.related_content"""
+    model_label = models.CharField(max_length=50)
+    object_id = models.PositiveBigIntegerField()
+    related_ids = models.JSONField(default=list, blank=True)
+    scores = models.JSONField(default=list, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Related Content"
+        verbose_name_plural = "Related Content"
+        constraints = [
+            models.UniqueConstraint(fields=['model_label', 'object_id'], name='unique_related_content_object'),
+        ]
+
+    def __str__(self):
+        return f"{self.model_label} #{self.object_id}"
+
+
+class ProjectTechnology(models.Model):
+    project = models.ForeignKey(Project, on_delete=models.CASCADE)
+    technology = models.ForeignKey(Technology, on_delete=models.CASCADE)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['project', 'technology'], name='unique_project_technology'),
+        ]
+        indexes = [
+            models.Index(fields=['technology', 'project'], name='project_tech_reverse_idx'),
+        ]
+
+
+class PortfolioTechnology(models.Model):
+    portfolio = models.ForeignKey(Portfolio, on_delete=models.CASCADE)
+    technology = models.ForeignKey(Technology, on_delete=models.CASCADE)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['portfolio', 'technology'], name='unique_portfolio_technology'),
+        ]
+        indexes = [
+            models.Index(fields=['technology', 'portfolio'], name='portfolio_tech_reverse_idx'),
+        ]
+
+
+class BlogPostTag(models.Model):
+    post = models.ForeignKey(BlogPost, on_delete=models.CASCADE)
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['post', 'tag'], name='unique_blogpost_tag'),
+        ]
+        indexes = [
+            models.Index(fields=['tag', 'post'], name='blogpost_tag_reverse_idx'),
+        ]
@@ -0,0 +1,172 @@
+import logging
+import threading
+import time
+from django.conf import settings
+from django.db import connections
+from django.dispatch import Signal
+from django.urls import reverse
+from . import background
+from .sitemap import BlogSitemap, PortfolioSitemap, ProjectSitemap, ServiceSitemap
+
+logger = logging.getLogger(__name__)
+
+# Sent with paths={...} once a debounced batch of edits is ready to re-render or purge
+pages_changed = Signal()
+
+SITEMAP_PATH = '/sitemap.xml'
+
+# Models with their own detail page, and the sitemap that knows its URL and visibility
+DETAIL_SITEMAPS = {
+    'core.blogpost': BlogSitemap,
+    'core.service': ServiceSitemap,
+    'core.portfolio': PortfolioSitemap,
+    'core.project': ProjectSitemap,
+}
+
+# Listing pages (URL names) whose sections render rows of each model
+LISTING_PAGES = {
+    'core.blogpost': ('home', 'blog'),
+    'core.service': ('home', 'services'),
+    'core.servicepricingoption': ('services',),
+    'core.pricingplan': ('services',),
+    'core.portfolio': ('home', 'portfolio'),
+    'core.portfoliocategory': ('home', 'portfolio'),
+    'core.project': ('home', 'portfolio'),
+    'core.testimonial': ('home', 'about'),
+    'core.teammember': ('home', 'about'),
+}
+
+# Rows shown on their parent's detail page
+PARENT_FIELDS = {
+    'core.servicepricingoption': 'service',
+}
+
+# Every page renders the site configuration
+ALL_PAGES_MODELS = frozenset({'core.siteconfiguration'})
+
+TRACKED_MODELS = frozenset(DETAIL_SITEMAPS) | frozenset(LISTING_PAGES) | ALL_PAGES_MODELS
+
+
+def detail_path(instance, stored=False):
+    """
+    The instance's public detail URL, or None when it has no page (or it isn't
+    public). stored=True gives the URL of the row as saved, before a pending edit.
+    """
+    sitemap_class = DETAIL_SITEMAPS.get(instance._meta.label_lower)
+    if sitemap_class is None or instance.pk is None:
+        return None
+    sitemap = sitemap_class()
+    if stored:
+        row = sitemap.items().filter(pk=instance.pk).first()
+        return sitemap.location(row) if row is not None else None
+    if not sitemap.items().filter(pk=instance.pk).exists():
+        return None
+    return sitemap.location(instance)
+
+
+def all_pages():
+    from .static_export import public_pages
+    return set(public_pages())
+
+
+def pages_for(instance, previous_path=None):
+    """
+    URLs whose rendered HTML depends on this row: its detail page (and the one
+    it had before a slug change or unpublish), listings that show it, detail
+    pages that list it as related, its parent's page and the sitemap.
+    """
+    label = instance._meta.label_lower
+    if label in ALL_PAGES_MODELS:
+        return all_pages() | {SITEMAP_PATH}
+
+    paths = {reverse(name) for name in LISTING_PAGES.get(label, ())}
+
+    if label in DETAIL_SITEMAPS:
+        current = detail_path(instance)
+        paths |= {path for path in (current, previous_path) if path}
+        # Listed in (or dropped from) the sitemap, or its lastmod moved
+        paths.add(SITEMAP_PATH)
+        paths |= related_detail_paths(instance)
+
+    parent_field = PARENT_FIELDS.get(label)
+    if parent_field:
+        parent = getattr(instance, parent_field, None)
+        if parent is not None:
+            paths |= {path for path in (detail_path(parent),) if path}
+    return paths
+
+
+def related_detail_paths(instance):
+    """Detail pages whose related-items section lists this instance"""
+    from .models import RelatedContent
+    label = instance._meta.label_lower
+    rows = RelatedContent.objects.filter(model_label=label)
+    if connections[rows.db].features.supports_json_field_contains:
+        referencing = list(rows.filter(related_ids__contains=[instance.pk]).values_list('object_id', flat=True))
+    else:
+        # SQLite has no JSON containment lookup
+        referencing = [
+            object_id
+            for object_id, related_ids in rows.values_list('object_id', 'related_ids')
+            if instance.pk in related_ids
+        ]
+    if not referencing:
+        return set()
+    sitemap = DETAIL_SITEMAPS[label]()
+    return {sitemap.location(obj) for obj in sitemap.items().filter(pk__in=referencing)}
+
+
+class RegenerationQueue:
+    """
+    Collects changed URLs and flushes them as one batch once edits pause for
+    PAGE_REGENERATION_DEBOUNCE seconds, or at most PAGE_REGENERATION_MAX_DELAY
+    after the first edit of the batch.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._timer = None
+        self._first_at = None
+
+    def add(self, paths):
+        if not paths:
+            return
+        if background.run_inline():
+            flush_paths(set(paths))
+            return
+
+        debounce = getattr(settings, 'PAGE_REGENERATION_DEBOUNCE', 2.0)
+        max_delay = getattr(settings, 'PAGE_REGENERATION_MAX_DELAY', 10.0)
+        with self._lock:
+            now = time.monotonic()
+            if self._first_at is None:
+                self._first_at = now
+            self._pending |= set(paths)
+            if self._timer is not None:
+                self._timer.cancel()
+            delay = max(0.0, min(debounce, self._first_at + max_delay - now))
+            self._timer = threading.Timer(delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        with self._lock:
+            paths, self._pending = self._pending, set()
+            self._timer = None
+            self._first_at = None
+        if paths:
+            background.submit('pages', flush_paths, paths)
+
+
+regeneration_queue = RegenerationQueue()
+
+
+def flush_paths(paths):
+    """Tell listeners (CDN purge, caches) and refresh the static export for a batch of URLs"""
+    logger.info(f"Regenerating {len(paths)} pages: {', '.join(sorted(paths)[:10])}")
+    pages_changed.send(sender=None, paths=paths)
+    if getattr(settings, 'STATIC_EXPORT_ON_SAVE', False):
+        from .static_export import StaticExporter
+        stats = StaticExporter().refresh(paths)
+        logger.info(f"Static export refreshed: {stats}")
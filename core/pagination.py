@@ -0,0 +1,159 @@
+import base64
+import hashlib
+import json
+import logging
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+logger = logging.getLogger(__name__)
+
+
+def encode_cursor(direction, value, pk):
+    """Opaque token for a position in a (value, id) ordered listing"""
+    raw = json.dumps([direction, value.isoformat() if value else None, pk], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Return (direction, value, pk) or None if the token is missing or malformed"""
+    if not token:
+        return None
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        direction, value, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        moment = parse_datetime(value) if isinstance(value, str) else None
+        if direction not in ('next', 'prev') or moment is None or timezone.is_naive(moment):
+            raise ValueError('bad direction or timestamp')
+        return direction, moment, int(pk)
+    except (ValueError, TypeError):
+        logger.warning(f"Ignoring invalid pagination cursor: {token[:40]}")
+        return None
+
+
+class KeysetPage:
+    """
+    One page of a keyset listing.
+
+    Iterable like a Django Page, but links to neighbouring pages by cursor
+    rather than page number.
+    """
+
+    def __init__(self, object_list, next_cursor, previous_cursor, approximate_count, per_page):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.approximate_count = approximate_count
+        self.per_page = per_page
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    Paginate a queryset newest-first on (field, id) without COUNT or OFFSET.
+
+    The total shown to users is an approximate count cached per query.
+    """
+
+    def __init__(self, queryset, per_page, field='created_at', count_timeout=300):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.field = field
+        self.count_timeout = count_timeout
+
+    def approximate_count(self):
+        query_hash = hashlib.md5(str(self.queryset.query).encode()).hexdigest()
+        return cache.get_or_set(f'keyset-count:{query_hash}', self.queryset.count, self.count_timeout)
+
+    def get_page(self, cursor=None):
+        position = decode_cursor(cursor)
+        field = self.field
+        queryset = self.queryset
+
+        if position is None:
+            rows = list(queryset.order_by(f'-{field}', '-pk')[:self.per_page + 1])
+            has_more, has_before = len(rows) > self.per_page, False
+            rows = rows[:self.per_page]
+        else:
+            direction, value, pk = position
+            if direction == 'next':
+                after = Q(**{f'{field}__lt': value}) | Q(**{field: value, 'pk__lt': pk})
+                rows = list(queryset.filter(after).order_by(f'-{field}', '-pk')[:self.per_page + 1])
+                has_more, has_before = len(rows) > self.per_page, True
+                rows = rows[:self.per_page]
+            else:
+                before = Q(**{f'{field}__gt': value}) | Q(**{field: value, 'pk__gt': pk})
+                rows = list(queryset.filter(before).order_by(field, 'pk')[:self.per_page + 1])
+                has_more, has_before = True, len(rows) > self.per_page
+                rows = list(reversed(rows[:self.per_page]))
+
+        next_cursor = previous_cursor = None
+        if rows and has_more:
+            last = rows[-1]
+            next_cursor = encode_cursor('next', getattr(last, field), last.pk)
+        if rows and has_before:
+            first = rows[0]
+            previous_cursor = encode_cursor('prev', getattr(first, field), first.pk)
+
+        return KeysetPage(rows, next_cursor, previous_cursor, self.approximate_count(), self.per_page)
+
+
+def paginate_items(items, limit, cursor=None, field='created_at'):
+    """
+    Keyset-paginate an in-memory list newest-first on (field, id).
+
+    Used by the JSON APIs that serve from in-process indexes, which only link
+    forwards; a 'prev' cursor raises ValueError.
+    """
+    ordered = sorted(items, key=lambda item: (getattr(item, field), item.pk), reverse=True)
+    position = decode_cursor(cursor)
+    if position is not None:
+        direction, value, pk = position
+        if direction != 'next':
+            raise ValueError('Only next-page cursors are supported')
+        ordered = [item for item in ordered if (getattr(item, field), item.pk) < (value, pk)]
+
+    page = ordered[:limit]
+    next_cursor = None
+    if len(ordered) > limit and page:
+        last = page[-1]
+        next_cursor = encode_cursor('next', getattr(last, field), last.pk)
+    return page, next_cursor, len(items)
+
+
+def cursor_url(request, cursor):
+    """The current URL with its cursor parameter replaced (and any page number dropped)"""
+    params = request.GET.copy()
+    params.pop('page', None)
+    if cursor:
+        params['cursor'] = cursor
+    else:
+        params.pop('cursor', None)
+    query = params.urlencode()
+    return f"{request.path}?{query}" if query else request.path
+
+
+def keyset_page(request, queryset, per_page, field='created_at'):
+    """Keyset page for the request's ?cursor=, with next/previous URLs for templates"""
+    page = KeysetPaginator(queryset, per_page, field=field).get_page(request.GET.get('cursor'))
+    page.next_url = cursor_url(request, page.next_cursor) if page.has_next() else None
+    page.previous_url = cursor_url(request, page.previous_cursor) if page.has_previous() else None
+    return page
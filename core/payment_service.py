@@ -1,7 +1,11 @@
+import json
 import stripe
 import logging
 from django.conf import settings
+from django.core.cache import cache
 from django.urls import reverse
+from django.utils import timezone
+from . import background, stripe_events
 from .models import Order, Service, PricingPlan
 
 logger = logging.getLogger(__name__)
@@ -34,8 +38,12 @@ class StripePaymentService:
             
             line_items = []
             
+            # Line items already priced from the catalog (core/pricing.py)
+            if order_data.get('line_items'):
+                line_items = order_data['line_items']
+            
             # Handle cart items
-            if order_data.get('cart_items'):
+            elif order_data.get('cart_items'):
                 cart_items = order_data.get('cart_items')
                 
                 for item in cart_items:
@@ -117,7 +125,7 @@ class StripePaymentService:
             session = stripe.checkout.Session.create(
                 payment_method_types=['card'],
                 line_items=line_items,
-                mode='payment' if not any('recurring' in item.get('price_data', {}) for item in line_items) else 'subscription',
+                mode=order_data.get('mode') or ('payment' if not any('recurring' in item.get('price_data', {}) for item in line_items) else 'subscription'),
                 success_url=domain + reverse('payment_success') + '?session_id={CHECKOUT_SESSION_ID}',
                 cancel_url=domain + reverse('payment_cancelled'),
                 customer_email=order_data.get('customer_email'),
@@ -150,46 +158,71 @@ class StripePaymentService:
             raise
 
     @staticmethod
-    def handle_successful_payment(session):
-        try:
-            order_id = session.metadata.get('order_id')
-            if order_id:
-                order = Order.objects.get(order_id=order_id)
-                order.status = 'paid'
-                order.stripe_session_id = session.id
-                order.stripe_payment_intent_id = session.payment_intent
-                order.save()
-                
-                logger.info(f"Order {order_id} marked as paid")
-                return order
-            else:
-                logger.warning("No order_id found in session metadata")
+    def cached_session(session_id):
+        """
+        The fields of a checkout session that confirmation needs, fetched from
+        Stripe at most once per STRIPE_SESSION_CACHE_SECONDS; None if Stripe fails.
+        """
+        key = f'stripe-session:{session_id}'
+        session = cache.get(key)
+        if session is None:
+            try:
+                retrieved = stripe.checkout.Session.retrieve(session_id)
+            except Exception as e:
+                logger.error(f"Error retrieving Stripe session: {str(e)}")
                 return None
-                
-        except Order.DoesNotExist:
-            logger.error(f"Order {order_id} not found")
+            session = {
+                'id': retrieved.id,
+                'payment_status': retrieved.payment_status,
+                'payment_intent': retrieved.payment_intent,
+                'metadata': dict(retrieved.metadata or {}),
+            }
+            cache.set(key, session, getattr(settings, 'STRIPE_SESSION_CACHE_SECONDS', 30))
+        return session
+
+    @staticmethod
+    def handle_successful_payment(session):
+        """
+        Mark the session's order paid. Only the first confirmation (webhook or
+        success page fallback) changes the row and queues fulfilment.
+        """
+        if session.get('payment_status') not in ('paid', 'no_payment_required'):
+            logger.info(f"Session {session.get('id')} is {session.get('payment_status')}, waiting for payment")
             return None
-        except Exception as e:
-            logger.error(f"Error handling successful payment: {str(e)}")
-            raise
+        order_id = (session.get('metadata') or {}).get('order_id')
+        if not order_id:
+            logger.warning("No order_id found in session metadata")
+            return None
+
+        updated = Order.objects.filter(order_id=order_id, status='pending').update(
+            status='paid',
+            stripe_session_id=session['id'],
+            stripe_payment_intent_id=session.get('payment_intent') or '',
+            updated_at=timezone.now(),
+        )
+        if updated:
+            logger.info(f"Order {order_id} marked as paid")
+            background.submit('payments', fulfil_order, order_id)
+
+        order = Order.objects.select_related('service').filter(order_id=order_id).first()
+        if order is None:
+            logger.error(f"Order {order_id} not found")
+        return order
 
     @staticmethod
     def handle_webhook(payload, sig_header):
+        """
+        Verify and store the event, then return so the webhook can be
+        acknowledged; core.stripe_events applies it after the response.
+        """
         try:
             event = stripe.Webhook.construct_event(
                 payload, sig_header, settings.STRIPE_WEBHOOK_SECRET
             )
-            
-            if event['type'] == 'checkout.session.completed':
-                session = event['data']['object']
-                StripePaymentService.handle_successful_payment(session)
-            
-            elif event['type'] == 'payment_intent.succeeded':
-                payment_intent = event['data']['object']
-                logger.info(f"Payment intent succeeded: {payment_intent['id']}")
-            
+            if not stripe_events.record_event(json.loads(payload)):
+                logger.info(f"Stripe event {event['id']} already received; requeued unless processed")
             return True
-            
+
         except ValueError as e:
             logger.error(f"Invalid payload: {e}")
             return False
@@ -198,4 +231,21 @@ class StripePaymentService:
             return False
         except Exception as e:
             logger.error(f"Webhook error: {e}")
-            return False
\ No newline at end of file
+            return False
+
+
+def fulfil_order(order_id):
+    """Sync a newly paid order to Frappe and tell the AI agent, off the request path"""
+    from .ai_agent_service import AIAgentService
+    from .frappe_services import process_order_to_frappe
+
+    try:
+        process_order_to_frappe(order_id)
+    except Exception as e:
+        logger.error(f"Failed to process order to Frappe: {e}")
+
+    try:
+        order = Order.objects.get(order_id=order_id)
+        AIAgentService().notify_payment_success(order)
+    except Exception as e:
+        logger.error(f"Failed to notify AI agent about payment: {e}")
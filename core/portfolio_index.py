@@ -0,0 +1,103 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+from django.conf import settings
+from .models import Portfolio, PortfolioCategory, PortfolioTechnology
+
+logger = logging.getLogger(__name__)
+
+# Home page filter buttons that select a content type rather than a category
+CONTENT_TYPE_FILTERS = {
+    'posts': 'post',
+    'videos': 'video',
+    'blogs': 'blog',
+    'emails': 'email',
+}
+
+
+class PortfolioIndex:
+    """
+    In-process snapshot of the active portfolio catalogue.
+
+    Built with three queries and then served from dictionaries, so switching
+    the home page filter or listing the API never touches the database.
+    """
+
+    def __init__(self, categories, portfolios, technology_links=()):
+        self.built_at = time.monotonic()
+        self.categories = [c for c in categories if c.is_active]
+        self.category_by_slug = {c.slug: c for c in categories}
+        self.items = portfolios
+        self.by_id = {p.id: p for p in portfolios}
+        self.by_slug = {p.slug: p for p in portfolios}
+        self.featured = [p for p in portfolios if p.is_featured]
+
+        by_category = defaultdict(list)
+        by_content_type = defaultdict(list)
+        for p in portfolios:
+            by_category[p.category.slug].append(p)
+            by_content_type[p.content_type].append(p)
+        self.by_category = dict(by_category)
+        self.by_content_type = dict(by_content_type)
+
+        # technology slug -> ids of active portfolios using it
+        by_technology = defaultdict(set)
+        for portfolio_id, technology_slug in technology_links:
+            if portfolio_id in self.by_id:
+                by_technology[technology_slug].add(portfolio_id)
+        self.by_technology = dict(by_technology)
+
+    @classmethod
+    def build(cls):
+        categories = list(PortfolioCategory.objects.all())
+        portfolios = list(Portfolio.objects.filter(is_active=True).select_related('category'))
+        technology_links = PortfolioTechnology.objects.values_list('portfolio_id', 'technology__slug')
+        return cls(categories, portfolios, technology_links)
+
+    def filter(self, category=None, content_type=None, technology=None):
+        """Active portfolios for a category slug, content type and/or technology slug, in display order"""
+        if technology:
+            ids = self.by_technology.get(technology, set())
+            return [p for p in self.filter(category, content_type) if p.id in ids]
+        if category:
+            items = self.by_category.get(category, [])
+            if content_type:
+                items = [p for p in items if p.content_type == content_type]
+            return items
+        if content_type:
+            return self.by_content_type.get(content_type, [])
+        return self.items
+
+    def related(self, portfolio, limit=3):
+        """Other active portfolios from the same category"""
+        siblings = self.by_category.get(portfolio.category.slug, [])
+        return [p for p in siblings if p.id != portfolio.id][:limit]
+
+
+_index = None
+_build_lock = threading.Lock()
+
+
+def get_portfolio_index():
+    """
+    Return the current index, building it on first use.
+
+    Saves in this process rebuild it immediately; PORTFOLIO_INDEX_TTL bounds
+    how stale it can get when another process wrote the change.
+    """
+    index = _index
+    ttl = getattr(settings, 'PORTFOLIO_INDEX_TTL', 300)
+    if index is None or (ttl and time.monotonic() - index.built_at > ttl):
+        index = rebuild_portfolio_index()
+    return index
+
+
+def rebuild_portfolio_index():
+    """Build a fresh index and swap it in as a single reference assignment"""
+    global _index
+    with _build_lock:
+        index = PortfolioIndex.build()
+        _index = index
+    logger.info(f"Portfolio index rebuilt: {len(index.items)} items, {len(index.categories)} categories")
+    return index
@@ -0,0 +1,176 @@
+import logging
+import threading
+import time
+from collections import namedtuple
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from django.conf import settings
+from .models import PricingPlan, Service, ServicePricingOption
+
+logger = logging.getLogger(__name__)
+
+CURRENCY = 'cad'
+CENTS = Decimal('0.01')
+MAX_QUANTITY = 100
+
+# Stripe billing interval for recurring periods
+RECURRING_INTERVALS = {'monthly': 'month', 'yearly': 'year'}
+
+CatalogEntry = namedtuple('CatalogEntry', [
+    'key', 'name', 'description', 'price', 'period', 'stripe_price_id',
+    'service_id', 'service_name', 'pricing_plan_id', 'plan_name', 'line_item',
+])
+PricedLine = namedtuple('PricedLine', ['entry', 'quantity', 'amount'])
+
+
+class PricingError(ValueError):
+    """A cart that can't be priced: unknown or unpriced items, bad quantities"""
+
+
+def to_cents(amount):
+    return int((amount * 100).quantize(Decimal('1'), rounding=ROUND_HALF_UP))
+
+
+def build_line_item(name, description, price, period, stripe_price_id):
+    """
+    Stripe line item for one unit; quantity is filled in per cart. Monthly and
+    yearly items without a Stripe price get an inline recurring price.
+    """
+    if stripe_price_id:
+        return {'price': stripe_price_id}
+    price_data = {
+        'currency': CURRENCY,
+        'product_data': {
+            'name': name,
+            'description': f"{period.replace('_', ' ')} payment",
+        },
+        'unit_amount': to_cents(price),
+    }
+    if period in RECURRING_INTERVALS:
+        price_data['recurring'] = {'interval': RECURRING_INTERVALS[period]}
+    return {'price_data': price_data}
+
+
+class PriceCatalog:
+    """
+    In-process snapshot of everything that can go in the cart, keyed by the
+    cart item ids the front end uses (service_<id>, service_option_<id>,
+    plan_<id>, plan_option_<id>) and by Stripe price id.
+
+    Built with three queries; checkout then prices a cart from dictionaries
+    with Decimal arithmetic and reuses the prebuilt Stripe line items.
+    """
+
+    def __init__(self, services, options, plans):
+        self.built_at = time.monotonic()
+        self.by_key = {}
+
+        for service in services:
+            if service.price is None:
+                continue  # Custom quote; not purchasable from the cart
+            self.add(f'service_{service.id}', service.title, service.short_description or service.description[:100],
+                     service.price, 'one_time', service.stripe_price_id, service=service)
+
+        for option in options:
+            name = f'{option.service.title} - {option.name}'
+            # Plan cards reuse the service pricing option ids in their dropdowns
+            for prefix in ('service_option', 'plan_option'):
+                self.add(f'{prefix}_{option.id}', name, option.description, option.price, option.period,
+                         option.stripe_price_id, service=option.service, plan_name=option.name)
+
+        for plan in plans:
+            self.add(f'plan_{plan.id}', plan.name, plan.description[:100], plan.price, plan.price_period,
+                     plan.stripe_price_id, plan=plan)
+
+        self.by_stripe_price = {entry.stripe_price_id: entry for entry in self.by_key.values() if entry.stripe_price_id}
+
+    def add(self, key, name, description, price, period, stripe_price_id, service=None, plan=None, plan_name=None):
+        self.by_key[key] = CatalogEntry(
+            key=key,
+            name=name,
+            description=description,
+            price=price,
+            period=period,
+            stripe_price_id=stripe_price_id,
+            service_id=service.id if service else None,
+            service_name=service.title if service else name,
+            pricing_plan_id=plan.id if plan else None,
+            plan_name=plan_name or (plan.name if plan else name),
+            line_item=build_line_item(name, description, price, period, stripe_price_id),
+        )
+
+    @classmethod
+    def build(cls):
+        services = Service.objects.filter(is_active=True)
+        options = ServicePricingOption.objects.filter(service__is_active=True).select_related('service')
+        plans = PricingPlan.objects.filter(is_active=True)
+        return cls(list(services), list(options), list(plans))
+
+    def price_cart(self, cart_items):
+        """Price client cart items against the catalog; client prices are ignored"""
+        if not cart_items:
+            raise PricingError('Cart is empty')
+        if not isinstance(cart_items, list) or not all(isinstance(item, dict) for item in cart_items):
+            raise PricingError('Invalid cart data format')
+        lines = []
+        for item in cart_items:
+            entry = self.by_key.get(str(item.get('id', '')))
+            if entry is None:
+                raise PricingError(f"{item.get('name') or 'An item'} is no longer available")
+            try:
+                quantity = int(item.get('quantity', 1))
+            except (TypeError, ValueError):
+                raise PricingError(f'Invalid quantity for {entry.name}')
+            if not 1 <= quantity <= MAX_QUANTITY:
+                raise PricingError(f'Invalid quantity for {entry.name}')
+            if client_price(item) != entry.price:
+                logger.info(f"Cart price for {entry.key} was {item.get('price')}, catalog price is {entry.price}")
+            lines.append(PricedLine(entry, quantity, entry.price * quantity))
+        return PricedCart(lines)
+
+
+def client_price(item):
+    try:
+        return Decimal(str(item.get('price'))).quantize(CENTS)
+    except (InvalidOperation, ValueError):
+        return None
+
+
+class PricedCart:
+    def __init__(self, lines):
+        self.lines = lines
+        self.total = sum((line.amount for line in lines), Decimal('0.00'))
+
+    @property
+    def line_items(self):
+        return [dict(line.entry.line_item, quantity=line.quantity) for line in self.lines]
+
+    @property
+    def mode(self):
+        """Stripe Checkout mode; any monthly/yearly line makes the cart a subscription"""
+        recurring = any(line.entry.period in RECURRING_INTERVALS for line in self.lines)
+        return 'subscription' if recurring else 'payment'
+
+
+_catalog = None
+_build_lock = threading.Lock()
+
+
+def get_price_catalog():
+    """
+    Return the current catalog, building it on first use. Saves in this
+    process rebuild it; PRICE_CATALOG_TTL bounds staleness from other processes.
+    """
+    catalog = _catalog
+    ttl = getattr(settings, 'PRICE_CATALOG_TTL', 300)
+    if catalog is None or (ttl and time.monotonic() - catalog.built_at > ttl):
+        catalog = rebuild_price_catalog()
+    return catalog
+
+
+def rebuild_price_catalog():
+    global _catalog
+    with _build_lock:
+        catalog = PriceCatalog.build()
+        _catalog = catalog
+    logger.info(f"Price catalog rebuilt: {len(catalog.by_key)} cart items")
+    return catalog
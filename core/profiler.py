@@ -0,0 +1,128 @@
+import cProfile
+import io
+import marshal
+import os
+import pstats
+from contextlib import nullcontext
+from django.conf import settings
+from django.core import signing
+from django.http import HttpResponse
+from . import instrumentation
+
+# Query parameter / header carrying the signed token that switches profiling on
+PROFILE_PARAM = '_profile'
+PROFILE_FORMAT_PARAM = '_profile_format'
+PROFILE_HEADER = 'X-Profile-Token'
+
+SALT = 'core.profiler'
+TOP_FUNCTIONS = 40
+
+
+def make_token(user):
+    """Signed, expiring token that lets this staff user profile requests"""
+    return signing.dumps({'user': user.pk}, salt=SALT, compress=True)
+
+
+def token_user_id(token):
+    """The user id a token was issued to, or None if it is invalid or expired"""
+    max_age = getattr(settings, 'PROFILER_TOKEN_MAX_AGE', 3600)
+    try:
+        return signing.loads(token, salt=SALT, max_age=max_age)['user']
+    except (signing.BadSignature, KeyError, TypeError):
+        return None
+
+
+def requested_token(request):
+    """Token from the query string or header; cheap enough to call on every request"""
+    if f'{PROFILE_PARAM}=' in request.META.get('QUERY_STRING', ''):
+        return request.GET.get(PROFILE_PARAM)
+    return request.headers.get(PROFILE_HEADER)
+
+
+def is_authorized(request, token):
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated or not user.is_staff:
+        return False
+    return token_user_id(token) == user.pk
+
+
+def profile_request(request, get_response):
+    """
+    Run the rest of the request under cProfile with SQL/template/HTTP metrics
+    forced on, and return the profile in place of the page.
+    """
+    instrumentation.install()
+    metrics = instrumentation.current_metrics()
+    token = None
+    if metrics is None:
+        token = instrumentation.start(sample_rate=1.0)
+        metrics = instrumentation.current_metrics()
+
+    profile = cProfile.Profile()
+    try:
+        with instrumentation.sql_wrappers() if token is not None else nullcontext():
+            profile.enable()
+            try:
+                response = get_response(request)
+                # Render lazily-rendered responses while still profiling
+                if hasattr(response, 'render') and not getattr(response, 'is_rendered', True):
+                    response.render()
+            finally:
+                profile.disable()
+    finally:
+        if token is not None:
+            instrumentation.finish(token)
+
+    stats = pstats.Stats(profile)
+    if request.GET.get(PROFILE_FORMAT_PARAM) == 'pstats':
+        # Raw stats for snakeviz, gprof2dot or flameprof
+        result = HttpResponse(marshal.dumps(stats.stats), content_type='application/octet-stream')
+        result['Content-Disposition'] = 'attachment; filename="request.pstats"'
+    else:
+        result = HttpResponse(text_report(request, response, metrics, stats), content_type='text/plain; charset=utf-8')
+    result['Server-Timing'] = metrics.server_timing()
+    result['Cache-Control'] = 'no-store'
+    return result
+
+
+def text_report(request, response, metrics, stats):
+    lines = [
+        f'{request.method} {request.get_full_path()} -> {response.status_code}',
+        '',
+        f'total      {metrics.total_time * 1000:9.1f} ms',
+        f'sql        {metrics.sql_time * 1000:9.1f} ms  ({metrics.query_count} queries)',
+        f'templates  {metrics.template_time * 1000:9.1f} ms',
+    ]
+    for service, seconds in sorted(metrics.http_time.items()):
+        lines.append(f'http:{service:<6}{seconds * 1000:9.1f} ms  ({metrics.http_calls[service]} calls)')
+    lines.append(f'cache      {metrics.cache_hits} hits, {metrics.cache_misses} misses')
+
+    tags = template_tag_times(stats)
+    if tags:
+        lines += ['', 'Template tags and filters (cumulative):']
+        for name, calls, seconds in tags:
+            lines.append(f'  {seconds * 1000:9.1f} ms  {calls:6d} calls  {name}')
+
+    repeated = metrics.statements.most_common(10)
+    if repeated:
+        lines += ['', 'Most frequent SQL:']
+        for sql, count in repeated:
+            lines.append(f'  {count:4d}x  {sql[:200]}')
+
+    buffer = io.StringIO()
+    stats.stream = buffer
+    stats.sort_stats('cumulative').print_stats(TOP_FUNCTIONS)
+    lines += ['', buffer.getvalue()]
+    return '\n'.join(lines)
+
+
+def template_tag_times(stats):
+    """Cumulative time of functions defined in templatetags modules, slowest first"""
+    marker = f'{os.sep}templatetags{os.sep}'
+    rows = [
+        (f'{os.path.basename(filename)}:{name}', calls, cumulative)
+        for (filename, _, name), (_, calls, _, cumulative, _) in stats.stats.items()
+        if marker in filename and name != '<module>'
+    ]
+    return sorted(rows, key=lambda row: row[2], reverse=True)
+
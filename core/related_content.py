@@ -0,0 +1,350 @@
+import logging
+import math
+import re
+import threading
+from collections import Counter
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.html import strip_tags
+from . import background
+from .models import BlogPost, Project, Service, Portfolio, RelatedContent
+
+# Imported on the first refresh rather than at startup; see _load_numpy()
+np = None
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#.-]*[a-z0-9+#]|[a-z0-9]{2,}')
+
+STOP_WORDS = frozenset("""
+a about above after again all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each few for from
+further had has have having he her here hers him his how i if in into is it its itself
+just me more most my no nor not now of off on once only or other our ours out over own
+same she should so some such than that the their theirs them then there these they this
+those through to too under until up very was we were what when where which while who
+whom why will with would you your yours our us get use using used new one two make
+""".split())
+
+# Title and tags count more than body text when matching
+TITLE_WEIGHT = 3
+TAG_WEIGHT = 2
+
+
+def _blog_document(post):
+    return post.title, f"{post.excerpt} {strip_tags(post.content)}", post.tags
+
+
+def _project_document(project):
+    return project.title, f"{project.client_name} {strip_tags(project.description)}", project.technologies
+
+
+def _service_document(service):
+    return service.title, f"{service.short_description} {strip_tags(service.description)}", [
+        *service.features, service.service_type
+    ]
+
+
+def _portfolio_document(portfolio):
+    return portfolio.title, f"{portfolio.description} {portfolio.bio or ''}", [
+        *portfolio.technology_used, portfolio.category.name, portfolio.content_type
+    ]
+
+
+# model label -> (queryset of candidates, document builder)
+CORPORA = {
+    'core.blogpost': (lambda: BlogPost.objects.filter(status='published'), _blog_document),
+    'core.project': (lambda: Project.objects.filter(status='completed'), _project_document),
+    'core.service': (lambda: Service.objects.filter(is_active=True), _service_document),
+    'core.portfolio': (lambda: Portfolio.objects.filter(is_active=True).select_related('category'), _portfolio_document),
+}
+
+
+def tokenize(text):
+    return [token for token in TOKEN_RE.findall(text.lower()) if token not in STOP_WORDS]
+
+
+def document_tokens(title, body, tags):
+    tokens = tokenize(title) * TITLE_WEIGHT + tokenize(body)
+    for tag in tags or []:
+        tokens += tokenize(str(tag)) * TAG_WEIGHT
+    return tokens
+
+
+def _load_numpy():
+    """NumPy, or None when it is not installed (related content then falls back to "latest items")"""
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            return None
+        np = numpy
+    return np
+
+
+def term_counts(documents):
+    """Per-document {term: count} and the number of documents each term appears in"""
+    counts = [Counter(tokens) for tokens in documents]
+    document_frequency = Counter()
+    for doc_counts in counts:
+        document_frequency.update(doc_counts.keys())
+    return counts, document_frequency
+
+
+def smoothed_idf(document_frequency, num_documents):
+    return {
+        term: math.log((1.0 + num_documents) / (1.0 + frequency)) + 1.0
+        for term, frequency in document_frequency.items()
+    }
+
+
+def vectorize(counts, vocabulary, idf):
+    """
+    L2-normalised TF-IDF rows (documents x vocabulary) with sublinear term
+    frequency; terms missing from `vocabulary` are skipped.
+    """
+    matrix = np.zeros((len(counts), max(len(vocabulary), 1)), dtype=np.float32)
+    for row, doc_counts in enumerate(counts):
+        terms = [term for term in doc_counts if term in vocabulary]
+        if terms:
+            columns = np.fromiter((vocabulary[term] for term in terms), dtype=np.int64, count=len(terms))
+            values = np.fromiter((doc_counts[term] for term in terms), dtype=np.float32, count=len(terms))
+            weights = np.fromiter((idf[term] for term in terms), dtype=np.float32, count=len(terms))
+            matrix[row, columns] = (1.0 + np.log(values)) * weights
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def tfidf_matrix(documents):
+    """Build an L2-normalised TF-IDF matrix (documents x vocabulary) with smoothed IDF"""
+    counts, document_frequency = term_counts(documents)
+    vocabulary = {term: column for column, term in enumerate(document_frequency)}
+    return vectorize(counts, vocabulary, smoothed_idf(document_frequency, len(documents)))
+
+
+def top_neighbours(matrix, k, rows=None):
+    """
+    Indices and cosine scores of the k most similar rows for each of `rows`
+    (default: every row). Similarities are computed RELATED_CONTENT_BLOCK_ROWS
+    rows at a time and only the top k of each row are kept, so memory stays
+    at block x documents rather than documents x documents.
+    """
+    rows = np.arange(len(matrix)) if rows is None else np.asarray(rows, dtype=np.int64)
+    k = min(k, max(len(matrix) - 1, 0))
+    if k == 0:
+        return [[] for _ in rows]
+
+    block_rows = max(getattr(settings, 'RELATED_CONTENT_BLOCK_ROWS', 256), 1)
+    results = []
+    for start in range(0, len(rows), block_rows):
+        block = rows[start:start + block_rows]
+        similarity = matrix[block] @ matrix.T
+        similarity[np.arange(len(block)), block] = -1.0
+        candidates = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+        for offset, columns in enumerate(candidates):
+            scores = similarity[offset, columns]
+            order = np.argsort(-scores)
+            results.append([(int(columns[i]), float(scores[i])) for i in order if scores[i] > 0])
+    return results
+
+
+class CorpusState:
+    """
+    What the last refresh of one model scored in this process: the IDF and
+    vocabulary it used, each document's vector and token fingerprint, and the
+    neighbour lists it produced (as primary keys).
+    """
+
+    def __init__(self, pks, fingerprints, vocabulary, idf, matrix, neighbours):
+        self.pks = pks
+        self.fingerprints = fingerprints
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.matrix = matrix
+        self.neighbours = neighbours
+
+
+_states = {}
+_state_locks = {label: threading.Lock() for label in CORPORA}
+
+
+def idf_drift(state, idf):
+    """Largest relative change in IDF across the terms the last refresh used"""
+    drift = 0.0
+    for term, weight in state.idf.items():
+        if term in idf:
+            drift = max(drift, abs(idf[term] - weight) / weight)
+    return drift
+
+
+def refresh_related(model_label, full=False):
+    """
+    Recompute neighbours for one model and store them in RelatedContent.
+
+    The first refresh in a process (or full=True, or IDF weights that moved by
+    more than RELATED_CONTENT_IDF_TOLERANCE) scores the whole corpus. Otherwise
+    only edited, added and removed documents are rescored, against the IDF of
+    the last full pass, and other rows merge in their scores against the edited
+    ones. Only rows whose neighbour list actually changed are written.
+    """
+    if _load_numpy() is None:
+        logger.warning("NumPy is not installed; skipping related content refresh")
+        return 0
+
+    with _state_locks[model_label]:
+        queryset_factory, build_document = CORPORA[model_label]
+        objects = list(queryset_factory())
+        k = getattr(settings, 'RELATED_CONTENT_TOP_K', 6)
+
+        documents = [document_tokens(*build_document(obj)) for obj in objects]
+        counts, document_frequency = term_counts(documents)
+        idf = smoothed_idf(document_frequency, len(documents))
+        pks = [obj.pk for obj in objects]
+        fingerprints = {pk: hash(tuple(sorted(doc_counts.items()))) for pk, doc_counts in zip(pks, counts)}
+
+        state = _states.get(model_label)
+        tolerance = getattr(settings, 'RELATED_CONTENT_IDF_TOLERANCE', 0.05)
+        if full or state is None or not objects or idf_drift(state, idf) > tolerance:
+            state = _score_corpus(pks, fingerprints, counts, idf, k)
+            scope = 'full'
+        else:
+            state = _rescore_changes(state, pks, fingerprints, counts, idf, k)
+            scope = 'incremental'
+        _states[model_label] = state
+
+        changed = _store_neighbours(model_label, pks, state.neighbours)
+    logger.info(f"Related content refreshed for {model_label} ({scope}): {changed} rows changed")
+    return changed
+
+
+def _score_corpus(pks, fingerprints, counts, idf, k):
+    vocabulary = {term: column for column, term in enumerate(idf)}
+    matrix = vectorize(counts, vocabulary, idf)
+    scored = top_neighbours(matrix, k) if pks else []
+    neighbours = {pks[row]: [(pks[column], score) for column, score in pairs] for row, pairs in enumerate(scored)}
+    return CorpusState(pks, fingerprints, vocabulary, idf, matrix, neighbours)
+
+
+def _rescore_changes(state, pks, fingerprints, counts, idf, k):
+    edited = {pk for pk in pks if state.fingerprints.get(pk) != fingerprints[pk]}
+    removed = set(state.pks) - set(pks)
+
+    # Keep the last full pass's IDF; terms it hasn't seen only occur in edited
+    # documents, so they take their current weight in new columns
+    vocabulary = dict(state.vocabulary)
+    weights = dict(state.idf)
+    for term in idf:
+        if term not in vocabulary:
+            vocabulary[term] = len(vocabulary)
+            weights[term] = idf[term]
+
+    old_rows = {pk: row for row, pk in enumerate(state.pks)}
+    matrix = np.zeros((len(pks), max(len(vocabulary), 1)), dtype=np.float32)
+    edited_rows = [row for row, pk in enumerate(pks) if pk in edited]
+    kept_rows = [row for row, pk in enumerate(pks) if pk not in edited]
+    if kept_rows:
+        matrix[kept_rows, :state.matrix.shape[1]] = state.matrix[[old_rows[pks[row]] for row in kept_rows]]
+    if edited_rows:
+        matrix[edited_rows] = vectorize([counts[row] for row in edited_rows], vocabulary, weights)
+
+    neighbours = {}
+    touched = edited | removed
+    # Rows that listed a changed document may now rank one outside their old list
+    rescore = [row for row, pk in enumerate(pks)
+               if pk in edited or any(other in touched for other, _ in state.neighbours.get(pk, ()))]
+    for row, pairs in zip(rescore, top_neighbours(matrix, k, rescore)):
+        neighbours[pks[row]] = [(pks[column], score) for column, score in pairs]
+
+    merge = [row for row in range(len(pks)) if pks[row] not in neighbours]
+    if merge and edited_rows:
+        similarity = matrix[merge] @ matrix[edited_rows].T
+        for offset, row in enumerate(merge):
+            candidates = list(state.neighbours.get(pks[row], ()))
+            candidates += [(pks[column], float(similarity[offset, i])) for i, column in enumerate(edited_rows)
+                           if similarity[offset, i] > 0]
+            candidates.sort(key=lambda pair: -pair[1])
+            neighbours[pks[row]] = candidates[:k]
+    else:
+        for row in merge:
+            neighbours[pks[row]] = list(state.neighbours.get(pks[row], ()))
+
+    return CorpusState(pks, fingerprints, vocabulary, weights, matrix, neighbours)
+
+
+def _store_neighbours(model_label, pks, neighbours):
+    existing = {row.object_id: row for row in RelatedContent.objects.filter(model_label=model_label)}
+    to_create, to_update = [], []
+    for pk in pks:
+        scored = neighbours.get(pk, [])
+        related_ids = [related_pk for related_pk, _ in scored]
+        scores = [round(score, 4) for _, score in scored]
+        row = existing.pop(pk, None)
+        if row is None:
+            to_create.append(RelatedContent(model_label=model_label, object_id=pk, related_ids=related_ids, scores=scores))
+        elif row.related_ids != related_ids:
+            row.related_ids = related_ids
+            row.scores = scores
+            row.updated_at = timezone.now()
+            to_update.append(row)
+
+    with transaction.atomic():
+        RelatedContent.objects.bulk_create(to_create)
+        RelatedContent.objects.bulk_update(to_update, ['related_ids', 'scores', 'updated_at'])
+        if existing:
+            RelatedContent.objects.filter(pk__in=[row.pk for row in existing.values()]).delete()
+
+    return len(to_create) + len(to_update) + len(existing)
+
+
+_queued = set()
+_queued_lock = threading.Lock()
+
+
+def request_refresh(model_label):
+    """
+    Refresh a model's related content on the worker pool once the current
+    transaction commits. Requests that arrive while a refresh for the same
+    model is queued but not started are folded into it.
+    """
+    background.on_commit_once(_queue_refresh, model_label)
+
+
+def _queue_refresh(model_label):
+    with _queued_lock:
+        if model_label in _queued:
+            return
+        _queued.add(model_label)
+    background.submit('related', _run_queued_refresh, model_label)
+
+
+def _run_queued_refresh(model_label):
+    # Cleared before scoring, so a save made during the refresh queues another one
+    with _queued_lock:
+        _queued.discard(model_label)
+    return refresh_related(model_label)
+
+
+def related_ids_for(instance, limit=3):
+    """Precomputed related ids for an instance, or None if nothing is stored yet"""
+    related_ids = RelatedContent.objects.filter(
+        model_label=instance._meta.label_lower, object_id=instance.pk
+    ).values_list('related_ids', flat=True).first()
+    if not related_ids:
+        return None
+    return related_ids[:limit]
+
+
+def related_for(instance, queryset, limit=3):
+    """
+    Related objects for a detail page, in relevance order.
+
+    Returns None when no neighbours are stored so callers can fall back.
+    """
+    related_ids = related_ids_for(instance, limit)
+    if related_ids is None:
+        return None
+    objects = queryset.in_bulk(related_ids)
+    return [objects[pk] for pk in related_ids if pk in objects] or None
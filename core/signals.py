@@ -1,7 +1,16 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_save, pre_delete, m2m_changed
 from django.dispatch import receiver
-from .models import Lead, Order
+from .models import (
+    Lead, Order, Portfolio, PortfolioCategory, PortfolioTechnology, BlogPost, Project, Service,
+    ServicePricingOption, PricingPlan,
+)
+from . import api_cache, background, metrics, page_graph, sitemap_files
 from .slack_service import slack_service
+from .cloudinary_uploads import image_uploaded
+from .portfolio_index import rebuild_portfolio_index
+from .pricing import rebuild_price_catalog
+from .related_content import request_refresh
 import logging
 
 logger = logging.getLogger(__name__)
@@ -26,4 +35,91 @@ def send_order_slack_notification(sender, instance, created, **kwargs):
             slack_service.send_notification(message)
             logger.info(f"Slack notification sent for new order: {instance.order_id}")
         except Exception as e:
-            logger.error(f"Error sending Slack notification for order {instance.order_id}: {str(e)}")
\ No newline at end of file
+            logger.error(f"Error sending Slack notification for order {instance.order_id}: {str(e)}")
+
+@receiver(post_save, sender=Lead)
+@receiver(post_save, sender=Order)
+def count_created(sender, instance, created, **kwargs):
+    if not created:
+        return
+    if sender is Lead:
+        metrics.LEADS_CREATED.inc(source=instance.source or 'unknown')
+    else:
+        metrics.ORDERS_CREATED.inc()
+
+@receiver(post_save, sender=Portfolio)
+@receiver(post_delete, sender=Portfolio)
+@receiver(post_save, sender=PortfolioCategory)
+@receiver(post_delete, sender=PortfolioCategory)
+@receiver(image_uploaded, sender=Portfolio)
+@receiver(m2m_changed, sender=PortfolioTechnology)
+def refresh_portfolio_index(sender, action=None, **kwargs):
+    """Rebuild the in-memory portfolio index once the change is committed"""
+    if action and not action.startswith('post_'):
+        return
+    background.on_commit_once(rebuild_portfolio_index)
+
+@receiver(post_save, sender=Service)
+@receiver(post_delete, sender=Service)
+@receiver(post_save, sender=ServicePricingOption)
+@receiver(post_delete, sender=ServicePricingOption)
+@receiver(post_save, sender=PricingPlan)
+@receiver(post_delete, sender=PricingPlan)
+def refresh_price_catalog(sender, **kwargs):
+    """Rebuild the checkout price catalog once the change is committed"""
+    background.on_commit_once(rebuild_price_catalog)
+
+@receiver(post_save, sender=BlogPost)
+@receiver(post_delete, sender=BlogPost)
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+@receiver(post_save, sender=Service)
+@receiver(post_delete, sender=Service)
+@receiver(post_save, sender=Portfolio)
+@receiver(post_delete, sender=Portfolio)
+def refresh_related_content(sender, **kwargs):
+    """Recompute related items for the changed model on the worker pool, once per burst of saves"""
+    request_refresh(sender._meta.label_lower)
+
+@receiver(post_save)
+@receiver(post_delete)
+@receiver(m2m_changed, sender=PortfolioTechnology)
+def invalidate_api_payloads(sender, action=None, raw=False, **kwargs):
+    """Drop the cached JSON API bodies that include the changed model once the change commits"""
+    if raw or (action and not action.startswith('post_')):
+        return
+    endpoints = api_cache.endpoints_for(sender._meta.label_lower)
+    if endpoints:
+        transaction.on_commit(lambda: api_cache.payload_cache.invalidate(*endpoints))
+
+@receiver(pre_save)
+@receiver(pre_delete)
+def remember_page_path(sender, instance, raw=False, **kwargs):
+    """Note the detail URL a row has before it is edited, so a slug change or unpublish purges it"""
+    if raw or sender._meta.label_lower not in page_graph.DETAIL_SITEMAPS or instance.pk is None:
+        return
+    # A row being deleted is as stored; an edit needs the stored slug and visibility
+    instance._previous_page_path = page_graph.detail_path(instance, stored=kwargs.get('signal') is pre_save)
+
+@receiver(post_save)
+@receiver(post_delete)
+def queue_page_regeneration(sender, instance, raw=False, **kwargs):
+    """Queue the pages that render this row for a debounced re-render once the change commits"""
+    if raw or sender._meta.label_lower not in page_graph.TRACKED_MODELS:
+        return
+    try:
+        paths = page_graph.pages_for(instance, getattr(instance, '_previous_page_path', None))
+    except Exception as e:
+        logger.error(f"Could not work out pages for {sender._meta.label} {instance.pk}: {e}")
+        return
+    transaction.on_commit(lambda: page_graph.regeneration_queue.add(paths))
+
+@receiver(page_graph.pages_changed)
+def regenerate_sitemaps(sender, paths, **kwargs):
+    """Rewrite the static sitemap files when a batch touches the sitemap"""
+    if page_graph.SITEMAP_PATH not in paths:
+        return
+    try:
+        sitemap_files.generate()
+    except OSError as e:
+        logger.error(f"Could not regenerate sitemaps: {e}")
@@ -67,4 +67,12 @@ class BlogSitemap(Sitemap):
         return reverse('blog_detail', args=[obj.slug])
 
     def lastmod(self, obj):
-        return obj.updated_at
\ No newline at end of file
+        return obj.updated_at
+
+SITEMAPS = {
+    'static': StaticViewSitemap,
+    'services': ServiceSitemap,
+    'portfolio': PortfolioSitemap,
+    'projects': ProjectSitemap,
+    'blog': BlogSitemap,
+}
@@ -0,0 +1,143 @@
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+from django.conf import settings
+from django.db.models import Count, Max
+from django.template.loader import render_to_string
+from django.utils import timezone
+from .sitemap import SITEMAPS
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = 'sitemap.xml'
+MANIFEST_NAME = 'sitemaps.json'
+
+_lock = threading.Lock()
+# When this process last compared the generated files with the database
+_checked_at = None
+
+
+def sitemap_root():
+    return Path(getattr(settings, 'SITEMAP_ROOT', Path(settings.BASE_DIR) / 'sitemaps'))
+
+
+def section_filename(section, page, num_pages):
+    return f'sitemap-{section}.xml' if num_pages == 1 else f'sitemap-{section}-{page}.xml'
+
+
+def public_paths():
+    """URL paths of the index and every section file, from the last generation"""
+    return ['/' + filename for filename in sorted(load_manifest().get('files', {}))]
+
+
+def load_manifest(root=None):
+    """{'source': source_stamp() at generation, 'files': {filename: lastmod}}"""
+    try:
+        return json.loads(((root or sitemap_root()) / MANIFEST_NAME).read_text())
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def source_stamp():
+    """
+    Row count and latest updated_at of every model-backed section, one query
+    each. Any edit, addition, unpublish or delete changes it.
+    """
+    parts = []
+    for section, sitemap_class in sorted(SITEMAPS.items()):
+        items = sitemap_class().items()
+        if not hasattr(items, 'aggregate'):
+            continue
+        stats = items.aggregate(count=Count('pk'), latest=Max('updated_at'))
+        parts.append(f"{section}:{stats['count']}:{stats['latest'].isoformat() if stats['latest'] else ''}")
+    return '|'.join(parts)
+
+
+def generate(root=None):
+    """
+    Write a sitemap index plus one file per section (split at 50,000 URLs),
+    each with a .gz variant. Returns {filename: last modified ISO timestamp}.
+    """
+    root = Path(root or sitemap_root())
+    domain = getattr(settings, 'SITEMAP_DOMAIN', 'socialdots.ca')
+    protocol = getattr(settings, 'SITEMAP_PROTOCOL', 'https')
+    # Sitemap.get_urls() only needs .domain; the sites framework isn't installed
+    site = SimpleNamespace(domain=domain, name=domain)
+    generated_at = timezone.now()
+
+    with _lock:
+        root.mkdir(parents=True, exist_ok=True)
+        previous = load_manifest(root).get('files', {})
+        source = source_stamp()
+        manifest = {}
+        index_entries = []
+
+        for section, sitemap_class in SITEMAPS.items():
+            sitemap = sitemap_class()
+            # Sections without lastmod (the static pages) use the generation time
+            lastmod = sitemap.get_latest_lastmod() or generated_at
+            num_pages = sitemap.paginator.num_pages
+            for page in sitemap.paginator.page_range:
+                filename = section_filename(section, page, num_pages)
+                urls = sitemap.get_urls(page=page, site=site, protocol=protocol)
+                xml = render_to_string('sitemap.xml', {'urlset': urls})
+                write_with_gzip(root / filename, xml.encode('utf-8'))
+                manifest[filename] = lastmod.isoformat()
+                index_entries.append(SimpleNamespace(location=f'{protocol}://{domain}/{filename}', last_mod=lastmod))
+
+        index_lastmod = max((entry.last_mod for entry in index_entries), default=generated_at)
+        index_xml = render_to_string('sitemap_index.xml', {'sitemaps': index_entries})
+        write_with_gzip(root / INDEX_FILE, index_xml.encode('utf-8'))
+        manifest[INDEX_FILE] = index_lastmod.isoformat()
+
+        # Sections that shrank by a page leave files the index no longer lists
+        for filename in set(previous) - set(manifest):
+            for path in (root / filename, root / f'{filename}.gz'):
+                if path.exists():
+                    path.unlink()
+
+        temp_path = root / f'{MANIFEST_NAME}.tmp'
+        temp_path.write_text(json.dumps({'source': source, 'files': manifest}, indent=1, sort_keys=True))
+        os.replace(temp_path, root / MANIFEST_NAME)
+
+    logger.info(f"Sitemaps generated: {len(manifest)} files in {root}")
+    return manifest
+
+
+def write_with_gzip(path, content):
+    for target, data in ((path, content), (path.with_name(f'{path.name}.gz'), gzip.compress(content, 9, mtime=0))):
+        temp_path = target.with_name(f'.{target.name}.tmp')
+        temp_path.write_bytes(data)
+        os.replace(temp_path, target)
+
+
+def is_stale(manifest):
+    """
+    Whether the files no longer match the database. Checked at most every
+    SITEMAP_CHECK_INTERVAL seconds per process, so instances that didn't make
+    the edit (each with its own SITEMAP_ROOT on Vercel) catch up too.
+    """
+    global _checked_at
+    if not manifest.get('files'):
+        return True
+    interval = getattr(settings, 'SITEMAP_CHECK_INTERVAL', 60)
+    now = time.monotonic()
+    if _checked_at is not None and now - _checked_at < interval:
+        return False
+    _checked_at = now
+    return manifest.get('source') != source_stamp()
+
+
+def lookup(filename):
+    """(path, last modified) for a generated file, (re)generating everything when stale"""
+    manifest = load_manifest()
+    files = generate() if is_stale(manifest) else manifest['files']
+    if filename not in files:
+        return None
+    return sitemap_root() / filename, datetime.fromisoformat(files[filename])
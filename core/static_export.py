@@ -0,0 +1,222 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+from django.apps import apps
+from django.conf import settings
+from django.db import models
+from django.db.models import Count, Max
+from django.test import Client
+from django.urls import Resolver404, resolve
+from .db_router import CONTENT_MODELS
+from .models import RelatedContent, SiteConfiguration
+from . import sitemap_files
+from .sitemap import SITEMAPS
+
+try:
+    import brotli
+except ImportError:  # Only gzip variants are written
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Public, read-only views that are served from the static tree; everything else stays on Django
+EXPORT_VIEW_NAMES = frozenset({
+    'home', 'services', 'service_detail', 'portfolio', 'portfolio_detail', 'project_detail',
+    'blog', 'blog_detail', 'about',
+})
+# Rendered on every export along with the sitemap files; cheap, and they list every page
+ALWAYS_PATHS = ('/robots.txt',)
+
+MANIFEST_NAME = '.export-manifest.json'
+COMPRESSIBLE = ('.html', '.xml', '.txt')
+
+# A static page has no CSRF cookie, so a token baked into it could never validate
+CSRF_INPUT_RE = re.compile(rb'<input type="hidden" name="csrfmiddlewaretoken" value="[^"]*">')
+
+_export_lock = threading.Lock()
+
+
+def template_fingerprint():
+    """Changes whenever a project template changes, so a deploy re-renders everything"""
+    digest = hashlib.sha256()
+    for directory in settings.TEMPLATES[0]['DIRS'] + [Path(apps.get_app_config('core').path) / 'templates']:
+        for path in sorted(Path(directory).rglob('*.html')):
+            digest.update(str(path.relative_to(directory)).encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def content_fingerprint():
+    """Row count and latest edit of every content model; listing pages depend on all of them"""
+    parts = []
+    for label in sorted(CONTENT_MODELS):
+        model = apps.get_model(label)
+        if not any(field.name == 'updated_at' for field in model._meta.concrete_fields):
+            continue
+        stats = model._default_manager.aggregate(count=Count('pk'), latest=Max('updated_at'))
+        parts.append(f"{label}:{stats['count']}:{stats['latest']}")
+    return hashlib.sha256('|'.join(parts).encode()).hexdigest()[:16]
+
+
+def object_fingerprint(obj):
+    """A detail page depends on its own row and its precomputed related items"""
+    related = RelatedContent.objects.filter(
+        model_label=obj._meta.label_lower, object_id=obj.pk,
+    ).values_list('updated_at', flat=True).first()
+    return f'{obj._meta.label_lower}:{obj.pk}:{obj.updated_at.isoformat()}:{related}'
+
+
+def public_pages():
+    """{path: source fingerprint} for every exportable URL listed in the sitemaps"""
+    config = SiteConfiguration.objects.values_list('updated_at', flat=True).first()
+    base = f'{template_fingerprint()}:{config}'
+    listing = f'{base}:{content_fingerprint()}'
+
+    pages = {}
+    for sitemap_class in SITEMAPS.values():
+        sitemap = sitemap_class()
+        for item in sitemap.items():
+            path = sitemap.location(item)
+            try:
+                view_name = resolve(path).url_name
+            except Resolver404:
+                continue
+            if view_name not in EXPORT_VIEW_NAMES:
+                continue
+            pages[path] = f'{base}:{object_fingerprint(item)}' if isinstance(item, models.Model) else listing
+    return pages
+
+
+def always_paths():
+    return (*ALWAYS_PATHS, *sitemap_files.public_paths())
+
+
+def output_file(root, path):
+    """/ -> index.html, /blog/ -> blog/index.html, /sitemap.xml -> sitemap.xml"""
+    relative = path.lstrip('/')
+    if not relative or relative.endswith('/'):
+        relative += 'index.html'
+    return Path(root) / relative
+
+
+class StaticExporter:
+    """
+    Render public pages through the full Django stack into a static tree with
+    .gz (and .br when brotli is installed) variants next to each file.
+
+    A manifest records each page's source fingerprint and content hash, so
+    repeat exports only render pages whose rows changed and only rewrite files
+    whose bytes changed.
+    """
+
+    def __init__(self, root=None, host=None):
+        self.root = Path(root or getattr(settings, 'STATIC_EXPORT_ROOT', Path(settings.BASE_DIR) / 'static_site'))
+        self.host = host or getattr(settings, 'STATIC_EXPORT_HOST', 'socialdots.ca')
+        self.client = Client(HTTP_HOST=self.host, raise_request_exception=False)
+        self.manifest_path = self.root / MANIFEST_NAME
+        self.manifest = self.load_manifest()
+
+    def load_manifest(self):
+        try:
+            return json.loads(self.manifest_path.read_text())
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def save_manifest(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        temp_path = self.manifest_path.with_name(f'{MANIFEST_NAME}.tmp')
+        temp_path.write_text(json.dumps(self.manifest, indent=1, sort_keys=True))
+        os.replace(temp_path, self.manifest_path)
+
+    def export(self, pages=None, force=False, prune=True):
+        """
+        Export pages ({path: fingerprint}, default: every public page). Returns
+        counts of rendered, written, unchanged, removed and failed pages.
+        """
+        with _export_lock:
+            if pages is None:
+                sitemap_files.generate()
+                pages = public_pages()
+            else:
+                prune = False
+            stats = {'rendered': 0, 'written': 0, 'unchanged': 0, 'skipped': 0, 'removed': 0, 'failed': 0}
+
+            for path, fingerprint in sorted(pages.items()):
+                entry = self.manifest.get(path)
+                if not force and entry and entry['source'] == fingerprint and output_file(self.root, path).exists():
+                    stats['skipped'] += 1
+                    continue
+                self.render_page(path, fingerprint, stats)
+
+            extra = always_paths()
+            for path in extra:
+                self.render_page(path, None, stats)
+
+            if prune:
+                for path in set(self.manifest) - set(pages) - set(extra):
+                    self.remove_page(path)
+                    stats['removed'] += 1
+
+            self.save_manifest()
+            return stats
+
+    def refresh(self, paths):
+        """Re-render just these paths; ones that are no longer public are removed"""
+        pages = public_pages()
+        stats = self.export({path: pages[path] for path in paths if path in pages}, force=True)
+        with _export_lock:
+            for path in paths:
+                if path not in pages and path not in always_paths() and path in self.manifest:
+                    self.remove_page(path)
+                    stats['removed'] += 1
+            self.save_manifest()
+        return stats
+
+    def render_page(self, path, fingerprint, stats):
+        response = self.client.get(path)
+        if response.status_code != 200 or response.streaming:
+            logger.warning(f"Static export skipped {path}: status {response.status_code}")
+            stats['failed'] += 1
+            return
+        stats['rendered'] += 1
+
+        content = CSRF_INPUT_RE.sub(b'', response.content)
+        digest = hashlib.sha256(content).hexdigest()
+        target = output_file(self.root, path)
+        entry = self.manifest.get(path)
+        if entry and entry['sha256'] == digest and target.exists():
+            stats['unchanged'] += 1
+        else:
+            write_with_variants(target, content)
+            stats['written'] += 1
+        self.manifest[path] = {'source': fingerprint, 'sha256': digest}
+
+    def remove_page(self, path):
+        target = output_file(self.root, path)
+        for variant in (target, target.with_name(target.name + '.gz'), target.with_name(target.name + '.br')):
+            if variant.exists():
+                variant.unlink()
+        if target.parent != self.root and not any(target.parent.iterdir()):
+            target.parent.rmdir()
+        self.manifest.pop(path, None)
+
+
+def write_with_variants(target, content):
+    target.parent.mkdir(parents=True, exist_ok=True)
+    _atomic_write(target, content)
+    if target.suffix in COMPRESSIBLE:
+        # mtime=0 keeps the .gz bytes identical for identical content
+        _atomic_write(target.with_name(target.name + '.gz'), gzip.compress(content, compresslevel=9, mtime=0))
+        if brotli is not None:
+            _atomic_write(target.with_name(target.name + '.br'), brotli.compress(content))
+
+
+def _atomic_write(path, content):
+    temp_path = path.with_name(f'.{path.name}.tmp')
+    temp_path.write_bytes(content)
+    os.replace(temp_path, path)
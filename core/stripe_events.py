@@ -0,0 +1,123 @@
+import logging
+import threading
+import zlib
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from . import background, metrics
+from .models import StripeEvent
+
+logger = logging.getLogger(__name__)
+
+# Webhook events that mean a checkout session has been paid
+PAID_SESSION_EVENTS = ('checkout.session.completed', 'checkout.session.async_payment_succeeded')
+
+
+def record_event(event):
+    """
+    Store a verified webhook event (the parsed JSON body) and queue it for
+    processing. Returns False for a redelivery of an event already stored,
+    which the unique event_id index turns into a single lookup; a redelivered
+    event that hasn't been processed yet is queued again.
+    """
+    data_object = event['data']['object']
+    stored, created = StripeEvent.objects.get_or_create(
+        event_id=event['id'],
+        defaults={
+            'event_type': event['type'],
+            'object_id': data_object.get('id') or '',
+            'payload': event,
+            'stripe_created': event.get('created') or 0,
+        },
+    )
+    if created or stored.status != 'processed':
+        dispatch(stored.object_id)
+    return created
+
+
+def shard_pool(object_id):
+    """
+    The single-worker pool that owns this Stripe object, so its events are
+    applied one at a time while other objects proceed in parallel.
+    """
+    shards = max(getattr(settings, 'STRIPE_EVENT_SHARDS', 4), 1)
+    name = f'stripe-events-{zlib.crc32(object_id.encode()) % shards}'
+    background.get_executor(name, max_workers=1)
+    return name
+
+
+def dispatch(object_id):
+    background.submit(shard_pool(object_id), process_object_events, object_id)
+
+
+def process_object_events(object_id, retry=True):
+    """
+    Apply every pending event for one Stripe object, oldest first.
+
+    A failed event holds back the object's later events, so it is retried
+    with backoff (see schedule_retry); with retry=False the caller retries.
+    """
+    pending = StripeEvent.objects.filter(object_id=object_id).exclude(status='processed').order_by('stripe_created', 'id')
+    for event in pending:
+        if not process_event(event):
+            # Later events wait for this one rather than being applied out of order
+            if retry:
+                schedule_retry(object_id, event.attempts + 1)
+            break
+
+
+def schedule_retry(object_id, attempts):
+    """
+    Dispatch an object's events again after STRIPE_EVENT_RETRY_BACKOFF * 2^(attempts - 1)
+    seconds, up to STRIPE_EVENT_MAX_ATTEMPTS. Retries live in this process, so
+    an event still failing after that (or lost with the process) stays blocked
+    until Stripe redelivers it or `manage.py process_stripe_events` runs, which
+    should be scheduled (e.g. every 15 minutes).
+    """
+    max_attempts = getattr(settings, 'STRIPE_EVENT_MAX_ATTEMPTS', 5)
+    if attempts >= max_attempts or background.run_inline():
+        logger.error(f"Stripe events for {object_id} are blocked after {attempts} attempts; run process_stripe_events once fixed")
+        return
+    delay = getattr(settings, 'STRIPE_EVENT_RETRY_BACKOFF', 30) * 2 ** (attempts - 1)
+    timer = threading.Timer(delay, dispatch, args=[object_id])
+    timer.daemon = True
+    timer.start()
+    logger.warning(f"Retrying Stripe events for {object_id} in {delay}s (attempt {attempts + 1}/{max_attempts})")
+
+
+def process_event(event):
+    try:
+        with transaction.atomic():
+            apply_event(event.event_type, event.payload['data']['object'])
+            event.status = 'processed'
+            event.attempts += 1
+            event.last_error = ''
+            event.processed_at = timezone.now()
+            event.save(update_fields=['status', 'attempts', 'last_error', 'processed_at'])
+        return True
+    except Exception as e:
+        StripeEvent.objects.filter(pk=event.pk).update(status='failed', attempts=F('attempts') + 1, last_error=str(e))
+        metrics.WEBHOOK_FAILURES.inc(source='stripe')
+        logger.error(f"Stripe event {event.event_id} ({event.event_type}) failed: {e}")
+        return False
+
+
+def apply_event(event_type, data_object):
+    """The side effects of one event; must be safe to run again"""
+    if event_type in PAID_SESSION_EVENTS:
+        from .payment_service import StripePaymentService
+        StripePaymentService.handle_successful_payment(data_object)
+
+    elif event_type == 'payment_intent.succeeded':
+        logger.info(f"Payment intent succeeded: {data_object['id']}")
+
+
+def pending_object_ids(include_failed=True, max_attempts=None):
+    """Objects with events still to apply, for `manage.py process_stripe_events`"""
+    events = StripeEvent.objects.exclude(status='processed')
+    if not include_failed:
+        events = events.filter(status='received')
+    if max_attempts:
+        events = events.filter(attempts__lt=max_attempts)
+    return list(events.order_by().values_list('object_id', flat=True).distinct())
@@ -0,0 +1,66 @@
+import gzip
+import json
+import logging
+import threading
+from django.conf import settings
+from django.template import Origin, TemplateDoesNotExist
+from django.template.loaders.base import Loader
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_VERSION = 1
+
+_bundles = {}
+_bundles_lock = threading.Lock()
+
+
+def read_bundle(path):
+    """Template name -> source from a bundle written by `manage.py build_template_bundle`"""
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        data = json.load(f)
+    if data.get('version') != BUNDLE_VERSION:
+        raise ValueError(f"unsupported template bundle version {data.get('version')}")
+    return data['templates']
+
+
+def load_bundle(path):
+    """The bundle at path, read once per process; empty when missing or unreadable"""
+    path = str(path)
+    if path not in _bundles:
+        with _bundles_lock:
+            if path not in _bundles:
+                try:
+                    _bundles[path] = read_bundle(path)
+                    logger.info(f"Loaded {len(_bundles[path])} templates from {path}")
+                except FileNotFoundError:
+                    _bundles[path] = {}
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Ignoring template bundle {path}: {e}")
+                    _bundles[path] = {}
+    return _bundles[path]
+
+
+class BundleLoader(Loader):
+    """
+    Serve templates from the prebuilt bundle (TEMPLATE_BUNDLE_PATH) so a cold
+    start doesn't search and read every template directory. Names missing from
+    the bundle fall through to the next loader.
+    """
+
+    def __init__(self, engine, path=None):
+        super().__init__(engine)
+        self.path = path or getattr(settings, 'TEMPLATE_BUNDLE_PATH', None)
+
+    @property
+    def templates(self):
+        return load_bundle(self.path) if self.path else {}
+
+    def get_template_sources(self, template_name):
+        if template_name in self.templates:
+            yield Origin(name=f'bundle:{template_name}', template_name=template_name, loader=self)
+
+    def get_contents(self, origin):
+        try:
+            return self.templates[origin.template_name]
+        except KeyError:
+            raise TemplateDoesNotExist(origin)
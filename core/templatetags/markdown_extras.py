@@ -1,4 +1,3 @@
-import markdown
 import re
 from django import template
 from django.utils.safestring import mark_safe
@@ -15,6 +14,7 @@ def markdown_format(text):
         return ""
     
     # Configure markdown with enhanced extensions for readability
+    import markdown  # Deferred: markdown + Pygments are only needed once a post renders
     md = markdown.Markdown(
         extensions=[
             'markdown.extensions.fenced_code',
@@ -58,6 +58,7 @@ def blog_content_format(text):
         text = '\n'.join(text_lines)
     
     # Configure markdown with enhanced extensions
+    import markdown
     md = markdown.Markdown(
         extensions=[
             'markdown.extensions.fenced_code',
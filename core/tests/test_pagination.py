@@ -0,0 +1,93 @@
+import base64
+import json
+from datetime import timedelta
+from types import SimpleNamespace
+from django.test import TestCase
+from django.utils import timezone
+from core.models import Project
+from core.pagination import KeysetPaginator, decode_cursor, encode_cursor, paginate_items
+
+
+def raw_cursor(payload):
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+
+class DecodeCursorTests(TestCase):
+    def test_round_trip(self):
+        moment = timezone.now()
+        self.assertEqual(decode_cursor(encode_cursor('next', moment, 7)), ('next', moment, 7))
+
+    def test_malformed_cursors_are_ignored(self):
+        naive = timezone.now().replace(tzinfo=None).isoformat()
+        for token in ('', None, 'not-base64!', raw_cursor(['next', 'abc', 1]), raw_cursor(['next', None, 1]),
+                      raw_cursor(['next', naive, 1]), raw_cursor(['sideways', timezone.now().isoformat(), 1]),
+                      raw_cursor(['next', timezone.now().isoformat(), 'x']), raw_cursor({'next': 1})):
+            with self.subTest(token=token):
+                self.assertIsNone(decode_cursor(token))
+
+
+class KeysetPaginatorTests(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        for i in range(5):
+            project = Project.objects.create(title=f'Project {i}', description='d')
+            # Two rows share a timestamp so the id tiebreak is exercised
+            Project.objects.filter(pk=project.pk).update(created_at=now - timedelta(days=min(i, 3)))
+        self.paginator = KeysetPaginator(Project.objects.all(), 2)
+
+    def titles(self, page):
+        return [project.title for project in page]
+
+    def test_next_and_prev_cursors_walk_the_listing(self):
+        first = self.paginator.get_page()
+        self.assertEqual(self.titles(first), ['Project 0', 'Project 1'])
+        self.assertFalse(first.has_previous())
+
+        second = self.paginator.get_page(first.next_cursor)
+        self.assertEqual(self.titles(second), ['Project 2', 'Project 4'])
+
+        third = self.paginator.get_page(second.next_cursor)
+        self.assertEqual(self.titles(third), ['Project 3'])
+        self.assertFalse(third.has_next())
+
+        self.assertEqual(self.titles(self.paginator.get_page(third.previous_cursor)), ['Project 2', 'Project 4'])
+        self.assertEqual(self.titles(self.paginator.get_page(second.previous_cursor)), ['Project 0', 'Project 1'])
+
+    def test_malformed_cursor_gives_the_first_page(self):
+        page = self.paginator.get_page(raw_cursor(['next', 'abc', 1]))
+        self.assertEqual(self.titles(page), ['Project 0', 'Project 1'])
+
+    def test_listing_views_ignore_malformed_cursors(self):
+        for url in ('/portfolio/', '/blog/'):
+            with self.subTest(url=url):
+                response = self.client.get(url, {'cursor': raw_cursor(['next', 'abc', 1])})
+                self.assertEqual(response.status_code, 200)
+
+
+class PaginateItemsTests(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        self.items = [SimpleNamespace(pk=i, created_at=now - timedelta(days=i)) for i in range(1, 6)]
+
+    def test_next_cursor_continues_after_the_last_item(self):
+        page, next_cursor, total = paginate_items(self.items, 2)
+        self.assertEqual([item.pk for item in page], [1, 2])
+        self.assertEqual(total, 5)
+        page, next_cursor, _ = paginate_items(self.items, 2, next_cursor)
+        self.assertEqual([item.pk for item in page], [3, 4])
+        page, next_cursor, _ = paginate_items(self.items, 2, next_cursor)
+        self.assertEqual([item.pk for item in page], [5])
+        self.assertIsNone(next_cursor)
+
+    def test_prev_cursor_is_rejected(self):
+        with self.assertRaises(ValueError):
+            paginate_items(self.items, 2, encode_cursor('prev', self.items[2].created_at, 3))
+
+    def test_api_rejects_prev_cursor(self):
+        cursor = encode_cursor('prev', timezone.now(), 1)
+        response = self.client.get('/api/portfolio/', {'limit': 2, 'cursor': cursor})
+        self.assertEqual(response.status_code, 400)
+
+    def test_api_ignores_malformed_cursor(self):
+        response = self.client.get('/api/portfolio/', {'limit': 2, 'cursor': raw_cursor(['next', 'abc', 1])})
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,63 @@
+from decimal import Decimal
+from django.test import SimpleTestCase
+from core.models import PricingPlan, Service, ServicePricingOption
+from core.pricing import MAX_QUANTITY, PriceCatalog, PricingError
+
+
+class PriceCartTests(SimpleTestCase):
+    def setUp(self):
+        service = Service(id=1, title='Website', short_description='Site build', description='', price=Decimal('1200.00'))
+        custom = Service(id=2, title='Custom', short_description='', description='', price=None)
+        options = [
+            ServicePricingOption(id=10, service=service, name='Care', description='', price=Decimal('49.99'), period='monthly'),
+            ServicePricingOption(id=11, service=service, name='Audit', description='', price=Decimal('0.10'), period='one_time'),
+        ]
+        plans = [
+            PricingPlan(id=20, name='Growth', description='', price=Decimal('999.00'), price_period='yearly',
+                        stripe_price_id='price_growth'),
+        ]
+        self.catalog = PriceCatalog([service, custom], options, plans)
+
+    def test_unknown_and_unpriced_items_are_rejected(self):
+        for item_id in ('service_999', 'service_2', 'plan_option_999', ''):
+            with self.subTest(item_id=item_id), self.assertRaises(PricingError):
+                self.catalog.price_cart([{'id': item_id, 'quantity': 1}])
+
+    def test_empty_and_malformed_carts_are_rejected(self):
+        for cart in ([], None, 'service_1', [['service_1']]):
+            with self.subTest(cart=cart), self.assertRaises(PricingError):
+                self.catalog.price_cart(cart)
+
+    def test_quantity_bounds(self):
+        for quantity in (0, -1, MAX_QUANTITY + 1, 'two', None):
+            with self.subTest(quantity=quantity), self.assertRaises(PricingError):
+                self.catalog.price_cart([{'id': 'service_1', 'quantity': quantity}])
+        cart = self.catalog.price_cart([{'id': 'service_1', 'quantity': MAX_QUANTITY}])
+        self.assertEqual(cart.total, Decimal('120000.00'))
+
+    def test_client_price_is_ignored(self):
+        cart = self.catalog.price_cart([{'id': 'service_1', 'quantity': 1, 'price': '1.00'}])
+        self.assertEqual(cart.total, Decimal('1200.00'))
+        self.assertEqual(cart.line_items[0]['price_data']['unit_amount'], 120000)
+
+    def test_totals_are_exact_decimals(self):
+        cart = self.catalog.price_cart([
+            {'id': 'service_option_11', 'quantity': 3},
+            {'id': 'plan_option_10', 'quantity': 2},
+        ])
+        self.assertEqual(cart.total, Decimal('100.28'))
+        self.assertIsInstance(cart.total, Decimal)
+        self.assertEqual([item['quantity'] for item in cart.line_items], [3, 2])
+
+    def test_periodic_items_are_subscriptions(self):
+        one_time = self.catalog.price_cart([{'id': 'service_option_11'}])
+        self.assertEqual(one_time.mode, 'payment')
+        self.assertNotIn('recurring', one_time.line_items[0]['price_data'])
+
+        monthly = self.catalog.price_cart([{'id': 'service_option_10'}, {'id': 'service_1'}])
+        self.assertEqual(monthly.mode, 'subscription')
+        self.assertEqual(monthly.line_items[0]['price_data']['recurring'], {'interval': 'month'})
+
+        yearly = self.catalog.price_cart([{'id': 'plan_20'}])
+        self.assertEqual(yearly.mode, 'subscription')
+        self.assertEqual(yearly.line_items[0], {'price': 'price_growth', 'quantity': 1})
@@ -10,6 +10,8 @@ urlpatterns = [
     path('admin/portfolio/<int:pk>/edit/', admin_views.portfolio_edit, name='admin_portfolio_edit'),
     path('admin/portfolio/<int:pk>/delete/', admin_views.portfolio_delete, name='admin_portfolio_delete'),
     path('admin/portfolio/category/create/', admin_views.portfolio_category_create, name='admin_portfolio_category_create'),
+    path('admin/portfolio/uploads/', admin_views.portfolio_bulk_upload, name='admin_portfolio_bulk_upload'),
+    path('admin/portfolio/uploads/status/', admin_views.portfolio_upload_status, name='admin_portfolio_upload_status'),
     # Main website pages
     path('', views.home, name='home'),
     path('services/', views.services, name='services'),
@@ -39,6 +41,7 @@ urlpatterns = [
     path('api/pricing/', views.api_pricing, name='api_pricing'),
     path('api/pricing-option/<int:option_id>/', views.api_pricing_option, name='api_pricing_option'),
     path('api/portfolio/', views.api_portfolio, name='api_portfolio'),
+    path('api/bootstrap/', views.api_bootstrap, name='api_bootstrap'),
     path('api/lead/', views.api_lead, name='api_lead'),
     
     # Calendar functionality
@@ -48,6 +51,8 @@ urlpatterns = [
     
     # Health check and database setup
     path('health/', views.health_check, name='health_check'),
+    path('ready/', views.readiness, name='readiness'),
+    path('metrics', views.metrics_view, name='metrics'),
     path('setup-database/', views.setup_database, name='setup_database'),
     
     # SEO
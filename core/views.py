@@ -1,42 +1,99 @@
+import hmac
 import json
 import logging
 from datetime import datetime, timedelta
 from decimal import Decimal
+from django.conf import settings
 from django.shortcuts import render, get_object_or_404, redirect
-from django.http import JsonResponse, HttpResponse, Http404
+from django.http import FileResponse, JsonResponse, HttpResponse, Http404
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.utils.decorators import method_decorator
 from django.views import View
 from django.contrib import messages
-from django.core.paginator import Paginator
 from django.db.models import Q
 from django.utils import timezone
 from django.template.loader import render_to_string
+from django.contrib.sitemaps.views import sitemap
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
 from django.views.decorators.http import require_GET
-from rest_framework.decorators import api_view
-from rest_framework.response import Response
 from .models import (
     SiteConfiguration, Service, PricingPlan, Project, BlogPost, 
     Testimonial, TeamMember, Lead, Order, CalendarEvent, ServicePricingOption,
-    Portfolio, PortfolioCategory
+    Portfolio, PortfolioCategory, Technology, Tag, ProjectTechnology, BlogPostTag, term_slug
 )
-from .payment_service import StripePaymentService
-from .frappe_services import process_order_to_frappe
-from .ai_agent_service import AIAgentService
-# from .calendar_service import GoogleCalendarService, book_appointment
+from .integrations import (
+    AIAgentService, GoogleCalendarService, StripePaymentService, book_appointment
+)
+from .portfolio_index import CONTENT_TYPE_FILTERS, get_portfolio_index
+from .related_content import related_for, related_ids_for
+from .pagination import decode_cursor, encode_cursor, keyset_page, paginate_items
+from .pricing import PricingError, get_price_catalog
+from . import api_cache, circuit_breaker, health, image_variants, metrics, sitemap_files
+from .sitemap import SITEMAPS
 
 logger = logging.getLogger(__name__)
 
+# Technologies that place a project under a portfolio type when it has no portfolio_type of its own
+PORTFOLIO_TYPE_TECHNOLOGIES = {
+    'website': ['WordPress', 'HTML', 'CSS', 'JavaScript', 'React', 'Angular', 'Vue', 'Django', 'Flask', 'PHP'],
+    'ai': ['AI', 'Machine Learning', 'Python', 'TensorFlow', 'PyTorch', 'NLP', 'Computer Vision', 'Data Science', 'Automation'],
+    'social': ['Social Media', 'Content Creation', 'Marketing', 'Graphic Design', 'Video Editing', 'Instagram', 'Facebook', 'Twitter', 'LinkedIn'],
+}
+
 
 @require_GET
+def sitemap_file(request, filename):
+    """Pre-generated sitemap index and section files (see core/sitemap_files.py)"""
+    try:
+        found = sitemap_files.lookup(filename)
+    except OSError as e:
+        # Read-only filesystem: fall back to rendering the full sitemap per request
+        logger.error(f"Sitemap files unavailable: {e}")
+        if filename != sitemap_files.INDEX_FILE:
+            raise Http404
+        return sitemap(request, sitemaps=SITEMAPS)
+    if found is None:
+        raise Http404
+
+    path, last_modified = found
+    timestamp = int(last_modified.timestamp())
+    not_modified = get_conditional_response(request, last_modified=timestamp)
+    if not_modified is not None:
+        return not_modified
+
+    accepts_gzip = 'gzip' in request.headers.get('Accept-Encoding', '')
+    try:
+        body = (path.with_name(f'{path.name}.gz') if accepts_gzip else path).read_bytes()
+    except FileNotFoundError:
+        raise Http404
+    response = HttpResponse(body, content_type='application/xml')
+    if accepts_gzip:
+        response['Content-Encoding'] = 'gzip'
+    response['Last-Modified'] = http_date(timestamp)
+    patch_vary_headers(response, ['Accept-Encoding'])
+    return response
+
+
+@require_GET
+def image_variant(request, path):
+    """Resized image variants (see core/image_variants.py); names include the content hash, so they never change"""
+    found = image_variants.variant_file(path)
+    if found is None:
+        raise Http404
+    response = FileResponse(found.open('rb'), content_type=image_variants.CONTENT_TYPES[found.suffix[1:]])
+    response['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
+
+
 def robots_txt(request):
     content = render_to_string('robots.txt', {'request': request})
     return HttpResponse(content, content_type='text/plain')
 
 
 def home(request):
-    site_config = SiteConfiguration.objects.first()
+    site_config = SiteConfiguration.current()
     featured_services = Service.objects.filter(is_featured=True, is_active=True)[:3]
     featured_projects = Project.objects.filter(is_featured=True)[:6]
     featured_testimonials = Testimonial.objects.filter(is_featured=True, is_active=True)[:3]
@@ -44,47 +101,29 @@ def home(request):
     team_members = TeamMember.objects.filter(is_active=True)[:4]
     recent_blog_posts = BlogPost.objects.filter(status='published')[:3]
     
-    # Get portfolio categories and items
-    portfolio_categories = PortfolioCategory.objects.filter(is_active=True)
+    # Portfolio filters are served from the in-memory index
+    index = get_portfolio_index()
+    portfolio_categories = index.categories
     
     # Get selected category or content type filter
     category_filter = request.GET.get('category')
     selected_category = None
-    content_type_filter = None
+    content_type_filter = CONTENT_TYPE_FILTERS.get(category_filter)
     
-    # Check if it's a special content type filter
-    if category_filter in ['posts', 'videos', 'blogs', 'emails', 'featured']:
-        if category_filter == 'featured':
-            # Featured is a special case - we'll show featured items
-            pass
-        else:
-            content_type_filter = category_filter
-            if content_type_filter == 'posts':
-                content_type_filter = 'post'
-            elif content_type_filter == 'blogs':
-                content_type_filter = 'blog'
-            elif content_type_filter == 'videos':
-                content_type_filter = 'video'
-            elif content_type_filter == 'emails':
-                content_type_filter = 'email'
-    elif category_filter:
-        # Try to get the category by slug
-        try:
-            selected_category = PortfolioCategory.objects.get(slug=category_filter)
-        except PortfolioCategory.DoesNotExist:
-            selected_category = portfolio_categories.first() if portfolio_categories.exists() else None
-    else:
-        # Default view - show featured items
-        pass
+    if category_filter and category_filter != 'featured' and not content_type_filter:
+        # Unknown slugs fall back to the first active category
+        selected_category = index.category_by_slug.get(category_filter)
+        if selected_category is None and portfolio_categories:
+            selected_category = portfolio_categories[0]
     
     # Get portfolios based on selected filter
     if content_type_filter:
-        portfolios = Portfolio.objects.filter(content_type=content_type_filter, is_active=True)
+        portfolios = index.filter(content_type=content_type_filter)
     elif selected_category:
-        portfolios = Portfolio.objects.filter(category=selected_category, is_active=True)
-    elif category_filter == 'featured' or not category_filter:
+        portfolios = index.filter(category=selected_category.slug)
+    else:
         # Show featured items for both explicit 'featured' filter and default view
-        portfolios = Portfolio.objects.filter(is_active=True, is_featured=True)[:6]
+        portfolios = index.featured[:6]
     
     context = {
         'site_config': site_config,
@@ -108,7 +147,7 @@ def services(request):
     services = Service.objects.filter(is_active=True).order_by('order', 'title')
     packages = Service.objects.filter(is_active=True, price_type='package').order_by('order', 'title')
     individual_services = services  # For the individual services section
-    site_config = SiteConfiguration.objects.first()
+    site_config = SiteConfiguration.current()
     
     context = {
         'services': services,
@@ -121,7 +160,10 @@ def services(request):
 
 def service_detail(request, slug):
     service = get_object_or_404(Service, slug=slug, is_active=True)
-    related_services = Service.objects.filter(is_active=True).exclude(id=service.id)[:3]
+    related_services = (
+        related_for(service, Service.objects.filter(is_active=True))
+        or Service.objects.filter(is_active=True).exclude(id=service.id)[:3]
+    )
     
     # Prefetch pricing options if this is a tiered pricing service
     if service.price_type == 'tiered':
@@ -141,10 +183,10 @@ def service_detail(request, slug):
 def portfolio(request):
     projects_list = Project.objects.filter(status='completed')
     
-    # Filter by technology if provided
+    # Filter by technology if provided (matched by slug through the indexed join table)
     tech_filter = request.GET.get('tech')
     if tech_filter:
-        projects_list = projects_list.filter(technologies__contains=[tech_filter])
+        projects_list = projects_list.filter(tech_stack__slug=term_slug(tech_filter))
     
     # Filter by portfolio type if provided
     portfolio_type = request.GET.get('type')
@@ -153,42 +195,35 @@ def portfolio(request):
         if hasattr(Project, 'portfolio_type'):
             # If Project model has portfolio_type field, use it directly
             projects_list = projects_list.filter(portfolio_type=portfolio_type)
-        else:
+        elif portfolio_type in PORTFOLIO_TYPE_TECHNOLOGIES:
             # Otherwise, use the technology-based filtering as a fallback
-            if portfolio_type == 'website':
-                # Filter for website portfolio projects
-                projects_list = projects_list.filter(technologies__overlap=['WordPress', 'HTML', 'CSS', 'JavaScript', 'React', 'Angular', 'Vue', 'Django', 'Flask', 'PHP'])
-            elif portfolio_type == 'ai':
-                # Filter for AI automation projects
-                projects_list = projects_list.filter(technologies__overlap=['AI', 'Machine Learning', 'Python', 'TensorFlow', 'PyTorch', 'NLP', 'Computer Vision', 'Data Science', 'Automation'])
-            elif portfolio_type == 'social':
-                # Filter for social media content projects
-                projects_list = projects_list.filter(technologies__overlap=['Social Media', 'Content Creation', 'Marketing', 'Graphic Design', 'Video Editing', 'Instagram', 'Facebook', 'Twitter', 'LinkedIn'])
+            matching = ProjectTechnology.objects.filter(
+                technology__slug__in=[term_slug(name) for name in PORTFOLIO_TYPE_TECHNOLOGIES[portfolio_type]]
+            ).values('project_id')
+            projects_list = projects_list.filter(id__in=matching)
     
-    # Pagination
-    paginator = Paginator(projects_list, 12)
-    page_number = request.GET.get('page')
-    projects = paginator.get_page(page_number)
+    # Keyset pagination on (created_at, id)
+    projects = keyset_page(request, projects_list, 12, field='created_at')
     
-    # Get all unique technologies for filter
-    all_technologies = set()
-    for project in Project.objects.filter(status='completed'):
-        all_technologies.update(project.technologies)
+    # Get all technologies used by completed projects for the filter
+    all_technologies = Technology.objects.filter(
+        id__in=ProjectTechnology.objects.filter(project__status='completed').values('technology_id')
+    ).values_list('name', flat=True)
     
     # Get testimonials for the testimonials section
     testimonials = Testimonial.objects.filter(is_active=True)[:6]
     
     context = {
         'projects': projects,
-        'all_technologies': sorted(list(all_technologies)),
+        'all_technologies': list(all_technologies),
         'current_tech': tech_filter,
         'current_type': portfolio_type,
         'testimonials': testimonials,
     }
     
-    # Check if this is an AJAX request
+    # Filter changes and infinite scroll only need the project grid
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-        return render(request, 'core/portfolio.html', context)
+        return render(request, 'core/portfolio_grid.html', context)
     
     return render(request, 'core/portfolio.html', context)
 
@@ -202,7 +237,10 @@ def project_detail(request, slug):
     
     # Default behavior for regular project detail pages
     project = get_object_or_404(Project, slug=slug)
-    related_projects = Project.objects.filter(status='completed').exclude(id=project.id)[:3]
+    related_projects = (
+        related_for(project, Project.objects.filter(status='completed'))
+        or Project.objects.filter(status='completed').exclude(id=project.id)[:3]
+    )
     
     context = {
         'project': project,
@@ -213,7 +251,7 @@ def project_detail(request, slug):
 
 
 def blog(request):
-    blog_posts = BlogPost.objects.filter(status='published')
+    blog_posts = BlogPost.objects.filter(status='published').select_related('author')
     
     # Search functionality
     search_query = request.GET.get('q')
@@ -221,22 +259,20 @@ def blog(request):
         blog_posts = blog_posts.filter(
             Q(title__icontains=search_query) |
             Q(content__icontains=search_query) |
-            Q(tags__contains=[search_query])
+            Q(id__in=BlogPostTag.objects.filter(tag__slug=term_slug(search_query)).values('post_id'))
         )
     
-    # Pagination
-    paginator = Paginator(blog_posts, 10)
-    page_number = request.GET.get('page')
-    posts = paginator.get_page(page_number)
+    # Keyset pagination on (published_at, id)
+    posts = keyset_page(request, blog_posts, 10, field='published_at')
     
-    # Get all unique tags
-    all_tags = set()
-    for post in BlogPost.objects.filter(status='published'):
-        all_tags.update(post.tags)
+    # Get all tags used by published posts
+    all_tags = Tag.objects.filter(
+        id__in=BlogPostTag.objects.filter(post__status='published').values('tag_id')
+    ).values_list('name', flat=True)
     
     context = {
         'posts': posts,
-        'all_tags': sorted(list(all_tags)),
+        'all_tags': list(all_tags),
         'search_query': search_query,
     }
     
@@ -245,7 +281,10 @@ def blog(request):
 
 def blog_detail(request, slug):
     post = get_object_or_404(BlogPost, slug=slug, status='published')
-    related_posts = BlogPost.objects.filter(status='published').exclude(id=post.id)[:3]
+    related_posts = (
+        related_for(post, BlogPost.objects.filter(status='published'))
+        or BlogPost.objects.filter(status='published').exclude(id=post.id)[:3]
+    )
     
     context = {
         'post': post,
@@ -347,47 +386,28 @@ def checkout(request):
         if not cart_items:
             return JsonResponse({'error': 'Cart is empty'}, status=400)
             
-        import json
         cart_items = json.loads(cart_items)
         
-        if not cart_items:
-            return JsonResponse({'error': 'Cart is empty'}, status=400)
-        
-        # Calculate total amount
-        total_amount = 0
-        for item in cart_items:
-            total_amount += float(item.get('price', 0)) * int(item.get('quantity', 1))
-            # Add maintenance fees if applicable
-            if item.get('maintenance'):
-                total_amount += float(item.get('maintenance', 0)) * int(item.get('quantity', 1))
+        # Price the cart from the catalog; the prices the browser sent are not trusted
+        try:
+            priced_cart = get_price_catalog().price_cart(cart_items)
+        except PricingError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        first = priced_cart.lines[0].entry
         
         # Create order
         order_data = {
             'customer_name': customer_name,
             'customer_email': customer_email,
             'customer_phone': customer_phone,
-            'amount': total_amount,
-            'notes': f'Cart order with {len(cart_items)} items',
-            'service_name': 'Custom Service',
-            'pricing_plan_name': 'Custom Plan'
+            'amount': priced_cart.total,
+            'service_id': first.service_id,
+            'pricing_plan_id': first.pricing_plan_id,
+            'service_name': first.service_name,
+            'pricing_plan_name': first.plan_name,
+            'notes': f'Cart order with {len(cart_items)} items | Service: {first.service_name} | Plan: {first.plan_name}',
         }
         
-        # Extract service and pricing plan names from cart items if available
-        if cart_items and len(cart_items) > 0:
-            first_item = cart_items[0]
-            if 'name' in first_item:
-                item_name = first_item.get('name', '')
-                if ' - ' in item_name:
-                    service_part, plan_part = item_name.split(' - ', 1)
-                    order_data['service_name'] = service_part
-                    order_data['pricing_plan_name'] = plan_part
-                else:
-                    order_data['service_name'] = item_name
-        
-        # Add more details to notes
-        order_data['notes'] = f'Cart order with {len(cart_items)} items | Service: {order_data["service_name"]} | Plan: {order_data["pricing_plan_name"]}'
-
-        
         order = Order.objects.create(**order_data)
         
         # Create Stripe checkout session
@@ -397,7 +417,8 @@ def checkout(request):
             'customer_name': customer_name,
             'customer_email': customer_email,
             'customer_phone': customer_phone,
-            'cart_items': cart_items
+            'line_items': priced_cart.line_items,
+            'mode': priced_cart.mode,
         }
         
         try:
@@ -435,43 +456,23 @@ def checkout(request):
 
 def payment_success(request):
     session_id = request.GET.get('session_id')
-    # return render(request, 'core/payment_success.html')
     if not session_id:
         messages.error(request, 'Invalid payment session')
         return redirect('home')
     
-    try:
-        stripe_service = StripePaymentService()
-        session = stripe_service.retrieve_session(session_id)
-        order = stripe_service.handle_successful_payment(session)
-        
-        if order:
-            # Process order to Frappe
-            try:
-                process_order_to_frappe(order.order_id)
-            except Exception as e:
-                logger.error(f"Failed to process order to Frappe: {e}")
-            
-            # Notify AI agent
-            try:
-                ai_agent = AIAgentService()
-                ai_agent.notify_payment_success(order)
-            except Exception as e:
-                logger.error(f"Failed to notify AI agent about payment: {e}")
-            
-            context = {
-                'order': order,
-                'session': session
-            }
-            return render(request, 'core/payment_success.html', context)
-        else:
-            messages.error(request, 'Payment processed but order not found')
-            return redirect('home')
-            
-    except Exception as e:
-        logger.error(f"Payment success error: {e}")
-        messages.error(request, 'Error processing payment confirmation')
+    # The stripe_webhook normally confirms the order before the customer lands here
+    order = Order.objects.select_related('service').filter(stripe_session_id=session_id).first()
+    if order is None:
+        messages.error(request, 'Payment processed but order not found')
         return redirect('home')
+    
+    if order.status == 'pending':
+        # Webhook not in yet: confirm from a short-lived cached copy of the session
+        session = StripePaymentService.cached_session(session_id)
+        if session:
+            order = StripePaymentService.handle_successful_payment(session) or order
+    
+    return render(request, 'core/payment_success.html', {'order': order})
 
 
 def payment_cancelled(request):
@@ -486,11 +487,13 @@ def stripe_webhook(request):
     sig_header = request.META.get('HTTP_STRIPE_SIGNATURE')
     
     stripe_service = StripePaymentService()
-    success = stripe_service.handle_webhook(payload, sig_header)
+    with metrics.WEBHOOK_DURATION.time(source='stripe'):
+        success = stripe_service.handle_webhook(payload, sig_header)
     
     if success:
         return HttpResponse(status=200)
     else:
+        metrics.WEBHOOK_FAILURES.inc(source='stripe')
         return HttpResponse(status=400)
 
 
@@ -498,47 +501,91 @@ def stripe_webhook(request):
 @require_http_methods(["POST"])
 def ai_agent_webhook(request):
     try:
-        data = json.loads(request.body)
-        webhook_type = data.get('type')
-        
-        ai_agent = AIAgentService()
-        result = ai_agent.process_webhook_data(webhook_type, data)
+        with metrics.WEBHOOK_DURATION.time(source='ai_agent'):
+            data = json.loads(request.body)
+            webhook_type = data.get('type')
+            
+            ai_agent = AIAgentService()
+            result = ai_agent.process_webhook_data(webhook_type, data)
         
         return JsonResponse({'status': 'success', 'result': result})
         
     except Exception as e:
         logger.error(f"AI agent webhook error: {e}")
+        metrics.WEBHOOK_FAILURES.inc(source='ai_agent')
         return JsonResponse({'error': 'Webhook processing failed'}, status=500)
 
 
+@require_GET
+def readiness(request):
+    """503 until this instance has finished warming up (see socialdots/bootstrap.py)"""
+    from socialdots import bootstrap
+    status = bootstrap.report()
+    return JsonResponse(status, status=200 if status['ready'] else 503)
+
+
+@require_GET
+def metrics_view(request):
+    """Prometheus scrape endpoint for this process's metrics"""
+    token = getattr(settings, 'METRICS_TOKEN', None)
+    supplied = request.headers.get('Authorization', '').removeprefix('Bearer ').strip()
+    authorized = (token and hmac.compare_digest(supplied, token)) or (request.user.is_authenticated and request.user.is_staff)
+    if not authorized:
+        return HttpResponse(status=403)
+    return HttpResponse(metrics.render_prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+SERVICE_API_FIELDS = ('id', 'title', 'description', 'price', 'price_type', 'features')
+PRICING_API_FIELDS = ('id', 'name', 'description', 'price', 'price_period', 'features')
+PRICING_OPTION_API_FIELDS = ('id', 'name', 'price', 'period', 'features')
+# Bumped when the api/bootstrap/ payload changes shape
+BOOTSTRAP_API_VERSION = 1
+PORTFOLIO_API_FIELDS = (
+    'id', 'title', 'slug', 'description', 'category', 'content_type', 'video_url', 'blog_link',
+    'technology_used', 'is_featured', 'created_at', 'image',
+)
+
+
 @require_http_methods(["GET"])
 def api_services(request):
-    services_list = Service.objects.filter(is_active=True).values(
-        'id', 'title', 'description', 'price', 'price_type', 'features'
-    )
-    return JsonResponse({'services': list(services_list)})
+    fields = api_cache.parse_fields(request, SERVICE_API_FIELDS)
+
+    def build():
+        services_list = Service.objects.filter(is_active=True).values(*(fields or SERVICE_API_FIELDS))
+        return {'services': list(services_list)}
+    return api_cache.cached_json_response(request, 'services', fields, build)
 
 
 @require_http_methods(["GET"])
 def api_pricing(request):
-    pricing_plans = PricingPlan.objects.filter(is_active=True).values(
-        'id', 'name', 'description', 'price', 'price_period', 'features'
-    )
-    return JsonResponse({'pricing_plans': list(pricing_plans)})
+    fields = api_cache.parse_fields(request, PRICING_API_FIELDS)
+
+    def build():
+        pricing_plans = PricingPlan.objects.filter(is_active=True).values(*(fields or PRICING_API_FIELDS))
+        return {'pricing_plans': list(pricing_plans)}
+    return api_cache.cached_json_response(request, 'pricing', fields, build)
 
-@api_view(['GET'])
+def pricing_option_api_item(option):
+    return {
+        'id': option.id,
+        'name': option.name,
+        # Serialized as a string ("123.00"), as DRF's Response did
+        'price': option.price,
+        'period': option.period,
+        'features': option.features
+    }
+
+@require_GET
 def api_pricing_option(request, option_id):
-    try:
+    fields = api_cache.parse_fields(request, PRICING_OPTION_API_FIELDS)
+
+    def build():
         option = ServicePricingOption.objects.get(id=option_id)
-        return Response({
-            'id': option.id,
-            'name': option.name,
-            'price': option.price,
-            'period': option.period,
-            'features': option.features
-        })
+        return api_cache.project(pricing_option_api_item(option), None, fields)
+    try:
+        return api_cache.cached_json_response(request, 'pricing_option', (option_id, fields), build)
     except ServicePricingOption.DoesNotExist:
-        return Response({'error': 'Pricing option not found'}, status=404)
+        return JsonResponse({'error': 'Pricing option not found'}, status=404)
 
 
 @require_http_methods(["POST"])
@@ -655,7 +702,8 @@ def health_check(request):
         portfolio_count = Portfolio.objects.count()
         service_count = Service.objects.count()
         
-        # Check external services
+        # External services: cached background probe results and circuit states, never a live call
+        integrations = health.integration_health()
         health_status = {
             'database': 'healthy',
             'content': {
@@ -665,32 +713,13 @@ def health_check(request):
                 'services': service_count,
                 'has_content': blog_count > 0 or project_count > 0 or portfolio_count > 0
             },
-            'frappe': 'unknown',
-            'ai_agent': 'unknown',
+            'frappe': integrations['frappe']['status'],
+            'ai_agent': integrations['ai_agent']['status'],
+            'probes': integrations,
+            'circuits': circuit_breaker.states(),
             'timestamp': timezone.now().isoformat()
         }
         
-        # Check Frappe connection
-        try:
-            from .frappe_services import FrappeService
-            frappe_service = FrappeService()
-            if frappe_service.health_check():
-                health_status['frappe'] = 'healthy'
-            else:
-                health_status['frappe'] = 'unhealthy'
-        except Exception:
-            health_status['frappe'] = 'error'
-        
-        # Check AI Agent connection
-        try:
-            ai_agent = AIAgentService()
-            if ai_agent.health_check():
-                health_status['ai_agent'] = 'healthy'
-            else:
-                health_status['ai_agent'] = 'unhealthy'
-        except Exception:
-            health_status['ai_agent'] = 'error'
-        
         return JsonResponse(health_status)
         
     except Exception as e:
@@ -701,63 +730,117 @@ def health_check(request):
             'timestamp': timezone.now().isoformat()
         }, status=500)
 
+def portfolio_api_item(p):
+    item = {
+        'id': p.id,
+        'title': p.title,
+        'slug': p.slug,
+        'description': p.description,
+        'category': {
+            'id': p.category.id,
+            'name': p.category.name,
+            'slug': p.category.slug
+        },
+        'content_type': p.content_type,
+        'video_url': p.video_url,
+        'blog_link': p.blog_link,
+        'technology_used': p.technology_used,
+        'is_featured': p.is_featured,
+        'created_at': p.created_at.isoformat() if p.created_at else None,
+    }
+
+    # Use Cloudinary URL if available, otherwise fall back to regular image URL
+    if p.cloudinary_image_id:
+        item['image'] = p.get_cloudinary_url()
+    elif p.image:
+        item['image'] = p.image.url
+    else:
+        item['image'] = None
+    return item
+
+
 @require_http_methods(["GET"])
 def api_portfolio(request):
     category_filter = request.GET.get('category')
     content_type_filter = request.GET.get('content_type')
+    tech_filter = request.GET.get('tech')
+    fields = api_cache.parse_fields(request, PORTFOLIO_API_FIELDS)
     
-    # Initialize the queryset
-    portfolios = Portfolio.objects.filter(is_active=True)
-    
-    # Apply filters if provided
-    if category_filter:
-        portfolios = portfolios.filter(category__slug=category_filter)
-    
-    if content_type_filter:
-        portfolios = portfolios.filter(content_type=content_type_filter)
+    # Optional keyset pagination: ?limit=N&cursor=<next_cursor>
+    paginated = bool(request.GET.get('limit') or request.GET.get('cursor'))
+    limit = None
+    cursor = None
+    if paginated:
+        try:
+            limit = min(max(int(request.GET.get('limit', 12)), 1), 100)
+        except ValueError:
+            limit = 12
+        # Re-encode so junk or equivalent cursors share one cache entry
+        position = decode_cursor(request.GET.get('cursor'))
+        if position is not None and position[0] != 'next':
+            return JsonResponse({'error': 'Only next_cursor values can be used as a cursor'}, status=400)
+        cursor = encode_cursor(*position) if position is not None else None
     
-    # Prepare the portfolio data
-    portfolio_data = []
-    for p in portfolios:
-        item = {
-            'id': p.id,
-            'title': p.title,
-            'slug': p.slug,
-            'description': p.description,
-            'category': {
-                'id': p.category.id,
-                'name': p.category.name,
-                'slug': p.category.slug
+    index = get_portfolio_index()
+
+    def build():
+        portfolios = index.filter(
+            category=category_filter,
+            content_type=content_type_filter,
+            technology=term_slug(tech_filter) if tech_filter else None,
+        )
+        pagination = None
+        if paginated:
+            portfolios, next_cursor, total = paginate_items(portfolios, limit, cursor)
+            pagination = {'next_cursor': next_cursor, 'total': total, 'limit': limit}
+        
+        response_data = api_cache.project({'portfolios': [portfolio_api_item(p) for p in portfolios]}, 'portfolios', fields)
+        if pagination:
+            response_data['pagination'] = pagination
+        return response_data
+
+    key = (category_filter, content_type_filter, term_slug(tech_filter) if tech_filter else None, limit, cursor, fields)
+    # Keyed to the index snapshot, so a rebuild (here or after the TTL) is a miss
+    return api_cache.cached_json_response(request, 'portfolio', key, build, version=index.built_at)
+
+@require_GET
+def api_bootstrap(request):
+    """
+    Services, pricing plans, pricing options and the portfolio catalogue in
+    one cached response. Clients revalidate with If-None-Match and get a 304
+    while nothing has changed.
+    """
+    index = get_portfolio_index()
+
+    def build():
+        options = ServicePricingOption.objects.filter(service__is_active=True).order_by('service_id', 'order')
+        return {
+            'version': BOOTSTRAP_API_VERSION,
+            'services': list(Service.objects.filter(is_active=True).values(*SERVICE_API_FIELDS)),
+            'pricing_plans': list(PricingPlan.objects.filter(is_active=True).values(*PRICING_API_FIELDS)),
+            'pricing_options': {
+                str(option.id): dict(pricing_option_api_item(option), service_id=option.service_id)
+                for option in options
+            },
+            'portfolio': {
+                'categories': [{'id': c.id, 'name': c.name, 'slug': c.slug} for c in index.categories],
+                'portfolios': [portfolio_api_item(p) for p in index.items],
             },
-            'content_type': p.content_type,
-            'video_url': p.video_url,
-            'blog_link': p.blog_link,
-            'technology_used': p.technology_used,
-            'is_featured': p.is_featured,
-            'created_at': p.created_at.isoformat() if p.created_at else None,
         }
-        
-        # Use Cloudinary URL if available, otherwise fall back to regular image URL
-        if p.cloudinary_image_id:
-            item['image'] = p.get_cloudinary_url()
-        elif p.image:
-            item['image'] = p.image.url
-        else:
-            item['image'] = None
-        
-        portfolio_data.append(item)
-    
-    return JsonResponse({'portfolios': portfolio_data})
+
+    response = api_cache.cached_json_response(request, 'bootstrap', BOOTSTRAP_API_VERSION, build, version=index.built_at)
+    # Always revalidate; an unchanged catalogue costs a 304 with no body
+    patch_cache_control(response, no_cache=True)
+    return response
 
 def portfolio_detail(request, slug):
     try:
         portfolio = Portfolio.objects.get(slug=slug, is_active=True)
         
-        # Get related portfolios from the same category
-        related_portfolios = Portfolio.objects.filter(
-            category=portfolio.category, 
-            is_active=True
-        ).exclude(id=portfolio.id)[:3]
+        # Related portfolios by content similarity, falling back to the same category
+        index = get_portfolio_index()
+        related_ids = related_ids_for(portfolio) or []
+        related_portfolios = [index.by_id[pk] for pk in related_ids if pk in index.by_id] or index.related(portfolio)
         
         # Prepare portfolio data with Cloudinary URL if available
         portfolio_data = {
@@ -784,7 +867,7 @@ def portfolio_detail(request, slug):
             portfolio_data['thumbnail'] = portfolio.get_cloudinary_url(width=400, height=300, crop='fill')
         elif portfolio.image:
             portfolio_data['image'] = portfolio.image.url
-            portfolio_data['thumbnail'] = portfolio.image.url
+            portfolio_data['thumbnail'] = portfolio.get_cloudinary_url(width=400, height=300, crop='fill')
         else:
             portfolio_data['image'] = None
             portfolio_data['thumbnail'] = None
@@ -833,7 +916,7 @@ def portfolio_detail_api(request, portfolio_id):
             portfolio_data['thumbnail'] = portfolio.get_cloudinary_url(width=400, height=300, crop='fill')
         elif portfolio.image:
             portfolio_data['image'] = portfolio.image.url
-            portfolio_data['thumbnail'] = portfolio.image.url
+            portfolio_data['thumbnail'] = portfolio.get_cloudinary_url(width=400, height=300, crop='fill')
         else:
             portfolio_data['image'] = None
             portfolio_data['thumbnail'] = None
@@ -1,9 +1,7 @@
-from http.server import BaseHTTPRequestHandler
+# Entry point kept for existing deployments; the bootstrap lives in socialdots/bootstrap.py
+from socialdots.bootstrap import get_application
 
-class handler(BaseHTTPRequestHandler):
-    def do_GET(self):
-        self.send_response(200)
-        self.send_header('Content-type', 'text/html')
-        self.end_headers()
-        self.wfile.write(b'<h1>Social Dots Inc.</h1><p>Python handler working on Vercel!</p>')
-        return
\ No newline at end of file
+application = get_application()
+
+# Vercel handler
+app = application
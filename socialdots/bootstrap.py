@@ -0,0 +1,166 @@
+"""
+Single bootstrap for every WSGI entry point (socialdots/wsgi.py, app.py,
+wsgi_handler.py, vercel_app.py, index.py, api/index.py).
+
+Creating the application also runs a warm-up phase so the first real request
+on a fresh serverless instance doesn't pay for URL resolver population,
+template compilation, the first database connection or empty caches.
+"""
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_application = None
+_ready = threading.Event()
+_report = {'state': 'not started'}
+
+# Run in this order; WARMUP_STEPS selects a subset
+DEFAULT_STEPS = ('database', 'urls', 'templates', 'site_config', 'content')
+
+
+def get_application():
+    """The Django WSGI application, created and warmed up once per process"""
+    global _application
+    if _application is None:
+        with _lock:
+            if _application is None:
+                _application = _create_application()
+    return _application
+
+
+def is_ready():
+    return _ready.is_set()
+
+
+def report():
+    """Readiness plus per-step warm-up timings, for the /ready/ endpoint and logs"""
+    return {'ready': is_ready(), **_report}
+
+
+def _create_application():
+    if str(PROJECT_ROOT) not in sys.path:
+        sys.path.insert(0, str(PROJECT_ROOT))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'socialdots.settings')
+
+    started = time.perf_counter()
+    from django.core.wsgi import get_wsgi_application
+    application = get_wsgi_application()
+    _report['setup_ms'] = round((time.perf_counter() - started) * 1000, 1)
+
+    from django.conf import settings
+    from socialdots.database import is_in_memory
+    in_memory = is_in_memory(settings.DATABASES['default'])
+    if in_memory:
+        _migrate_in_memory_database()
+
+    if not getattr(settings, 'WARMUP_ENABLED', True):
+        _report['state'] = 'skipped'
+        _ready.set()
+    elif getattr(settings, 'WARMUP_IN_BACKGROUND', False) and not in_memory:
+        # Each thread gets its own in-memory SQLite database, so that case always warms up inline
+        threading.Thread(target=_warm_up_in_background, name='warm-up', daemon=True).start()
+    else:
+        warm_up()
+    return application
+
+
+def _migrate_in_memory_database():
+    """An in-memory database starts empty in every instance and has to be migrated"""
+    from django.core.management import call_command
+    try:
+        call_command('migrate', verbosity=0, interactive=False)
+    except Exception as e:
+        logger.error(f"Migrating the in-memory database failed: {e}")
+
+
+def _warm_up_in_background():
+    from django.db import connections
+    try:
+        warm_up()
+    finally:
+        # Connections opened here belong to this thread and would never be reused
+        connections.close_all()
+
+
+def warm_up(steps=None):
+    """
+    Run the warm-up steps, recording how long each took. A failing step is
+    logged and skipped; warm-up never stops the application from starting.
+    """
+    from django.conf import settings
+    steps = steps or getattr(settings, 'WARMUP_STEPS', DEFAULT_STEPS)
+    _report['state'] = 'warming'
+    _report['steps'] = timings = {}
+
+    started = time.perf_counter()
+    for name in steps:
+        step = WARMUP_STEPS.get(name)
+        if step is None:
+            logger.warning(f"Unknown warm-up step: {name}")
+            continue
+        step_started = time.perf_counter()
+        try:
+            step(settings)
+            timings[name] = round((time.perf_counter() - step_started) * 1000, 1)
+        except Exception as e:
+            timings[name] = f'failed: {e}'
+            logger.warning(f"Warm-up step {name} failed: {e}")
+
+    _report['warmup_ms'] = round((time.perf_counter() - started) * 1000, 1)
+    _report['state'] = 'ready'
+    _ready.set()
+    logger.info(f"Warm-up finished: {json.dumps(_report)}")
+    return report()
+
+
+def _open_connections(settings):
+    from django.db import connections
+    for alias in connections:
+        connections[alias].ensure_connection()
+
+
+def _populate_urls(settings):
+    from django.urls import Resolver404, get_resolver, resolve
+    get_resolver().reverse_dict  # Populates the resolver for every pattern
+    for path in getattr(settings, 'WARMUP_PATHS', ()):
+        try:
+            resolve(path)
+        except Resolver404:
+            logger.warning(f"Warm-up path does not resolve: {path}")
+
+
+def _compile_templates(settings):
+    # The cached template loader keeps each compiled template for the life of the process
+    from django.template.loader import get_template
+    for name in getattr(settings, 'WARMUP_TEMPLATES', ()):
+        get_template(name)
+
+
+def _prime_site_config(settings):
+    from core.models import SiteConfiguration
+    SiteConfiguration.current()
+
+
+def _prime_content(settings):
+    from core.portfolio_index import get_portfolio_index
+    from core.pricing import get_price_catalog
+    get_portfolio_index()
+    get_price_catalog()
+
+
+WARMUP_STEPS = {
+    'database': _open_connections,
+    'urls': _populate_urls,
+    'templates': _compile_templates,
+    'site_config': _prime_site_config,
+    'content': _prime_content,
+}
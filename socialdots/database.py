@@ -0,0 +1,141 @@
+import os
+from pathlib import Path
+from urllib.parse import parse_qsl, unquote, urlparse
+from django.core.exceptions import ImproperlyConfigured
+
+# Applied to every new on-disk SQLite connection (see configure_sqlite_connection)
+SQLITE_PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA foreign_keys=ON',
+    'PRAGMA busy_timeout=5000',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA cache_size=-20000',
+    'PRAGMA mmap_size=134217728',
+)
+
+IN_MEMORY_DATABASE = {
+    'ENGINE': 'django.db.backends.sqlite3',
+    'NAME': ':memory:',
+}
+
+
+def database_config(base_dir):
+    """
+    Build DATABASES['default'] from the environment.
+
+    DATABASE_URL selects PostgreSQL (postgres://...) or an on-disk SQLite file
+    (sqlite:///path, relative to the project root). Without it, local runs use
+    BASE_DIR/db.sqlite3. Vercel's bundle is read-only, so there SQLite falls
+    back to the old per-instance in-memory database.
+    """
+    url = os.environ.get('DATABASE_URL', '').strip()
+    scheme = url.split(':', 1)[0].lower() if url else 'sqlite'
+
+    if scheme in ('postgres', 'postgresql', 'pgsql'):
+        return postgres_config(url)
+    if scheme != 'sqlite':
+        raise ImproperlyConfigured(f"Unsupported DATABASE_URL scheme '{scheme}'")
+
+    if os.environ.get('VERCEL'):
+        return dict(IN_MEMORY_DATABASE)
+
+    # sqlite:///db.sqlite3 is relative to the project root, sqlite:////abs/path is absolute
+    path = urlparse(url).path[1:] if url else ''
+    if path == ':memory:':
+        return dict(IN_MEMORY_DATABASE)
+    return sqlite_config(Path(base_dir) / (path or 'db.sqlite3'))
+
+
+def read_database_configs(base_dir):
+    """
+    Read-only aliases for public content, used by core.db_router.
+
+    DATABASE_REPLICA_URL adds a 'replica' (e.g. a PostgreSQL streaming replica);
+    CONTENT_SNAPSHOT_PATH adds a 'snapshot' SQLite file built by
+    build_content_snapshot, opened read-only. A missing snapshot file is skipped.
+    """
+    databases = {}
+
+    replica_url = os.environ.get('DATABASE_REPLICA_URL', '').strip()
+    if replica_url:
+        scheme = replica_url.split(':', 1)[0].lower()
+        if scheme not in ('postgres', 'postgresql', 'pgsql'):
+            raise ImproperlyConfigured(f"Unsupported DATABASE_REPLICA_URL scheme '{scheme}'")
+        replica = postgres_config(replica_url)
+        replica['OPTIONS'].setdefault('options', '-c default_transaction_read_only=on')
+        databases['replica'] = replica
+
+    snapshot_path = os.environ.get('CONTENT_SNAPSHOT_PATH', '').strip()
+    if snapshot_path:
+        path = Path(base_dir) / snapshot_path
+        if path.exists():
+            databases['snapshot'] = snapshot_config(path)
+
+    return databases
+
+
+def snapshot_config(path):
+    # immutable=1 skips locking entirely; the file is only ever swapped out whole
+    return {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': f'file:{path}?mode=ro&immutable=1',
+        'CONN_MAX_AGE': _conn_max_age(),
+        'CONN_HEALTH_CHECKS': True,
+    }
+
+
+def _conn_max_age():
+    return int(os.environ.get('DB_CONN_MAX_AGE', '600'))
+
+
+def postgres_config(url):
+    parsed = urlparse(url)
+    options = dict(parse_qsl(parsed.query))
+    options.setdefault('connect_timeout', os.environ.get('DB_CONNECT_TIMEOUT', '5'))
+
+    config = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': unquote(parsed.path.lstrip('/')),
+        'USER': unquote(parsed.username or ''),
+        'PASSWORD': unquote(parsed.password or ''),
+        'HOST': parsed.hostname or '',
+        'PORT': str(parsed.port or ''),
+        # Reuse connections across requests, checking them before each request's first query
+        'CONN_MAX_AGE': _conn_max_age(),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': options,
+    }
+
+    # PgBouncer in transaction mode hands each transaction a different server
+    # connection, so server-side (named) cursors cannot survive between fetches
+    if os.environ.get('DB_POOL_MODE', '').lower() == 'transaction':
+        config['DISABLE_SERVER_SIDE_CURSORS'] = True
+
+    return config
+
+
+def sqlite_config(path):
+    return {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': str(path),
+        'CONN_MAX_AGE': _conn_max_age(),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {'timeout': 20},
+    }
+
+
+def is_in_memory(database):
+    return database['ENGINE'].endswith('sqlite3') and str(database['NAME']) in (':memory:', '')
+
+
+def configure_sqlite_connection(sender, connection, **kwargs):
+    """connection_created handler: WAL mode and tuned pragmas for on-disk SQLite"""
+    if connection.vendor != 'sqlite' or is_in_memory(connection.settings_dict):
+        return
+    if str(connection.settings_dict['NAME']).startswith('file:'):
+        # Read-only snapshots cannot change journal mode
+        return
+    with connection.cursor() as cursor:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
@@ -31,11 +31,15 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.sitemaps',
     'core',
     'rest_framework',
 ]
 
 MIDDLEWARE = [
+    # Outermost so their timings cover the whole request
+    'core.middleware.MetricsMiddleware',
+    'core.middleware.InstrumentationMiddleware',
     # Custom middleware to handle static files in Vercel envi
     # 'core.middleware.ContentSecurityPolicyMiddleware',
     'django.middleware.security.SecurityMiddleware',
@@ -44,6 +48,9 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.PrimaryDatabasePinMiddleware',
+    # Staff-only ?_profile=<token> (see manage.py profile_token)
+    'core.middleware.RequestProfilerMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     # Custom middleware for Content Security Policy
@@ -52,12 +59,24 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = 'socialdots.urls'
 
+# Prebuilt template bundle (`manage.py build_template_bundle`); skipped under DEBUG so edits show up
+TEMPLATE_BUNDLE_PATH = os.environ.get('TEMPLATE_BUNDLE_PATH', 'template_bundle.json.gz')
+TEMPLATE_COMPILE_BUDGET_MS = float(os.environ.get('TEMPLATE_COMPILE_BUDGET_MS', '50'))
+
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+if not DEBUG:
+    TEMPLATE_LOADERS.insert(0, 'core.template_loaders.BundleLoader')
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
+            # Compiled templates are kept for the life of the process
+            'loaders': [('django.template.loaders.cached.Loader', TEMPLATE_LOADERS)],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -75,12 +94,21 @@ WSGI_APPLICATION = 'socialdots.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# DATABASE_URL=postgres://... for production (DB_CONN_MAX_AGE, DB_POOL_MODE=transaction
+# behind PgBouncer); otherwise an on-disk SQLite file in WAL mode. See socialdots/database.py.
+from .database import database_config, read_database_configs
+
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': ':memory:',
-    }
-}    
+    'default': database_config(BASE_DIR),
+    # Optional 'replica' (DATABASE_REPLICA_URL) and 'snapshot' (CONTENT_SNAPSHOT_PATH)
+    **read_database_configs(BASE_DIR),
+}
+
+# Public content reads go to the replica/snapshot when configured; everything else to default
+DATABASE_ROUTERS = ['core.db_router.ContentRouter']
+
+# How long an admin session keeps reading from the primary after an edit
+READ_YOUR_WRITES_SECONDS = int(os.environ.get('READ_YOUR_WRITES_SECONDS', '30'))
 
 
 
@@ -161,6 +189,14 @@ CKEDITOR_CONFIGS = {
 STRIPE_PUBLIC_KEY = os.environ.get('STRIPE_PUBLIC_KEY')
 STRIPE_SECRET_KEY = os.environ.get('STRIPE_SECRET_KEY')
 STRIPE_WEBHOOK_SECRET = os.environ.get('STRIPE_WEBHOOK_SECRET')
+# payment_success asks Stripe about a session at most this often while the webhook is outstanding
+STRIPE_SESSION_CACHE_SECONDS = int(os.environ.get('STRIPE_SESSION_CACHE_SECONDS', '30'))
+# Stored webhook events are applied by this many single-worker pools, sharded by Stripe object id
+STRIPE_EVENT_SHARDS = int(os.environ.get('STRIPE_EVENT_SHARDS', '4'))
+# A failed event is retried in-process after BACKOFF * 2^(attempt - 1) seconds; run
+# `manage.py process_stripe_events` on a schedule for events that stay failed
+STRIPE_EVENT_MAX_ATTEMPTS = int(os.environ.get('STRIPE_EVENT_MAX_ATTEMPTS', '5'))
+STRIPE_EVENT_RETRY_BACKOFF = int(os.environ.get('STRIPE_EVENT_RETRY_BACKOFF', '30'))
 
 # Frappe Configuration
 FRAPPE_API_URL = os.environ.get('FRAPPE_API_URL')
@@ -189,6 +225,91 @@ CLOUDINARY_STORAGE = {
 
 DEFAULT_FILE_STORAGE = 'cloudinary_storage.storage.MediaCloudinaryStorage'
 
+# Background worker pool (Cloudinary uploads and other deferred work)
+BACKGROUND_TASKS_ENABLED = os.environ.get('BACKGROUND_TASKS_ENABLED', 'True').lower() == 'true'
+BACKGROUND_WORKERS = int(os.environ.get('BACKGROUND_WORKERS', '4'))
+CLOUDINARY_UPLOAD_RETRIES = int(os.environ.get('CLOUDINARY_UPLOAD_RETRIES', '3'))
+
+# Local image variants (used when an image has no Cloudinary public ID)
+# Served by core.views.image_variant; /tmp is the only writable directory on Vercel
+IMAGE_VARIANT_ROOT = Path(os.environ.get('IMAGE_VARIANT_ROOT', '/tmp/socialdots-variants' if os.environ.get('VERCEL') else MEDIA_ROOT / 'variants'))
+IMAGE_VARIANT_FORMAT = os.environ.get('IMAGE_VARIANT_FORMAT', 'webp')
+IMAGE_VARIANT_WIDTHS = (320, 480, 640, 960, 1280, 1920)
+IMAGE_VARIANT_QUALITY = 80
+IMAGE_VARIANT_CACHE_MAX_BYTES = int(os.environ.get('IMAGE_VARIANT_CACHE_MAX_MB', '512')) * 1024 * 1024
+
+# Request instrumentation (Server-Timing header + structured log line per sampled request)
+INSTRUMENTATION_ENABLED = os.environ.get('INSTRUMENTATION_ENABLED', 'True').lower() == 'true'
+INSTRUMENTATION_SAMPLE_RATE = float(os.environ.get('INSTRUMENTATION_SAMPLE_RATE', '1.0' if DEBUG else '0.1'))
+# Log a possible N+1 when one SQL statement runs this many times in a request
+INSTRUMENTATION_N_PLUS_ONE_THRESHOLD = int(os.environ.get('INSTRUMENTATION_N_PLUS_ONE_THRESHOLD', '5'))
+
+# On-demand profiling for staff with a signed token from `manage.py profile_token`
+PROFILER_ENABLED = os.environ.get('PROFILER_ENABLED', 'True').lower() == 'true'
+PROFILER_TOKEN_MAX_AGE = int(os.environ.get('PROFILER_TOKEN_MAX_AGE', '3600'))
+
+# In-process Prometheus metrics at /metrics (staff session or `Authorization: Bearer <METRICS_TOKEN>`)
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'True').lower() == 'true'
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
+# `manage.py import_profile` fails when a cold start's imports take longer than this (unset: report only)
+IMPORT_TIME_BUDGET_MS = float(os.environ['IMPORT_TIME_BUDGET_MS']) if os.environ.get('IMPORT_TIME_BUDGET_MS') else None
+
+# Warm-up when a new instance starts (socialdots/bootstrap.py); /ready/ reports progress
+WARMUP_ENABLED = os.environ.get('WARMUP_ENABLED', 'True').lower() == 'true'
+WARMUP_IN_BACKGROUND = os.environ.get('WARMUP_IN_BACKGROUND', 'False').lower() == 'true'
+WARMUP_STEPS = [step for step in os.environ.get('WARMUP_STEPS', 'database,urls,templates,site_config,content').split(',') if step]
+WARMUP_PATHS = ['/', '/services/', '/portfolio/', '/blog/', '/about/', '/contact/', '/api/portfolio/', '/api/bootstrap/']
+WARMUP_TEMPLATES = [
+    'base.html', 'core/home.html', 'core/services.html', 'core/portfolio.html', 'core/portfolio_grid.html',
+    'core/blog.html', 'core/blog_detail.html', 'core/about.html', 'core/contact.html',
+]
+SITE_CONFIG_CACHE_SECONDS = int(os.environ.get('SITE_CONFIG_CACHE_SECONDS', '300'))
+
+# `manage.py export_static_site` output, served by the CDN ahead of Django for anonymous visitors
+STATIC_EXPORT_ROOT = Path(os.environ.get('STATIC_EXPORT_ROOT', BASE_DIR / 'static_site'))
+STATIC_EXPORT_HOST = os.environ.get('STATIC_EXPORT_HOST', 'socialdots.ca')
+# Re-render the affected exported pages when content is saved (see core/page_graph.py)
+STATIC_EXPORT_ON_SAVE = os.environ.get('STATIC_EXPORT_ON_SAVE', 'False').lower() == 'true'
+# Edits are batched until they pause this long, but never held longer than the max delay
+PAGE_REGENERATION_DEBOUNCE = float(os.environ.get('PAGE_REGENERATION_DEBOUNCE', '2'))
+PAGE_REGENERATION_MAX_DELAY = float(os.environ.get('PAGE_REGENERATION_MAX_DELAY', '10'))
+
+# Generated sitemap index + section files (core/sitemap_files.py); /tmp is the only writable path on Vercel
+SITEMAP_ROOT = Path(os.environ.get('SITEMAP_ROOT', '/tmp/socialdots-sitemaps' if os.environ.get('VERCEL') else BASE_DIR / 'sitemaps'))
+SITEMAP_DOMAIN = os.environ.get('SITEMAP_DOMAIN', 'socialdots.ca')
+SITEMAP_PROTOCOL = 'https'
+# Seconds between checks that an instance's sitemap files still match the database
+SITEMAP_CHECK_INTERVAL = int(os.environ.get('SITEMAP_CHECK_INTERVAL', '60'))
+
+# Circuit breakers for outbound integrations (core/circuit_breaker.py): open when at least MIN_CALLS
+# calls in the last WINDOW seconds failed at FAILURE_RATE or more, then retry one call after RESET_TIMEOUT
+CIRCUIT_BREAKER_ENABLED = os.environ.get('CIRCUIT_BREAKER_ENABLED', 'True').lower() == 'true'
+CIRCUIT_BREAKER_FAILURE_RATE = float(os.environ.get('CIRCUIT_BREAKER_FAILURE_RATE', '0.5'))
+CIRCUIT_BREAKER_MIN_CALLS = int(os.environ.get('CIRCUIT_BREAKER_MIN_CALLS', '5'))
+CIRCUIT_BREAKER_WINDOW = int(os.environ.get('CIRCUIT_BREAKER_WINDOW', '60'))
+CIRCUIT_BREAKER_RESET_TIMEOUT = int(os.environ.get('CIRCUIT_BREAKER_RESET_TIMEOUT', '30'))
+# /health/ serves cached integration probes, refreshed in the background once older than the interval
+HEALTH_PROBE_INTERVAL = int(os.environ.get('HEALTH_PROBE_INTERVAL', '60'))
+HEALTH_PROBE_TIMEOUT = int(os.environ.get('HEALTH_PROBE_TIMEOUT', '10'))
+
+# Pre-serialized JSON bodies for the read-only APIs (core/api_cache.py); orjson is used when installed
+API_CACHE_ENABLED = os.environ.get('API_CACHE_ENABLED', 'True').lower() == 'true'
+API_CACHE_TTL = int(os.environ.get('API_CACHE_TTL', '300'))
+API_CACHE_MAX_ENTRIES = int(os.environ.get('API_CACHE_MAX_ENTRIES', '1000'))
+
+# In-memory checkout price catalog (core/pricing.py): seconds before a process rebuilds it
+PRICE_CATALOG_TTL = int(os.environ.get('PRICE_CATALOG_TTL', '300'))
+
+# In-memory portfolio index: seconds before a process rebuilds to pick up other processes' writes
+PORTFOLIO_INDEX_TTL = int(os.environ.get('PORTFOLIO_INDEX_TTL', '300'))
+
+# Related content engine: neighbours stored per object (detail pages show the first three)
+RELATED_CONTENT_TOP_K = 6
+# Rows scored per similarity block, and how far IDF weights may drift before a save rescores the whole corpus
+RELATED_CONTENT_BLOCK_ROWS = 256
+RELATED_CONTENT_IDF_TOLERANCE = float(os.environ.get('RELATED_CONTENT_IDF_TOLERANCE', '0.05'))
+
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = os.environ.get('EMAIL_HOST', 'smtp.gmail.com')
 EMAIL_PORT = int(os.environ.get('EMAIL_PORT', '587'))
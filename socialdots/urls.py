@@ -15,21 +15,15 @@ urlpatterns = [
 
 # Main website URLs
 try:
-    # Import sitemaps and add full functionality
-    from django.contrib.sitemaps.views import sitemap
-    from core.sitemap import StaticViewSitemap, ServiceSitemap, PortfolioSitemap, ProjectSitemap, BlogSitemap
-    
-    sitemaps = {
-        'static': StaticViewSitemap,
-        'services': ServiceSitemap,
-        'portfolio': PortfolioSitemap,
-        'projects': ProjectSitemap,
-        'blog': BlogSitemap,
-    }
+    # Sitemap index and per-section files, pre-generated when content changes
+    from django.urls import re_path
+    from core.views import image_variant, sitemap_file
     
     urlpatterns += [
         path('ckeditor/', include('ckeditor_uploader.urls')),
-        path('sitemap.xml', sitemap, {'sitemaps': sitemaps}, name='django.contrib.sitemaps.views.sitemap'),
+        re_path(r'^(?P<filename>sitemap(-[a-z]+(-\d+)?)?\.xml)$', sitemap_file, name='sitemap_file'),
+        # Locally resized images (see core/image_variants.py); MEDIA_URL is only served under DEBUG
+        path('image-variants/<path:path>', image_variant, name='image_variant'),
         path('', include('core.urls')),  # Main website URLs
     ]
     
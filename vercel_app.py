@@ -1,8 +1,7 @@
-# Absolute minimal WSGI app to test Vercel deployment
-def application(environ, start_response):
-    status = '200 OK'
-    headers = [('Content-type', 'text/html')]
-    start_response(status, headers)
-    return [b'<h1>Social Dots</h1><p>Basic WSGI working on Vercel!</p>']
+# Entry point kept for existing deployments; the bootstrap lives in socialdots/bootstrap.py
+from socialdots.bootstrap import get_application
 
-app = application
\ No newline at end of file
+application = get_application()
+
+# Vercel handler
+app = application